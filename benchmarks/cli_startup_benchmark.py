@@ -0,0 +1,75 @@
+"""
+Measure how long the datacatalog-tags CLI takes to start, using ``python -X importtime``.
+
+Usage (from the repository root):
+
+    PYTHONPATH=src python benchmarks/cli_startup_benchmark.py [--runs 10] [--max-import-ms 50]
+
+Reports the median wall time of ``datacatalog-tags --help`` and the median cumulative import
+time of the ``datacatalog_tag_manager`` package, compared with the import time of the modules
+that are loaded only when a subcommand runs. Exits with status 1 if ``--max-import-ms`` is
+given and the package import time exceeds it, so it can be used to guard against regressions.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+HELP_CODE = ('import sys\n'
+             'from datacatalog_tag_manager import main\n'
+             'sys.argv = ["datacatalog-tags", "--help"]\n'
+             'main()\n')
+
+IMPORT_TIME_PATTERN = re.compile(
+    r'^import time:\s+\d+ \|\s+(?P<cumulative>\d+) \|\s?(?P<name>.+)$')
+
+
+def run_python(code, *options):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, *options, '-c', code],
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE,
+                               universal_newlines=True,
+                               env=env)
+    return time.perf_counter() - start, completed.stderr
+
+
+def measure_import_ms(module_name):
+    _, stderr = run_python(f'import {module_name}', '-X', 'importtime')
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match and match.group('name') == module_name:
+            return int(match.group('cumulative')) / 1000
+
+    raise RuntimeError(f'Unable to measure the import time of {module_name}.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-import-ms', type=float)
+    args = parser.parse_args()
+
+    help_wall_ms = statistics.median(run_python(HELP_CODE)[0] * 1000 for _ in range(args.runs))
+    package_import_ms = statistics.median(
+        measure_import_ms('datacatalog_tag_manager') for _ in range(args.runs))
+    processor_import_ms = statistics.median(
+        measure_import_ms('datacatalog_tag_manager.tag_datasource_processor')
+        for _ in range(args.runs))
+
+    print(f'datacatalog-tags --help wall time (median): {help_wall_ms:8.1f} ms')
+    print(f'datacatalog_tag_manager import time (median): {package_import_ms:8.1f} ms')
+    print(f'tag_datasource_processor import time (median): {processor_import_ms:8.1f} ms')
+
+    if args.max_import_ms is not None and package_import_ms > args.max_import_ms:
+        print(f'FAILED: package import time exceeds {args.max_import_ms} ms.')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+In-process fake of ``datacatalog.DataCatalogClient`` used by the benchmarks.
+
+Entries, Tag Templates, and Tags are kept in memory. Every call sleeps for the configured
+latency, which releases the GIL as a network call would, and fails with the configured error
+rate. Injected errors are quota errors raised before the request is processed, so the facade
+retries them for any call without duplicating Tags. Errors are drawn from a seeded generator,
+so runs with the same parameters fail the same number of calls.
+"""
+import collections
+import itertools
+import random
+import threading
+import time
+
+from google.api_core import exceptions
+from google.cloud import datacatalog
+
+
+class FakeDataCatalogClient:
+
+    def __init__(self, tag_templates, latency=0.0, error_rate=0.0, seed=0):
+        """
+        :param tag_templates: The Tag Templates, which are read but never written.
+        :param latency: The time, in seconds, each call takes.
+        :param error_rate: The probability of each call failing with a quota error.
+        :param seed: The error generator seed.
+        """
+        self.__tag_templates = {tag_template.name: tag_template for tag_template in tag_templates}
+        self.__latency = latency
+        self.__error_rate = error_rate
+        self.__random = random.Random(seed)
+        # Entries are created on their first lookup, as if every linked resource existed.
+        self.__entries = {}
+        self.__entries_by_name = {}
+        self.__tags = collections.defaultdict(dict)
+        self.__tag_ids = itertools.count()
+        self.__call_counts = collections.Counter()
+        self.__lock = threading.Lock()
+
+    def get_call_counts(self):
+        with self.__lock:
+            return dict(self.__call_counts)
+
+    def create_tag(self, parent, tag):
+        self.__call('create_tag')
+        created_tag = self.__copy_tag(tag)
+        with self.__lock:
+            created_tag.name = f'{parent}/tags/{next(self.__tag_ids)}'
+            self.__tags[parent][created_tag.name] = created_tag
+        return created_tag
+
+    def delete_tag(self, name):
+        self.__call('delete_tag')
+        parent = name.rsplit('/tags/', 1)[0]
+        with self.__lock:
+            if self.__tags[parent].pop(name, None) is None:
+                raise exceptions.NotFound(f'Tag not found: {name}')
+
+    def get_entry(self, name):
+        self.__call('get_entry')
+        with self.__lock:
+            entry = self.__entries_by_name.get(name)
+        if not entry:
+            raise exceptions.NotFound(f'Entry not found: {name}')
+        return entry
+
+    def get_tag_template(self, name):
+        self.__call('get_tag_template')
+        tag_template = self.__tag_templates.get(name)
+        if not tag_template:
+            raise exceptions.NotFound(f'Tag Template not found: {name}')
+        return tag_template
+
+    def list_tags(self, parent):
+        self.__call('list_tags')
+        with self.__lock:
+            return list(self.__tags[parent].values())
+
+    def lookup_entry(self, request):
+        self.__call('lookup_entry')
+        linked_resource = request.linked_resource
+        with self.__lock:
+            entry = self.__entries.get(linked_resource)
+            if not entry:
+                entry = datacatalog.Entry()
+                entry.name = f'projects/p/locations/l/entryGroups/g/entries/{len(self.__entries)}'
+                entry.linked_resource = linked_resource
+                self.__entries[linked_resource] = entry
+                self.__entries_by_name[entry.name] = entry
+        return entry
+
+    def update_tag(self, tag):
+        self.__call('update_tag')
+        parent = tag.name.rsplit('/tags/', 1)[0]
+        updated_tag = self.__copy_tag(tag)
+        with self.__lock:
+            if tag.name not in self.__tags[parent]:
+                raise exceptions.NotFound(f'Tag not found: {tag.name}')
+            self.__tags[parent][tag.name] = updated_tag
+        return updated_tag
+
+    @classmethod
+    def __copy_tag(cls, tag):
+        # Callers keep their Tags, as they would if they were sent over the network.
+        tag_copy = datacatalog.Tag()
+        datacatalog.Tag.copy_from(tag_copy, tag)
+        return tag_copy
+
+    def __call(self, method_name):
+        with self.__lock:
+            self.__call_counts[method_name] += 1
+            fails = self.__random.random() < self.__error_rate
+
+        if self.__latency:
+            time.sleep(self.__latency)
+        if fails:
+            raise exceptions.ResourceExhausted(f'Injected error: {method_name}')
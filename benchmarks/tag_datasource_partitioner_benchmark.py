@@ -0,0 +1,83 @@
+"""
+Compare the single-pass Tag datasource partitioner with the previous approach, which repeatedly
+sliced the dataframe with ``.loc[[key]]`` and dropped the sliced rows.
+
+Usage (from the repository root):
+
+    PYTHONPATH=src python benchmarks/tag_datasource_partitioner_benchmark.py \
+        [--entries 1000 2000 4000]
+
+The time per Entry remains flat for the single-pass partitioner, while it grows linearly with
+the number of Entries for the slice-and-drop approach, i.e. the total work is quadratic.
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from datacatalog_tag_manager import constant, tag_datasource_partitioner
+
+
+def make_dataframe(entries_count):
+    rows = []
+    for entry_index in range(entries_count):
+        entry_name = f'//bigquery.googleapis.com/projects/p/datasets/d/tables/t{entry_index}'
+        rows.append((entry_name, 'template', None, 'string_field', 'value'))
+        rows.append((None, None, None, 'bool_field', 'true'))
+        rows.append((None, None, 'column_1', 'string_field', 'value'))
+        rows.append((None, None, 'column_2', 'string_field', 'value'))
+
+    return pd.DataFrame(rows, columns=constant.TAGS_DS_COLUMNS_ORDER)
+
+
+def partition_single_pass(dataframe):
+    rows = dataframe.itertuples(index=False, name=None)
+    return tag_datasource_partitioner.TagDatasourcePartitioner.partition(rows)
+
+
+def partition_slice_and_drop(dataframe):
+    filled_df = dataframe.copy()
+    filled_df[constant.TAGS_DS_FILLABLE_COLUMNS] = \
+        filled_df[constant.TAGS_DS_FILLABLE_COLUMNS].ffill()
+    filled_df.set_index(constant.TAGS_DS_LINKED_RESOURCE_ENTRY_NAME_COLUMN_LABEL, inplace=True)
+
+    entries = {}
+    for entry_name in filled_df.index.unique().tolist():
+        templates_subset = filled_df.loc[[entry_name],
+                                         constant.TAGS_DS_TEMPLATE_NAME_COLUMN_LABEL:]
+        filled_df.drop(entry_name, inplace=True)
+
+        templates_subset.set_index(constant.TAGS_DS_TEMPLATE_NAME_COLUMN_LABEL, inplace=True)
+        templates = entries[entry_name] = {}
+        for template_name in templates_subset.index.unique().tolist():
+            templates[template_name] = templates_subset.loc[[template_name]]
+            templates_subset.drop(template_name, inplace=True)
+
+    return entries
+
+
+def measure(function, dataframe):
+    start = time.perf_counter()
+    function(dataframe)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', nargs='+', type=int, default=[1000, 2000, 4000])
+    args = parser.parse_args()
+
+    print(f'{"entries":>10} {"rows":>10} {"single-pass (s)":>16} {"us/entry":>9}'
+          f' {"slice-and-drop (s)":>19} {"us/entry":>9}')
+    for entries_count in args.entries:
+        dataframe = make_dataframe(entries_count)
+        single_pass = measure(partition_single_pass, dataframe)
+        slice_and_drop = measure(partition_slice_and_drop, dataframe)
+        print(f'{entries_count:>10} {len(dataframe):>10} {single_pass:>16.3f}'
+              f' {single_pass / entries_count * 1e6:>9.1f} {slice_and_drop:>19.3f}'
+              f' {slice_and_drop / entries_count * 1e6:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
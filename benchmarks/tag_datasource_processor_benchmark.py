@@ -0,0 +1,169 @@
+"""
+Measure the end-to-end throughput of upserting Tags from CSV files against an in-process fake
+Data Catalog client, which keeps Entries and Tags in memory and simulates the API latency and
+error rate.
+
+Usage (from the repository root):
+
+    PYTHONPATH=src python benchmarks/tag_datasource_processor_benchmark.py \
+        [--rows 1000 10000 100000] [--workers 1] [--latency-ms 0] [--error-rate 0] \
+        [--backoff-ms 1] [--chunk-size N] [--csv-reader csv|pandas] [--json-file results.jsonl]
+
+Each datasource has four rows per Entry: a table Tag with two fields and two column Tags. It is
+upserted twice against the same fake catalog, each time by a new processor, as two consecutive
+runs would: the first run creates the Tags, the second one finds them unchanged. For each run,
+the benchmark reports the rows processed per second, the API calls per Tag, the retries, and the
+wall and CPU times; the CPU time covers all threads, so it is comparable across worker counts.
+Retries wait for at most ``--backoff-ms`` at first, instead of the default second, so runs with
+injected errors measure the processing rather than random backoff sleeps.
+Add ``1000000`` to ``--rows`` to measure a million-row datasource, which takes a few minutes.
+
+Datasources and injected errors are deterministic, so results can be compared across commits;
+``--json-file`` appends them, along with the commit and parameters, as JSON Lines. Logging is
+disabled while measuring, unless ``--log`` is given. A small datasource is upserted before
+measuring, so one-time costs, such as lazy imports, are not attributed to the first run.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from unittest import mock
+
+from google.cloud import datacatalog
+
+import fake_datacatalog_client
+from datacatalog_tag_manager import constant, tag_datasource_processor
+
+TEMPLATE_NAME = 'projects/p/locations/l/tagTemplates/template'
+ROWS_PER_ENTRY = 4
+WARM_UP_ROWS = 100
+RUNS = ('create', 'unchanged')
+
+
+def make_tag_template():
+    tag_template = datacatalog.TagTemplate()
+    tag_template.name = TEMPLATE_NAME
+    for field_id, primitive_type in (('bool_field', datacatalog.FieldType.PrimitiveType.BOOL),
+                                     ('string_field', datacatalog.FieldType.PrimitiveType.STRING)):
+        template_field = datacatalog.TagTemplateField()
+        template_field.type_.primitive_type = primitive_type
+        tag_template.fields[field_id] = template_field
+
+    return tag_template
+
+
+def write_datasource(file_path, rows_count):
+    with open(file_path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(constant.TAGS_DS_COLUMNS_ORDER)
+        for entry_index in range(rows_count // ROWS_PER_ENTRY):
+            entry_name = f'//bigquery.googleapis.com/projects/p/datasets/d/tables/t{entry_index}'
+            writer.writerow((entry_name, TEMPLATE_NAME, '', 'string_field', f'v{entry_index}'))
+            writer.writerow(('', '', '', 'bool_field', 'true'))
+            writer.writerow(('', '', 'column_1', 'string_field', f'v{entry_index}'))
+            writer.writerow(('', '', 'column_2', 'string_field', f'v{entry_index}'))
+
+
+def measure(client, args, file_path):
+    calls_before = sum(client.get_call_counts().values())
+    with mock.patch.object(datacatalog, 'DataCatalogClient', return_value=client):
+        processor = tag_datasource_processor.TagDatasourceProcessor(
+            workers=args.workers, initial_backoff=args.backoff_ms / 1000)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    tags = processor.upsert_tags_from_csv(file_path,
+                                          chunk_size=args.chunk_size,
+                                          csv_reader=args.csv_reader)
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+
+    return {
+        'tags': len(tags),
+        'calls': sum(client.get_call_counts().values()) - calls_before,
+        'retries': processor.get_metrics().to_dict()['gauges']['api_call_retries'],
+        'wall_time': wall_time,
+        'cpu_time': cpu_time
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL,
+                              universal_newlines=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', nargs='+', type=int, default=[1000, 10000, 100000])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--backoff-ms', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int)
+    parser.add_argument('--csv-reader', choices=constant.CSV_READERS)
+    parser.add_argument('--json-file')
+    parser.add_argument('--log', action='store_true')
+    args = parser.parse_args()
+
+    if not args.log:
+        logging.disable(logging.CRITICAL)
+
+    environment = {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'parameters': {
+            key: value
+            for key, value in vars(args).items() if key not in ('rows', 'json_file', 'log')
+        }
+    }
+
+    print(f'{"rows":>9} {"run":>10} {"tags":>9} {"rows/s":>10} {"calls/tag":>10}'
+          f' {"retries":>8} {"wall (s)":>9} {"cpu (s)":>9}')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        warm_up_file_path = os.path.join(temp_dir, 'warm-up.csv')
+        write_datasource(warm_up_file_path, WARM_UP_ROWS)
+        measure(fake_datacatalog_client.FakeDataCatalogClient([make_tag_template()]), args,
+                warm_up_file_path)
+
+        for rows_count in args.rows:
+            file_path = os.path.join(temp_dir, f'tags-{rows_count}.csv')
+            write_datasource(file_path, rows_count)
+            client = fake_datacatalog_client.FakeDataCatalogClient([make_tag_template()],
+                                                                   latency=args.latency_ms / 1000,
+                                                                   error_rate=args.error_rate,
+                                                                   seed=args.seed)
+            for run in RUNS:
+                result = measure(client, args, file_path)
+                rows_per_second = rows_count / result['wall_time']
+                calls_per_tag = result['calls'] / result['tags'] if result['tags'] else 0
+                print(f'{rows_count:>9} {run:>10} {result["tags"]:>9} {rows_per_second:>10.0f}'
+                      f' {calls_per_tag:>10.2f} {result["retries"]:>8}'
+                      f' {result["wall_time"]:>9.3f} {result["cpu_time"]:>9.3f}')
+
+                if args.json_file:
+                    with open(args.json_file, 'a') as json_file:
+                        record = dict(environment,
+                                      rows=rows_count,
+                                      run=run,
+                                      rows_per_second=rows_per_second,
+                                      calls_per_tag=calls_per_tag,
+                                      **result)
+                        json_file.write(json.dumps(record))
+                        json_file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -18,17 +18,24 @@ setuptools.setup(
         ],
     },
     include_package_data=True,
-    install_requires=(
-        'google-cloud-datacatalog ~=3.8.1',
-        'numpy >=1.19.0, <=1.19.3',
-        'pandas ~=1.1.4',
-    ),
+    install_requires=('google-cloud-datacatalog ~=3.8.1', ),
+    extras_require={
+        'pandas': (
+            'numpy >=1.19.0, <=1.19.3',
+            'pandas ~=1.1.4',
+        ),
+        'parquet': ('pyarrow >=3.0.0', ),
+        'zstd': ('zstandard >=0.15.0', ),
+    },
     setup_requires=('pytest-runner ~=5.3.2', ),
     tests_require=(
         'coverage ==6.2',
+        'pandas ~=1.1.4',
+        'pyarrow >=3.0.0',
         'pytest ~=7.0.1',
         'pytest-cov ~=2.12.1',
         'typing-extensions ==4.1.1',
+        'zstandard >=0.15.0',
         'tomli ~=1.2.3',
     ),
     python_requires='>=3.6',
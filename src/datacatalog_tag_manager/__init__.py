@@ -1,4 +1,20 @@
-from .tag_datasource_processor import TagDatasourceProcessor
+import sys
+
 from .tag_manager_cli import main
 
 __all__ = ('TagDatasourceProcessor', 'main')
+
+
+def __getattr__(name):
+    # The processor depends on heavy modules, such as the Data Catalog client library; import
+    # it only when required so the CLI starts fast.
+    if name == 'TagDatasourceProcessor':
+        from .tag_datasource_processor import TagDatasourceProcessor
+        return TagDatasourceProcessor
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Module-level __getattr__ is not supported.
+    from .tag_datasource_processor import TagDatasourceProcessor  # noqa: F401
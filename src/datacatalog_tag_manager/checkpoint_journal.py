@@ -0,0 +1,80 @@
+import logging
+import os
+import threading
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of the Entries whose Tags were successfully processed, so interrupted
+    runs can be resumed instead of restarted.
+
+    Each Entry is a line appended with a single write call and flushed to disk before
+    ``record`` returns, so a crash loses at most the Entry being recorded. A partially written
+    last line is discarded when the journal is opened.
+
+    Only Entries recorded by previous runs are reported as completed; this keeps Entries split
+    across multiple datasource groups from being skipped within the same run.
+    """
+
+    __ENCODING = 'utf-8'
+
+    def __init__(self, file_path: str):
+        """
+        :param file_path: The journal file path. It is created if it does not exist.
+        """
+        self.__completed_entries = self.__read_completed_entries(file_path)
+        self.__file_descriptor = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.__lock = threading.Lock()
+
+        if self.__completed_entries:
+            logging.info('%d Entries completed by previous runs found in checkpoint file: %s',
+                         len(self.__completed_entries), file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        os.close(self.__file_descriptor)
+
+    def is_completed(self, entry_name_or_resource: str) -> bool:
+        """
+        Check whether an Entry was completed by a previous run.
+
+        :param entry_name_or_resource: The Entry name or linked resource, as in the datasource.
+        """
+        return entry_name_or_resource in self.__completed_entries
+
+    def record(self, entry_name_or_resource: str):
+        """
+        Durably record an Entry as completed.
+
+        :param entry_name_or_resource: The Entry name or linked resource, as in the datasource.
+        """
+        line = f'{entry_name_or_resource}\n'.encode(self.__ENCODING)
+        with self.__lock:
+            os.write(self.__file_descriptor, line)
+            self.__sync()
+
+    def __sync(self):
+        # fdatasync skips flushing metadata that is irrelevant to reading the file back, such
+        # as the modification time; it is not available on every platform, though.
+        sync = getattr(os, 'fdatasync', os.fsync)
+        sync(self.__file_descriptor)
+
+    @classmethod
+    def __read_completed_entries(cls, file_path: str) -> set:
+        if not os.path.exists(file_path):
+            return set()
+
+        with open(file_path, 'rb') as journal_file:
+            content = journal_file.read()
+
+        # Truncate a line left incomplete by a crash, so the next record is not appended to it.
+        complete_length = content.rfind(b'\n') + 1
+        if complete_length < len(content):
+            os.truncate(file_path, complete_length)
+
+        return set(content[:complete_length].decode(cls.__ENCODING).splitlines())
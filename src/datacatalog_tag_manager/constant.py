@@ -17,5 +17,67 @@ TAGS_DS_NON_FILLABLE_COLUMNS = [
     TAGS_DS_FIELD_VALUE_COLUMN_LABEL
 ]
 
+TAGS_JSONL_COLUMN_KEY = 'column'
+TAGS_JSONL_ENTRY_NAME_KEY = 'entry_name'
+TAGS_JSONL_FIELDS_KEY = 'fields'
+TAGS_JSONL_LINKED_RESOURCE_KEY = 'linked_resource'
+TAGS_JSONL_TEMPLATE_NAME_KEY = 'template_name'
+
 BIGQUERY_LINKED_RESOURCE_PATTERN = '^//bigquery.googleapis.com/(?P<resource_name>.+?)$'
 PUBSUB_LINKED_RESOURCE_PATTERN = '^//pubsub.googleapis.com/(?P<resource_name>.+?)$'
+
+# Read datasources from the standard input, or write them to the standard output, instead of
+# a file.
+STDIN_FILE_PATH = '-'
+STDOUT_FILE_PATH = '-'
+
+CSV_READER_PANDAS = 'pandas'
+CSV_READER_STDLIB = 'csv'
+CSV_READERS = (CSV_READER_STDLIB, CSV_READER_PANDAS)
+
+TAG_OPERATION_CREATED = 'created'
+TAG_OPERATION_DELETED = 'deleted'
+TAG_OPERATION_UNCHANGED = 'unchanged'
+TAG_OPERATION_UPDATED = 'updated'
+
+LOG_FORMAT_JSON = 'json'
+LOG_FORMAT_TEXT = 'text'
+LOG_FORMATS = (LOG_FORMAT_TEXT, LOG_FORMAT_JSON)
+LOG_LEVEL_INFO = 'info'
+LOG_LEVELS = ('debug', LOG_LEVEL_INFO, 'warning', 'error')
+# Log record attribute with the fields added to structured records.
+LOG_RECORD_FIELDS_ATTRIBUTE = 'fields'
+
+# Run metrics; Tag operations are counted as tags_<TAG_OPERATION_*>.
+METRIC_ROWS_PARSED = 'rows_parsed'
+METRIC_TAGS_SKIPPED = 'tags_skipped'
+METRIC_TAGS_PREFIX = 'tags_'
+METRICS_STAGE_PROCESS = 'process'
+METRICS_STAGE_READ = 'read'
+METRICS_STAGE_RESOLVE_ENTRIES = 'resolve_entries'
+
+TAG_PLAN_OPERATION_CREATE = 'create'
+TAG_PLAN_OPERATION_DELETE = 'delete'
+TAG_PLAN_OPERATION_UPDATE = 'update'
+
+CACHE_KIND_ENTRY = 'entry'
+CACHE_KIND_ENTRY_LOOKUP = 'entry_lookup'
+CACHE_KIND_TAG_TEMPLATE = 'tag_template'
+CACHE_KINDS = (CACHE_KIND_ENTRY, CACHE_KIND_ENTRY_LOOKUP, CACHE_KIND_TAG_TEMPLATE)
+
+# Time-to-live, in seconds, of the persistently cached values.
+CACHE_DEFAULT_TTLS = {
+    CACHE_KIND_ENTRY: 24 * 60 * 60,
+    CACHE_KIND_ENTRY_LOOKUP: 24 * 60 * 60,
+    CACHE_KIND_TAG_TEMPLATE: 60 * 60,
+}
+
+# Maximum number of values kept in memory, by cache kind.
+MEMORY_CACHE_DEFAULT_SIZES = {
+    CACHE_KIND_ENTRY: 4096,
+    CACHE_KIND_ENTRY_LOOKUP: 4096,
+    CACHE_KIND_TAG_TEMPLATE: 256,
+}
+
+API_CALL_READ = 'read'
+API_CALL_WRITE = 'write'
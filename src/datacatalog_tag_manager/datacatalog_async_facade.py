@@ -0,0 +1,199 @@
+import asyncio
+import collections
+import logging
+from typing import Dict, Tuple
+
+from google.cloud import datacatalog
+from google.cloud.datacatalog import Entry, Tag, TagTemplate
+
+from . import constant, datacatalog_facade
+
+
+class DataCatalogAsyncFacade:
+    """
+    Data Catalog API communication facade, asyncio flavor.
+
+    Mirrors ``DataCatalogFacade`` on top of the async client. Every API call is made under a
+    semaphore, so there are at most ``max_concurrent_requests`` requests in flight. Entries and
+    Tag Templates are cached for the facade lifetime; concurrent requests for the same key share
+    a single API call.
+    """
+
+    __NESTED_LOG_PREFIX = ' ' * 5
+
+    def __init__(self, max_concurrent_requests: int = 10):
+        # Initialize the API client.
+        self.__datacatalog = datacatalog.DataCatalogAsyncClient()
+        self.__semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.__entries_cache = {}
+        self.__entry_lookups_cache = {}
+        self.__tag_templates_cache = {}
+        self.__operation_counts = collections.Counter()
+
+    async def delete_tag(self,
+                         parent_entry_name: str,
+                         tag: Tag,
+                         entry_tags: Dict[Tuple[str, str], Tag] = None) -> str:
+        """
+        Delete the persisted Tag that matches the given one's template and column.
+
+        :param parent_entry_name: The parent Entry name.
+        :param tag: The Tag to be deleted.
+        :param entry_tags: The Entry's Tags index, as returned by ``index_tags``. It is fetched
+            from the API if not provided and updated in place after the deletion.
+        :return: The deleted Tag name.
+        """
+        if entry_tags is None:
+            entry_tags = await self.index_tags(parent_entry_name)
+
+        tag_key = self.__make_tag_index_key(tag)
+        persisted_tag = entry_tags.get(tag_key)
+        if persisted_tag is None:
+            logging.error('Tag not found for Tag Template: %s'
+                          ' / Column: %s', tag.template, tag.column)
+            return
+
+        tag_name = persisted_tag.name
+        self.__log_operation_start('DELETE Tag: %s', tag_name)
+        async with self.__semaphore:
+            await self.__datacatalog.delete_tag(name=tag_name)
+        del entry_tags[tag_key]
+        self.__count_operation(constant.TAG_OPERATION_DELETED)
+        return tag_name
+
+    async def get_entry(self, name: str) -> Entry:
+        return await self.__get_cached(self.__entries_cache, name, self.__get_entry)
+
+    def get_operation_counts(self) -> Dict[str, int]:
+        """
+        Get how many Tags were created, updated, left unchanged, and deleted so far.
+
+        :return: A dict with ``constant.TAG_OPERATION_*`` values as keys.
+        """
+        return dict(self.__operation_counts)
+
+    async def get_tag_template(self, name: str) -> TagTemplate:
+        return await self.__get_cached(self.__tag_templates_cache, name, self.__get_tag_template)
+
+    async def index_tags(self, parent_entry_name: str) -> Dict[Tuple[str, str], Tag]:
+        """
+        List the Tags attached to an Entry, indexed by template and column.
+
+        :param parent_entry_name: The parent Entry name.
+        :return: A dict with (template name, column) tuples as keys and Tags as values.
+        """
+        self.__log_operation_start('LIST Tags for: %s', parent_entry_name)
+        async with self.__semaphore:
+            # Additional pages are fetched while iterating, so the semaphore is held until the
+            # last one is read.
+            entry_tags = await self.__datacatalog.list_tags(parent=parent_entry_name)
+            return {
+                self.__make_tag_index_key(entry_tag): entry_tag
+                async for entry_tag in entry_tags
+            }
+
+    async def lookup_entry(self, linked_resource: str) -> Entry:
+        return await self.__get_cached(self.__entry_lookups_cache, linked_resource,
+                                       self.__lookup_entry)
+
+    async def upsert_tag(self,
+                         parent_entry_name: str,
+                         tag: Tag,
+                         entry_tags: Dict[Tuple[str, str], Tag] = None) -> Tag:
+        """
+        Update the persisted Tag that matches the given one's template and column, or create a
+        new Tag if there is no such a match.
+
+        :param parent_entry_name: The parent Entry name.
+        :param tag: The Tag to be upserted.
+        :param entry_tags: The Entry's Tags index, as returned by ``index_tags``. It is fetched
+            from the API if not provided and updated in place after the upsert.
+        :return: The upserted Tag.
+        """
+        if entry_tags is None:
+            entry_tags = await self.index_tags(parent_entry_name)
+
+        tag_key = self.__make_tag_index_key(tag)
+        persisted_tag = entry_tags.get(tag_key)
+        if persisted_tag is not None and self.__are_tag_fields_equal(tag, persisted_tag):
+            self.__log_operation_start('UNCHANGED Tag: %s', persisted_tag.name)
+            self.__count_operation(constant.TAG_OPERATION_UNCHANGED)
+            return persisted_tag
+
+        if persisted_tag is not None:
+            tag.name = persisted_tag.name
+            self.__log_operation_start('UPDATE Tag: %s', tag.name)
+            async with self.__semaphore:
+                upserted_tag = await self.__datacatalog.update_tag(tag=tag)
+            self.__count_operation(constant.TAG_OPERATION_UPDATED)
+        else:
+            self.__log_operation_start('CREATE Tag for: %s', parent_entry_name)
+            logging.info('%sUsing Tag Template: %s', self.__NESTED_LOG_PREFIX, tag.template)
+            async with self.__semaphore:
+                upserted_tag = await self.__datacatalog.create_tag(parent=parent_entry_name,
+                                                                   tag=tag)
+            logging.info('%sCreated: %s', self.__NESTED_LOG_PREFIX, upserted_tag.name)
+            self.__count_operation(constant.TAG_OPERATION_CREATED)
+
+        entry_tags[tag_key] = upserted_tag
+        return upserted_tag
+
+    @classmethod
+    async def __get_cached(cls, cache, key, fetch):
+        # Concurrent callers await the same task, so each key is fetched only once. Failures
+        # are not cached.
+        task = cache.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch(key))
+            cache[key] = task
+
+        try:
+            return await task
+        except Exception:
+            if cache.get(key) is task:
+                del cache[key]
+            raise
+
+    async def __get_entry(self, name: str) -> Entry:
+        self.__log_operation_start('GET Entry: %s', name)
+        async with self.__semaphore:
+            entry = await self.__datacatalog.get_entry(name=name)
+        self.__log_single_object_read_result(entry)
+        return entry
+
+    async def __get_tag_template(self, name: str) -> TagTemplate:
+        self.__log_operation_start('GET Tag Template: %s', name)
+        async with self.__semaphore:
+            tag_template = await self.__datacatalog.get_tag_template(name=name)
+        self.__log_single_object_read_result(tag_template)
+        return tag_template
+
+    async def __lookup_entry(self, linked_resource: str) -> Entry:
+        self.__log_operation_start('LOOKUP Entry: %s', linked_resource)
+        lookup_request = datacatalog.LookupEntryRequest()
+        lookup_request.linked_resource = linked_resource
+        async with self.__semaphore:
+            entry = await self.__datacatalog.lookup_entry(request=lookup_request)
+        self.__log_single_object_read_result(entry)
+        return entry
+
+    @classmethod
+    def __are_tag_fields_equal(cls, tag: Tag, other_tag: Tag) -> bool:
+        return datacatalog_facade.DataCatalogFacade.are_tag_fields_equal(tag, other_tag)
+
+    def __count_operation(self, operation: str):
+        self.__operation_counts[operation] += 1
+
+    @classmethod
+    def __make_tag_index_key(cls, tag: Tag) -> Tuple[str, str]:
+        return tag.template, tag.column
+
+    @classmethod
+    def __log_operation_start(cls, message, *args):
+        logging.info('')
+        logging.info(message, *args)
+        logging.info('--------------------------------------------------')
+
+    @classmethod
+    def __log_single_object_read_result(cls, the_object):
+        logging.info('%sFound!' if the_object else '%sNOT found!', cls.__NESTED_LOG_PREFIX)
@@ -1,22 +1,64 @@
+import collections
 from datetime import datetime
+import functools
 import logging
-from typing import Dict
+import threading
+from typing import Callable, Dict, List, Tuple
 
 from google.cloud import datacatalog
 from google.cloud.datacatalog import Tag, TagTemplate
 from google.protobuf import timestamp_pb2
 
+# Tag Template field ids mapped to the functions that set values of their types to Tag fields.
+TemplatePlan = Dict[str, Callable[[datacatalog.TagField, object], None]]
+
+
+class InvalidFieldValuesError(ValueError):
+    """
+    Raised when values cannot be converted to the types of their Tag Template fields. All the
+    invalid values of a Tag are reported at once.
+    """
+
+    def __init__(self, template_name: str, invalid_fields: List[Tuple[str, object]]):
+        """
+        :param template_name: The Tag Template name.
+        :param invalid_fields: The (field id, value) tuples whose values are invalid.
+        """
+        self.template_name = template_name
+        self.invalid_fields = invalid_fields
+        super().__init__(f'Invalid values for fields of the Tag Template {template_name}: ' +
+                         ', '.join(f'{field_id} ({value})' for field_id, value in invalid_fields))
+
 
 class DataCatalogEntityFactory:
     __DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
     __TRUTHS = {1, '1', 't', 'T', 'true', 'True', 'TRUE'}
+    __FALSITIES = {0, '0', 'f', 'F', 'false', 'False', 'FALSE'}
+    # Datasources usually repeat the same literal values across many Tags, so parsed timestamps
+    # are memoized.
+    __PARSED_VALUES_CACHE_SIZE = 4096
+
+    # Template plans are cached by Tag Template object, which is also kept so its id is not
+    # reused while the plan is cached. Tag Templates are not expected to change once read.
+    __TEMPLATE_PLANS_CACHE_SIZE = 256
+    __template_plans = collections.OrderedDict()
+    __template_plans_lock = threading.Lock()
 
     @classmethod
     def make_tag(cls,
                  tag_template: TagTemplate,
                  fields: Dict[str, object],
                  column: str = None) -> Tag:
-
+        """
+        Make a Tag, converting the field values to the types of the Tag Template fields.
+
+        :param tag_template: The Tag Template.
+        :param fields: The field values by field id. Fields not found in the Tag Template are
+            ignored.
+        :param column: The schema column the Tag is attached to, if any.
+        :return: The Tag.
+        :raises InvalidFieldValuesError: If any field values cannot be converted.
+        """
         tag = datacatalog.Tag()
 
         tag.template = tag_template.name
@@ -28,35 +70,75 @@ class DataCatalogEntityFactory:
         return tag
 
     @classmethod
-    def __set_tag_fields(cls, tag: Tag, tag_template: TagTemplate, fields: Dict[str, object]):
-        valid_fields = cls.__get_valid_tag_fields(tag_template, fields)
-        for field_id, field_value in valid_fields.items():
-            field = datacatalog.TagField()
-            field_type = tag_template.fields[field_id].type_
-            cls.__set_field_value(field, field_type, field_value)
-            tag.fields[field_id] = field
-
-    @classmethod
-    def __get_valid_tag_fields(cls, tag_template: TagTemplate,
-                               fields: Dict[str, object]) -> Dict[str, object]:
+    def format_field_value(cls, field: datacatalog.TagField) -> str:
+        """
+        Format a Tag field value as a string that ``make_tag`` converts back to the same value,
+        e.g. to write it to a Tag datasource. Timestamps are formatted to the second, as they
+        are parsed.
 
-        valid_fields = {}
+        :param field: The Tag field.
+        :return: The formatted value, or an empty string if the field has no value.
+        """
+        kind = datacatalog.TagField.pb(field).WhichOneof('kind')
+        if kind == 'bool_value':
+            return 'true' if field.bool_value else 'false'
+        if kind == 'double_value':
+            # repr() keeps all the significant digits.
+            return repr(field.double_value)
+        if kind == 'enum_value':
+            return field.enum_value.display_name
+        if kind == 'timestamp_value':
+            return field.timestamp_value.strftime(cls.__DATETIME_FORMAT)
+
+        return getattr(field, kind) if kind else ''
 
+    @classmethod
+    def __set_tag_fields(cls, tag: Tag, tag_template: TagTemplate, fields: Dict[str, object]):
         if not fields:
-            return valid_fields
+            return
 
+        template_plan = cls.__get_template_plan(tag_template)
+        invalid_fields = []
         for field_id, field_value in fields.items():
-            if field_id in tag_template.fields:
-                valid_fields[field_id] = field_value
-            else:
+            set_field_value = template_plan.get(field_id)
+            if not set_field_value:
                 logging.warning(
                     'Field %s (%s) was not found in the Tag Template %s and will be ignored.',
                     field_id, str(field_value), tag_template.name)
+                continue
 
-        return valid_fields
+            field = datacatalog.TagField()
+            try:
+                set_field_value(field, field_value)
+            except (TypeError, ValueError):
+                # Keep checking the remaining fields, so all invalid values are reported at once.
+                invalid_fields.append((field_id, field_value))
+                continue
+            tag.fields[field_id] = field
+
+        if invalid_fields:
+            raise InvalidFieldValuesError(tag_template.name, invalid_fields)
 
     @classmethod
-    def __set_field_value(cls, field, template_field_type, value):
+    def __get_template_plan(cls, tag_template: TagTemplate) -> TemplatePlan:
+        template_plans = cls.__template_plans
+        with cls.__template_plans_lock:
+            cached = template_plans.get(id(tag_template))
+            if cached and cached[0] is tag_template:
+                template_plans.move_to_end(id(tag_template))
+                return cached[1]
+
+        # Concurrent misses may compile the same plan twice, which is harmless.
+        template_plan = cls.__compile_template_plan(tag_template)
+        with cls.__template_plans_lock:
+            template_plans[id(tag_template)] = (tag_template, template_plan)
+            if len(template_plans) > cls.__TEMPLATE_PLANS_CACHE_SIZE:
+                template_plans.popitem(last=False)
+
+        return template_plan
+
+    @classmethod
+    def __compile_template_plan(cls, tag_template: TagTemplate) -> TemplatePlan:
         set_primitive_field_value_functions = {
             datacatalog.FieldType.PrimitiveType.BOOL: cls.__set_bool_field_value,
             datacatalog.FieldType.PrimitiveType.DOUBLE: cls.__set_double_field_value,
@@ -65,12 +147,15 @@ class DataCatalogEntityFactory:
             datacatalog.FieldType.PrimitiveType.TIMESTAMP: cls.__set_timestamp_field_value
         }
 
-        primitive_type = template_field_type.primitive_type
+        template_plan = {}
+        for field_id, template_field in tag_template.fields.items():
+            primitive_type = template_field.type_.primitive_type
+            template_plan[field_id] = \
+                set_primitive_field_value_functions[primitive_type] \
+                if cls.__is_primitive_type_specified(primitive_type) \
+                else cls.__set_enum_field_value
 
-        if cls.__is_primitive_type_specified(primitive_type):
-            set_primitive_field_value_functions[primitive_type](field, value)
-        else:
-            cls.__set_enum_field_value(field, value)
+        return template_plan
 
     @classmethod
     def __is_primitive_type_specified(cls, primitive_type):
@@ -81,10 +166,19 @@ class DataCatalogEntityFactory:
         """
         :param field: The field.
         :param value: A boolean or:
-            - boolean-like string value {'0', 'f', 'false', '1', 't', 'true'};
+            - boolean-like string value {'0', 'f', 'false', '1', 't', 'true'}, in lower, upper,
+              or title case;
             - boolean-like int value {0, 1}.
+        :raises ValueError: If the value is not boolean-like.
         """
-        field.bool_value = value if isinstance(value, bool) else value in cls.__TRUTHS
+        if isinstance(value, bool):
+            field.bool_value = value
+        elif value in cls.__TRUTHS:
+            field.bool_value = True
+        elif value in cls.__FALSITIES:
+            field.bool_value = False
+        else:
+            raise ValueError(f'Invalid boolean value: {value}')
 
     @classmethod
     def __set_double_field_value(cls, field, value):
@@ -124,7 +218,18 @@ class DataCatalogEntityFactory:
         :param field: The field.
         :param value: A datetime or datetime-like string value.
         """
-        dt = datetime.strptime(value, cls.__DATETIME_FORMAT) if isinstance(value, str) else value
+        if isinstance(value, str):
+            # The cached Timestamp is copied into the field, so it is never modified.
+            field.timestamp_value = cls.__parse_timestamp(value)
+            return
+
         timestamp = timestamp_pb2.Timestamp()
-        timestamp.FromDatetime(dt)
+        timestamp.FromDatetime(value)
         field.timestamp_value = timestamp
+
+    @classmethod
+    @functools.lru_cache(maxsize=__PARSED_VALUES_CACHE_SIZE)
+    def __parse_timestamp(cls, value: str) -> timestamp_pb2.Timestamp:
+        timestamp = timestamp_pb2.Timestamp()
+        timestamp.FromDatetime(datetime.strptime(value, cls.__DATETIME_FORMAT))
+        return timestamp
@@ -1,80 +1,414 @@
+import collections
 import logging
-from functools import lru_cache
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
 
+from google.api_core import exceptions
 from google.cloud import datacatalog
 from google.cloud.datacatalog import Entry, Tag, TagTemplate
 
+from . import constant, persistent_cache, rate_limiting, retrying, run_metrics, \
+    single_flight_cache, structured_logging, tag_operations_plan
+
 
 class DataCatalogFacade:
-    """Data Catalog API communication facade."""
+    """
+    Data Catalog API communication facade.
+
+    Instances are safe to share across threads: the API client is thread-safe, Entries and Tag
+    Templates are kept in single-flight in-memory caches, so concurrent calls for the same one
+    share a single API call, and multi-line log messages are emitted atomically.
+
+    Entries and Tag Templates are also read from and written to the optional persistent cache,
+    so they survive across runs.
+    """
 
     __NESTED_LOG_PREFIX = ' ' * 5
+    __LOG_LOCK = threading.RLock()
 
-    def __init__(self):
+    # Errors that may be gone if idempotent calls are retried.
+    __TRANSIENT_ERRORS = (exceptions.DeadlineExceeded, exceptions.ResourceExhausted,
+                          exceptions.ServiceUnavailable)
+    # Errors returned before the request is processed, so any call can be retried.
+    __REJECTED_ERRORS = (exceptions.ResourceExhausted, )
+
+    def __init__(self,
+                 cache: persistent_cache.PersistentCache = None,
+                 memory_cache_sizes: Dict[str, int] = None,
+                 rate_limiter: rate_limiting.RateLimiter = None,
+                 retry_policy: retrying.RetryPolicy = None,
+                 metrics: run_metrics.RunMetrics = None):
+        """
+        :param cache: The persistent cache for Entries and Tag Templates, if any.
+        :param memory_cache_sizes: The maximum number of values kept in memory, by
+            ``constant.CACHE_KIND_*``; defaults to ``constant.MEMORY_CACHE_DEFAULT_SIZES``.
+        :param rate_limiter: Paces the API calls, if provided.
+        :param retry_policy: Retries the API calls that failed with transient errors, if
+            provided. Tags are created again only if the request was rejected because of quota
+            errors, so they are never duplicated.
+        :param metrics: Records the latency of every API call attempt, by method, and the Tag
+            operations, if provided.
+        """
         # Initialize the API client.
         self.__datacatalog = datacatalog.DataCatalogClient()
+        self.__rate_limiter = rate_limiter
+        self.__retry_policy = retry_policy
+        self.__metrics = metrics
+        self.__cache = cache
+        memory_cache_sizes = dict(constant.MEMORY_CACHE_DEFAULT_SIZES, **(memory_cache_sizes
+                                                                          or {}))
+        self.__memory_caches = {
+            kind: single_flight_cache.SingleFlightCache(size)
+            for kind, size in memory_cache_sizes.items()
+        }
+        self.__operation_counts = collections.Counter()
+        self.__operation_counts_lock = threading.Lock()
 
-    def delete_tag(self, parent_entry_name: str, tag: Tag) -> str:
-        entry_tags = self.__datacatalog.list_tags(parent=parent_entry_name)
+    @classmethod
+    def are_tag_fields_equal(cls, tag: Tag, other_tag: Tag) -> bool:
+        """
+        Compare the fields of two Tags by their typed values, ignoring output only attributes
+        such as the fields' display names.
+        """
+        if set(tag.fields) != set(other_tag.fields):
+            return False
 
-        try:
-            persisted_tag = next(
-                entry_tag for entry_tag in entry_tags
-                if entry_tag.template == tag.template and entry_tag.column == tag.column)
-            tag_name = persisted_tag.name
-            self.__log_operation_start('DELETE Tag: %s', tag_name)
-            self.__datacatalog.delete_tag(name=tag_name)
-            return tag_name
-        except StopIteration:
+        return all(
+            cls.__get_field_value(field) == cls.__get_field_value(other_tag.fields[field_id])
+            for field_id, field in tag.fields.items())
+
+    def apply_tag_operation(self, operation: tag_operations_plan.TagOperation) -> Union[Tag, str]:
+        """
+        Execute a Tag operation, as returned by ``plan_upsert_tag`` or ``plan_delete_tag``,
+        without reading anything from the API.
+
+        :param operation: The Tag operation.
+        :return: The created or updated Tag, or the deleted Tag name.
+        """
+        if operation.operation == constant.TAG_PLAN_OPERATION_CREATE:
+            return self.__create_tag(operation.parent_entry_name, operation.tag)
+        if operation.operation == constant.TAG_PLAN_OPERATION_UPDATE:
+            return self.__update_tag(operation.tag)
+        if operation.operation == constant.TAG_PLAN_OPERATION_DELETE:
+            return self.__delete_tag(operation.tag.name)
+
+        raise ValueError(f'Unknown Tag operation: {operation.operation}.')
+
+    def delete_tag(self,
+                   parent_entry_name: str,
+                   tag: Tag,
+                   entry_tags: Dict[Tuple[str, str], Tag] = None) -> str:
+        """
+        Delete the persisted Tag that matches the given one's template and column.
+
+        :param parent_entry_name: The parent Entry name.
+        :param tag: The Tag to be deleted.
+        :param entry_tags: The Entry's Tags index, as returned by ``index_tags``. It is fetched
+            from the API if not provided and updated in place after the deletion.
+        :return: The deleted Tag name.
+        """
+        operation = self.plan_delete_tag(parent_entry_name, tag, entry_tags)
+        if operation is not None:
+            return self.apply_tag_operation(operation)
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the in-memory caches usage statistics.
+
+        :return: A dict with ``constant.CACHE_KIND_*`` values as keys, and dicts as returned by
+            ``SingleFlightCache.get_stats`` as values.
+        """
+        return {kind: cache.get_stats() for kind, cache in self.__memory_caches.items()}
+
+    def get_entry(self, name: str) -> Entry:
+        return self.__get_through_cache(constant.CACHE_KIND_ENTRY, name, Entry, self.__get_entry)
+
+    def get_operation_counts(self) -> Dict[str, int]:
+        """
+        Get how many Tags were created, updated, left unchanged, and deleted so far.
+
+        :return: A dict with ``constant.TAG_OPERATION_*`` values as keys.
+        """
+        with self.__operation_counts_lock:
+            return dict(self.__operation_counts)
+
+    def get_retry_stats(self) -> Dict[str, int]:
+        """
+        Get the API calls retry statistics.
+
+        :return: A dict as returned by ``RetryPolicy.get_stats``; empty if there is no retry
+            policy.
+        """
+        return self.__retry_policy.get_stats() if self.__retry_policy else {}
+
+    def get_tag_template(self, name: str) -> TagTemplate:
+        return self.__get_through_cache(constant.CACHE_KIND_TAG_TEMPLATE, name, TagTemplate,
+                                        self.__get_tag_template)
+
+    def index_tags(self, parent_entry_name: str) -> Dict[Tuple[str, str], Tag]:
+        """
+        List the Tags attached to an Entry, indexed by template and column.
+
+        :param parent_entry_name: The parent Entry name.
+        :return: A dict with (template name, column) tuples as keys and Tags as values.
+        """
+        self.__log_operation_start('list_tags', 'LIST Tags for: %s', parent_entry_name)
+
+        def list_tags():
+            # Iterate over all pages within the limited call.
+            return {
+                self.__make_tag_index_key(entry_tag): entry_tag
+                for entry_tag in self.__datacatalog.list_tags(parent=parent_entry_name)
+            }
+
+        return self.__call_api(constant.API_CALL_READ, 'list_tags', list_tags)
+
+    def lookup_entry(self, linked_resource: str) -> Entry:
+        return self.__get_through_cache(constant.CACHE_KIND_ENTRY_LOOKUP, linked_resource, Entry,
+                                        self.__lookup_entry)
+
+    def plan_delete_tag(self,
+                        parent_entry_name: str,
+                        tag: Tag,
+                        entry_tags: Dict[Tuple[str, str], Tag] = None
+                        ) -> Optional[tag_operations_plan.TagOperation]:
+        """
+        Plan the deletion of the persisted Tag that matches the given one's template and column.
+
+        :param parent_entry_name: The parent Entry name.
+        :param tag: The Tag to be deleted.
+        :param entry_tags: The Entry's Tags index, as returned by ``index_tags``. It is fetched
+            from the API if not provided and updated in place as if the operation was applied.
+        :return: The delete operation, or None if there is no such a Tag.
+        """
+        if entry_tags is None:
+            entry_tags = self.index_tags(parent_entry_name)
+
+        persisted_tag = entry_tags.pop(self.__make_tag_index_key(tag), None)
+        if persisted_tag is None:
             logging.error('Tag not found for Tag Template: %s'
                           ' / Column: %s', tag.template, tag.column)
+            return
 
-    @lru_cache(maxsize=64)
-    def get_entry(self, name: str) -> Entry:
-        self.__log_operation_start('GET Entry: %s', name)
-        entry = self.__datacatalog.get_entry(name=name)
+        return tag_operations_plan.TagOperation(constant.TAG_PLAN_OPERATION_DELETE,
+                                                parent_entry_name, persisted_tag)
+
+    def plan_upsert_tag(self,
+                        parent_entry_name: str,
+                        tag: Tag,
+                        entry_tags: Dict[Tuple[str, str], Tag] = None
+                        ) -> Optional[tag_operations_plan.TagOperation]:
+        """
+        Plan the update of the persisted Tag that matches the given one's template and column,
+        or the creation of a new Tag if there is no such a match.
+
+        :param parent_entry_name: The parent Entry name.
+        :param tag: The Tag to be upserted.
+        :param entry_tags: The Entry's Tags index, as returned by ``index_tags``. It is fetched
+            from the API if not provided and updated in place as if the operation was applied.
+        :return: The create or update operation, or None if the persisted Tag is unchanged.
+        """
+        if entry_tags is None:
+            entry_tags = self.index_tags(parent_entry_name)
+
+        tag_key = self.__make_tag_index_key(tag)
+        persisted_tag = entry_tags.get(tag_key)
+        if persisted_tag is not None and self.are_tag_fields_equal(tag, persisted_tag):
+            self.__log_operation_start('unchanged_tag', 'UNCHANGED Tag: %s', persisted_tag.name)
+            self.__count_operation(constant.TAG_OPERATION_UNCHANGED)
+            return
+
+        if persisted_tag is not None:
+            tag.name = persisted_tag.name
+            operation = constant.TAG_PLAN_OPERATION_UPDATE
+        else:
+            operation = constant.TAG_PLAN_OPERATION_CREATE
+
+        entry_tags[tag_key] = tag
+        return tag_operations_plan.TagOperation(operation, parent_entry_name, tag)
+
+    def upsert_tag(self,
+                   parent_entry_name: str,
+                   tag: Tag,
+                   entry_tags: Dict[Tuple[str, str], Tag] = None) -> Tag:
+        """
+        Update the persisted Tag that matches the given one's template and column, or create a
+        new Tag if there is no such a match.
+
+        :param parent_entry_name: The parent Entry name.
+        :param tag: The Tag to be upserted.
+        :param entry_tags: The Entry's Tags index, as returned by ``index_tags``. It is fetched
+            from the API if not provided and updated in place after the upsert.
+        :return: The upserted Tag.
+        """
+        if entry_tags is None:
+            entry_tags = self.index_tags(parent_entry_name)
+
+        tag_key = self.__make_tag_index_key(tag)
+        operation = self.plan_upsert_tag(parent_entry_name, tag, entry_tags)
+        if operation is None:
+            return entry_tags[tag_key]
+
+        upserted_tag = self.apply_tag_operation(operation)
+        entry_tags[tag_key] = upserted_tag
+        return upserted_tag
+
+    def __call_api(self, call_kind, method_name, method, idempotent=True, **kwargs):
+        # All the API calls go through here.
+        if self.__retry_policy is None:
+            return self.__call_api_once(call_kind, method_name, method, **kwargs)
+
+        retryable_errors = self.__TRANSIENT_ERRORS if idempotent else self.__REJECTED_ERRORS
+        return self.__retry_policy.call(self.__call_api_once, retryable_errors, call_kind,
+                                        method_name, method, **kwargs)
+
+    def __call_api_once(self, call_kind, method_name, method, **kwargs):
+        if self.__rate_limiter is None:
+            return self.__call_method(method_name, method, **kwargs)
+
+        # Each attempt is paced, and its quota errors are taken into account.
+        with self.__rate_limiter.limit(call_kind):
+            return self.__call_method(method_name, method, **kwargs)
+
+    def __call_method(self, method_name, method, **kwargs):
+        if self.__metrics is None:
+            return method(**kwargs)
+
+        # Only the call itself is timed, not the rate limiter waits.
+        start = time.perf_counter()
+        try:
+            result = method(**kwargs)
+        except Exception as error:
+            self.__metrics.observe_rpc(method_name,
+                                       time.perf_counter() - start,
+                                       error=type(error).__name__)
+            raise
+
+        self.__metrics.observe_rpc(method_name, time.perf_counter() - start)
+        return result
+
+    def __get_through_cache(self, kind, key, message_class, fetch):
+        return self.__memory_caches[kind].get(
+            key, lambda key: self.__get_through_persistent_cache(kind, key, message_class, fetch))
+
+    def __get_through_persistent_cache(self, kind, key, message_class, fetch):
+        if self.__cache is None:
+            return fetch(key)
+
+        cached_value = self.__cache.get(kind, key)
+        if cached_value is not None:
+            return message_class.deserialize(cached_value)
+
+        value = fetch(key)
+        if value:
+            self.__cache.set(kind, key, message_class.serialize(value))
+        return value
+
+    def __get_entry(self, name: str) -> Entry:
+        self.__log_operation_start('get_entry', 'GET Entry: %s', name)
+        entry = self.__call_api(constant.API_CALL_READ,
+                                'get_entry',
+                                self.__datacatalog.get_entry,
+                                name=name)
         self.__log_single_object_read_result(entry)
         return entry
 
-    @lru_cache(maxsize=16)
-    def get_tag_template(self, name: str) -> TagTemplate:
-        self.__log_operation_start('GET Tag Template: %s', name)
-        tag_template = self.__datacatalog.get_tag_template(name=name)
+    def __get_tag_template(self, name: str) -> TagTemplate:
+        self.__log_operation_start('get_tag_template', 'GET Tag Template: %s', name)
+        tag_template = self.__call_api(constant.API_CALL_READ,
+                                       'get_tag_template',
+                                       self.__datacatalog.get_tag_template,
+                                       name=name)
         self.__log_single_object_read_result(tag_template)
         return tag_template
 
-    @lru_cache(maxsize=64)
-    def lookup_entry(self, linked_resource: str) -> Entry:
-        self.__log_operation_start('LOOKUP Entry: %s', linked_resource)
+    def __lookup_entry(self, linked_resource: str) -> Entry:
+        self.__log_operation_start('lookup_entry', 'LOOKUP Entry: %s', linked_resource)
         lookup_request = datacatalog.LookupEntryRequest()
         lookup_request.linked_resource = linked_resource
-        entry = self.__datacatalog.lookup_entry(request=lookup_request)
+        entry = self.__call_api(constant.API_CALL_READ,
+                                'lookup_entry',
+                                self.__datacatalog.lookup_entry,
+                                request=lookup_request)
         self.__log_single_object_read_result(entry)
         return entry
 
-    def upsert_tag(self, parent_entry_name: str, tag: Tag) -> Tag:
-        entry_tags = self.__datacatalog.list_tags(parent=parent_entry_name)
+    def __create_tag(self, parent_entry_name: str, tag: Tag) -> Tag:
+        with self.__LOG_LOCK:
+            self.__log_operation_start('create_tag', 'CREATE Tag for: %s', parent_entry_name)
+            self.__log_nested('Using Tag Template: %s', tag.template)
+        created_tag = self.__call_api(constant.API_CALL_WRITE,
+                                      'create_tag',
+                                      self.__datacatalog.create_tag,
+                                      idempotent=False,
+                                      parent=parent_entry_name,
+                                      tag=tag)
+        self.__log_nested('Created: %s', created_tag.name)
+        self.__count_operation(constant.TAG_OPERATION_CREATED)
+        return created_tag
 
-        try:
-            persisted_tag = next(
-                entry_tag for entry_tag in entry_tags
-                if entry_tag.template == tag.template and entry_tag.column == tag.column)
-            tag.name = persisted_tag.name
-            self.__log_operation_start('UPDATE Tag: %s', tag.name)
-            return self.__datacatalog.update_tag(tag=tag)
-        except StopIteration:
-            self.__log_operation_start('CREATE Tag for: %s', parent_entry_name)
-            logging.info('%sUsing Tag Template: %s', self.__NESTED_LOG_PREFIX, tag.template)
-            created_tag = self.__datacatalog.create_tag(parent=parent_entry_name, tag=tag)
-            logging.info('%sCreated: %s', self.__NESTED_LOG_PREFIX, created_tag.name)
-            return created_tag
+    def __delete_tag(self, tag_name: str) -> str:
+        self.__log_operation_start('delete_tag', 'DELETE Tag: %s', tag_name)
+        attempts = 0
+
+        def delete_tag(**kwargs):
+            nonlocal attempts
+            attempts += 1
+            try:
+                self.__datacatalog.delete_tag(**kwargs)
+            except exceptions.NotFound:
+                # A previous attempt may have deleted the Tag before its deadline was exceeded.
+                if attempts == 1:
+                    raise
+                logging.debug('Tag %s was deleted by a previous attempt.', tag_name)
+
+        self.__call_api(constant.API_CALL_WRITE, 'delete_tag', delete_tag, name=tag_name)
+        self.__count_operation(constant.TAG_OPERATION_DELETED)
+        return tag_name
+
+    def __update_tag(self, tag: Tag) -> Tag:
+        self.__log_operation_start('update_tag', 'UPDATE Tag: %s', tag.name)
+        updated_tag = self.__call_api(constant.API_CALL_WRITE,
+                                      'update_tag',
+                                      self.__datacatalog.update_tag,
+                                      tag=tag)
+        self.__count_operation(constant.TAG_OPERATION_UPDATED)
+        return updated_tag
 
     @classmethod
-    def __log_operation_start(cls, message, *args):
-        logging.info('')
-        logging.info(message, *args)
-        logging.info('--------------------------------------------------')
+    def __get_field_value(cls, field: datacatalog.TagField) -> tuple:
+        field_pb = datacatalog.TagField.pb(field)
+        kind = field_pb.WhichOneof('kind')
+        return kind, getattr(field_pb, kind) if kind else None
+
+    def __count_operation(self, operation: str):
+        with self.__operation_counts_lock:
+            self.__operation_counts[operation] += 1
+        if self.__metrics is not None:
+            self.__metrics.count(f'{constant.METRIC_TAGS_PREFIX}{operation}')
+
+    @classmethod
+    def __make_tag_index_key(cls, tag: Tag) -> Tuple[str, str]:
+        return tag.template, tag.column
+
+    @classmethod
+    def __log_nested(cls, message, *args):
+        if not structured_logging.EntryEvents.is_aggregating():
+            logging.info(f'%s{message}', cls.__NESTED_LOG_PREFIX, *args)
+
+    @classmethod
+    def __log_operation_start(cls, event, message, *args):
+        # The operations made while processing an Entry may be summarized in a single record.
+        if structured_logging.EntryEvents.record(event):
+            return
+
+        # Prevent lines from concurrent operations from being interleaved.
+        with cls.__LOG_LOCK:
+            logging.info('')
+            logging.info(message, *args)
+            logging.info('--------------------------------------------------')
 
     @classmethod
     def __log_single_object_read_result(cls, the_object):
-        logging.info('%sFound!' if the_object else '%sNOT found!', cls.__NESTED_LOG_PREFIX)
+        cls.__log_nested('Found!' if the_object else 'NOT found!')
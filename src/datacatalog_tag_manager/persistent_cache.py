@@ -0,0 +1,109 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from . import constant
+
+
+class PersistentCache:
+    """
+    SQLite-backed cache that keeps API read results across runs.
+
+    Values are stored as bytes, grouped by kind (``constant.CACHE_KIND_*``). Each kind has its
+    own time-to-live; expired values are treated as missing. Instances are safe to share across
+    threads.
+    """
+
+    __FILE_NAME = 'datacatalog-tag-manager-cache.sqlite3'
+
+    def __init__(self, cache_dir: str, ttls: Dict[str, float] = None):
+        """
+        :param cache_dir: The directory the cache database is stored in. It is created if it
+            does not exist.
+        :param ttls: Time-to-live, in seconds, by kind; ``constant.CACHE_DEFAULT_TTLS`` are used
+            for the kinds not provided.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.__ttls = dict(constant.CACHE_DEFAULT_TTLS, **(ttls or {}))
+
+        # Autocommit mode: each write is persisted right away, so an interrupted run keeps what
+        # it has read so far.
+        self.__connection = sqlite3.connect(os.path.join(cache_dir, self.__FILE_NAME),
+                                            isolation_level=None,
+                                            check_same_thread=False)
+        self.__lock = threading.Lock()
+        with self.__lock:
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS cache ('
+                                      ' kind TEXT NOT NULL,'
+                                      ' key TEXT NOT NULL,'
+                                      ' value BLOB NOT NULL,'
+                                      ' expires_at REAL NOT NULL,'
+                                      ' PRIMARY KEY (kind, key))')
+            # Expired values are never read again.
+            self.__connection.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(), ))
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def get(self, kind: str, key: str) -> Optional[bytes]:
+        """
+        Get a cached value.
+
+        :param kind: The value kind.
+        :param key: The value key.
+        :return: The value, or None if it is not cached or has expired.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                'SELECT value FROM cache WHERE kind = ? AND key = ? AND expires_at > ?',
+                (kind, key, time.time())).fetchone()
+
+        return row[0] if row else None
+
+    def invalidate(self, kind: str = None, key: str = None) -> int:
+        """
+        Remove cached values.
+
+        :param kind: If provided, remove only values of this kind.
+        :param key: If provided, remove only values with this key.
+        :return: The number of values removed.
+        """
+        conditions = []
+        parameters = []
+        if kind is not None:
+            conditions.append('kind = ?')
+            parameters.append(kind)
+        if key is not None:
+            conditions.append('key = ?')
+            parameters.append(key)
+
+        statement = 'DELETE FROM cache'
+        if conditions:
+            statement += f' WHERE {" AND ".join(conditions)}'
+
+        with self.__lock:
+            removed_count = self.__connection.execute(statement, parameters).rowcount
+
+        logging.info('%d cached values removed.', removed_count)
+        return removed_count
+
+    def set(self, kind: str, key: str, value: bytes):
+        """
+        Cache a value, replacing the existing one, if any.
+
+        :param kind: The value kind.
+        :param key: The value key.
+        :param value: The value.
+        """
+        ttl = self.__ttls.get(kind)
+        if not ttl or ttl <= 0:
+            return
+
+        with self.__lock:
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO cache (kind, key, value, expires_at)'
+                ' VALUES (?, ?, ?, ?)', (kind, key, value, time.time() + ttl))
@@ -0,0 +1,155 @@
+import contextlib
+import logging
+import threading
+import time
+
+from google.api_core import exceptions
+
+from . import constant
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: tokens are added at a constant rate up to the bucket capacity,
+    and each call consumes one, waiting for it if the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        :param rate: The number of tokens added per second.
+        :param capacity: The maximum number of tokens, i.e. the largest burst; defaults to one
+            second worth of tokens, and is never less than one.
+        """
+        if rate <= 0:
+            raise ValueError('The token bucket rate must be greater than zero.')
+
+        self.__rate = rate
+        self.__capacity = max(1.0, capacity or rate)
+        self.__tokens = self.__capacity
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Consume a token, waiting for it if required.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.__capacity,
+                                self.__tokens + (now - self.__updated_at) * self.__rate)
+            self.__updated_at = now
+
+            # Take the token right away, even if it is not available yet, so concurrent
+            # callers queue up behind it instead of competing for the next one.
+            self.__tokens -= 1
+            wait_seconds = -self.__tokens / self.__rate if self.__tokens < 0 else 0
+
+        if wait_seconds:
+            time.sleep(wait_seconds)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase / multiplicative-decrease (AIMD) concurrency limiter.
+
+    The concurrency limit grows by about one for every ``limit`` successful calls, up to the
+    maximum, and is cut by ``decrease_factor`` when a call is throttled. Calls started before the
+    last decrease do not trigger further decreases, so a burst of quota errors from requests
+    that were already in flight cuts the limit only once.
+    """
+
+    def __init__(self,
+                 max_concurrency: int,
+                 min_concurrency: int = 1,
+                 decrease_factor: float = 0.5):
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError('The concurrency limits must satisfy 1 <= min <= max.')
+
+        self.__max_concurrency = max_concurrency
+        self.__min_concurrency = min_concurrency
+        self.__decrease_factor = decrease_factor
+        self.__limit = float(max_concurrency)
+        self.__in_flight = 0
+        self.__epoch = 0
+        self.__condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self.__limit)
+
+    def acquire(self) -> int:
+        """
+        Wait until the number of calls in flight is below the limit.
+
+        :return: A ticket to be handed back to ``release``.
+        """
+        with self.__condition:
+            while self.__in_flight >= int(self.__limit):
+                self.__condition.wait()
+            self.__in_flight += 1
+            return self.__epoch
+
+    def release(self, ticket: int, throttled: bool = False):
+        """
+        Finish a call and adjust the limit according to its outcome.
+
+        :param ticket: The ticket returned by ``acquire``.
+        :param throttled: Whether the call failed because of a quota error.
+        """
+        with self.__condition:
+            self.__in_flight -= 1
+            if throttled:
+                if ticket == self.__epoch:
+                    self.__epoch += 1
+                    self.__limit = max(self.__min_concurrency,
+                                       self.__limit * self.__decrease_factor)
+                    logging.warning('Quota exceeded; concurrency limit decreased to %d.',
+                                    self.limit)
+            else:
+                self.__limit = min(self.__max_concurrency, self.__limit + 1 / self.__limit)
+            self.__condition.notify_all()
+
+
+class RateLimiter:
+    """
+    Pace API calls with separate token buckets for reads and writes, and adapt the number of
+    concurrent calls to quota errors.
+    """
+
+    def __init__(self,
+                 reads_per_minute: float = None,
+                 writes_per_minute: float = None,
+                 max_concurrency: int = 1):
+        """
+        :param reads_per_minute: The maximum sustained read rate; unlimited if not provided.
+        :param writes_per_minute: The maximum sustained write rate; unlimited if not provided.
+        :param max_concurrency: The maximum number of concurrent calls.
+        """
+        self.__buckets = {}
+        if reads_per_minute:
+            self.__buckets[constant.API_CALL_READ] = TokenBucket(reads_per_minute / 60)
+        if writes_per_minute:
+            self.__buckets[constant.API_CALL_WRITE] = TokenBucket(writes_per_minute / 60)
+
+        self.__concurrency_limiter = AdaptiveConcurrencyLimiter(max_concurrency)
+
+    @contextlib.contextmanager
+    def limit(self, call_kind: str):
+        """
+        Wait for a call of the given kind to be allowed, then run it within the context.
+
+        :param call_kind: ``constant.API_CALL_READ`` or ``constant.API_CALL_WRITE``.
+        """
+        bucket = self.__buckets.get(call_kind)
+        if bucket:
+            bucket.acquire()
+
+        ticket = self.__concurrency_limiter.acquire()
+        throttled = False
+        try:
+            yield
+        except exceptions.ResourceExhausted:
+            throttled = True
+            raise
+        finally:
+            self.__concurrency_limiter.release(ticket, throttled)
@@ -0,0 +1,90 @@
+import collections
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Tuple, Type
+
+
+class RetryPolicy:
+    """
+    Retry failed calls with exponential backoff and full jitter.
+
+    Each retry waits for a random time between zero and the current backoff, which starts at
+    ``initial_backoff`` and is multiplied by ``multiplier`` after every attempt, up to
+    ``max_backoff``. The optional retry budget caps the number of retries across all calls, so
+    a persistent outage fails fast instead of retrying every single call. Instances are safe to
+    share across threads.
+    """
+
+    def __init__(self,
+                 max_attempts: int = 5,
+                 initial_backoff: float = 1.0,
+                 max_backoff: float = 32.0,
+                 multiplier: float = 2.0,
+                 retry_budget: int = None):
+        """
+        :param max_attempts: The maximum number of attempts per call, including the first one.
+        :param initial_backoff: The maximum wait, in seconds, before the first retry.
+        :param max_backoff: The maximum wait, in seconds, before any retry.
+        :param multiplier: The backoff growth factor.
+        :param retry_budget: The maximum number of retries across all calls; unlimited if not
+            provided.
+        """
+        if max_attempts < 1:
+            raise ValueError('The maximum number of attempts must be greater than zero.')
+
+        self.__max_attempts = max_attempts
+        self.__initial_backoff = initial_backoff
+        self.__max_backoff = max_backoff
+        self.__multiplier = multiplier
+        self.__retry_budget = retry_budget
+        self.__stats = collections.Counter(retries=0, exhausted=0)
+        self.__lock = threading.Lock()
+
+    def call(self, function: Callable, retryable_errors: Tuple[Type[Exception], ...], *args,
+             **kwargs):
+        """
+        Call a function, retrying it on the given errors.
+
+        :param function: The function.
+        :param retryable_errors: The errors that trigger retries; others are raised right away.
+        :return: The function result.
+        """
+        backoff = self.__initial_backoff
+        attempt = 1
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except retryable_errors as error:
+                if attempt >= self.__max_attempts or not self.__take_retry():
+                    with self.__lock:
+                        self.__stats['exhausted'] += 1
+                    raise
+
+                wait_seconds = random.uniform(0, backoff)
+                logging.warning('%s: %s. Retrying in %.1f seconds (attempt %d of %d)...',
+                                type(error).__name__, error, wait_seconds, attempt + 1,
+                                self.__max_attempts)
+                time.sleep(wait_seconds)
+
+                backoff = min(self.__max_backoff, backoff * self.__multiplier)
+                attempt += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the retry statistics.
+
+        :return: A dict with the number of retries, and of calls that failed after exhausting
+            their attempts or the retry budget.
+        """
+        with self.__lock:
+            return dict(self.__stats)
+
+    def __take_retry(self) -> bool:
+        with self.__lock:
+            if self.__retry_budget is not None and self.__stats['retries'] >= self.__retry_budget:
+                return False
+
+            self.__stats['retries'] += 1
+            return True
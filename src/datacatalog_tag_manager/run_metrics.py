@@ -0,0 +1,244 @@
+import bisect
+import collections
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+
+class MetricsHook:
+    """
+    Receives the run metrics as they are recorded, e.g. to forward them to a telemetry system.
+
+    All methods do nothing by default; override the relevant ones. They are called from the
+    threads doing the recorded work, so they should be thread-safe and return quickly. Errors
+    they raise are logged and otherwise ignored.
+    """
+
+    def on_count(self, name: str, value: int):
+        """
+        :param name: The counter name, e.g. ``constant.METRIC_ROWS_PARSED``.
+        :param value: The amount the counter was incremented by.
+        """
+
+    def on_gauge(self, name: str, value: float):
+        """
+        :param name: The gauge name, e.g. ``cache_entry_hits``.
+        :param value: The gauge value.
+        """
+
+    def on_rpc(self, method: str, seconds: float, error: Optional[str]):
+        """
+        :param method: The API method name, e.g. ``get_entry``.
+        :param seconds: The call latency.
+        :param error: The error class name, if the call failed.
+        """
+
+    def on_stage(self, name: str, seconds: float):
+        """
+        :param name: The stage name, e.g. ``constant.METRICS_STAGE_PROCESS``.
+        :param seconds: The stage wall time.
+        """
+
+
+class RunMetrics:
+    """
+    Thread-safe recorder of counters, gauges, API call latencies, and stage wall times.
+
+    API call latencies are kept as histograms, by method, so percentiles can be estimated
+    without keeping every sample. Metrics are reported as a JSON summary or in the Prometheus
+    text format, and forwarded to the hooks as they are recorded.
+    """
+
+    # Histogram bucket upper bounds, in seconds.
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    __PROMETHEUS_PREFIX = 'datacatalog_tag_manager'
+
+    def __init__(self, hooks: Iterable[MetricsHook] = None):
+        """
+        :param hooks: The hooks the metrics are forwarded to.
+        """
+        self.__hooks = list(hooks or [])
+        self.__counters = collections.Counter()
+        self.__gauges = {}
+        self.__rpcs = {}
+        self.__stages = {}
+        self.__lock = threading.Lock()
+
+    def add_hook(self, hook: MetricsHook):
+        self.__hooks.append(hook)
+
+    def count(self, name: str, value: int = 1):
+        """
+        Increment a counter.
+
+        :param name: The counter name.
+        :param value: The increment.
+        """
+        with self.__lock:
+            self.__counters[name] += value
+        self.__notify('on_count', name, value)
+
+    def set_gauge(self, name: str, value: float):
+        """
+        Set a gauge, replacing its previous value.
+
+        :param name: The gauge name.
+        :param value: The gauge value.
+        """
+        with self.__lock:
+            self.__gauges[name] = value
+        self.__notify('on_gauge', name, value)
+
+    def observe_rpc(self, method: str, seconds: float, error: str = None):
+        """
+        Record an API call.
+
+        :param method: The API method name.
+        :param seconds: The call latency.
+        :param error: The error class name, if the call failed.
+        """
+        bucket_index = bisect.bisect_left(self.LATENCY_BUCKETS, seconds)
+        with self.__lock:
+            rpc = self.__rpcs.get(method)
+            if rpc is None:
+                rpc = self.__rpcs[method] = {
+                    'count': 0,
+                    'errors': 0,
+                    'seconds': 0.0,
+                    # The last bucket holds the calls slower than the largest bound.
+                    'bucket_counts': [0] * (len(self.LATENCY_BUCKETS) + 1)
+                }
+            rpc['count'] += 1
+            rpc['seconds'] += seconds
+            rpc['bucket_counts'][bucket_index] += 1
+            if error:
+                rpc['errors'] += 1
+        self.__notify('on_rpc', method, seconds, error)
+
+    @contextlib.contextmanager
+    def time_stage(self, name: str):
+        """
+        Measure the wall time of a stage; the times of stages run more than once are added up.
+
+        :param name: The stage name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self.__lock:
+                stage = self.__stages.setdefault(name, {'count': 0, 'seconds': 0.0})
+                stage['count'] += 1
+                stage['seconds'] += seconds
+            self.__notify('on_stage', name, seconds)
+
+    def to_dict(self) -> Dict[str, dict]:
+        """
+        Summarize the metrics.
+
+        :return: A dict with the counters, gauges, stages, and API calls. Each API method has
+            its count, errors, total seconds, and cumulative latency buckets: the number of
+            calls that took at most each bound, in seconds, and ``+Inf`` for all of them.
+        """
+        with self.__lock:
+            return {
+                'counters': dict(sorted(self.__counters.items())),
+                'gauges': dict(sorted(self.__gauges.items())),
+                'stages': {
+                    name: dict(stage)
+                    for name, stage in sorted(self.__stages.items())
+                },
+                'rpcs': {
+                    method: {
+                        'count': rpc['count'],
+                        'errors': rpc['errors'],
+                        'seconds': rpc['seconds'],
+                        'buckets': self.__make_cumulative_buckets(rpc['bucket_counts'])
+                    }
+                    for method, rpc in sorted(self.__rpcs.items())
+                }
+            }
+
+    def write_json(self, file_path: str):
+        """
+        Write the metrics summary, as returned by ``to_dict``, to a JSON file.
+
+        :param file_path: The file path.
+        """
+        self.__write_atomically(file_path, json.dumps(self.to_dict(), indent=2) + '\n')
+
+    def write_prometheus(self, file_path: str):
+        """
+        Write the metrics in the Prometheus text format, e.g. for the node exporter's textfile
+        collector. The file is replaced atomically, so it is never read half written.
+
+        :param file_path: The file path.
+        """
+        summary = self.to_dict()
+        prefix = self.__PROMETHEUS_PREFIX
+        lines = []
+        for name, value in summary['counters'].items():
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        for name, value in summary['gauges'].items():
+            lines.append(f'# TYPE {prefix}_{name} gauge')
+            lines.append(f'{prefix}_{name} {value}')
+
+        if summary['stages']:
+            lines.append(f'# TYPE {prefix}_stage_seconds gauge')
+        for name, stage in summary['stages'].items():
+            lines.append(f'{prefix}_stage_seconds{{stage="{name}"}} {stage["seconds"]}')
+
+        if summary['rpcs']:
+            lines.append(f'# TYPE {prefix}_rpc_errors_total counter')
+        for method, rpc in summary['rpcs'].items():
+            lines.append(f'{prefix}_rpc_errors_total{{method="{method}"}} {rpc["errors"]}')
+
+        if summary['rpcs']:
+            lines.append(f'# TYPE {prefix}_rpc_latency_seconds histogram')
+        for method, rpc in summary['rpcs'].items():
+            for bound, count in rpc['buckets'].items():
+                lines.append(f'{prefix}_rpc_latency_seconds_bucket'
+                             f'{{method="{method}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_rpc_latency_seconds_sum{{method="{method}"}} {rpc["seconds"]}')
+            lines.append(f'{prefix}_rpc_latency_seconds_count{{method="{method}"}} {rpc["count"]}')
+
+        self.__write_atomically(file_path, ''.join(f'{line}\n' for line in lines))
+
+    @classmethod
+    def __make_cumulative_buckets(cls, bucket_counts):
+        buckets = {}
+        cumulative_count = 0
+        for bound, count in zip(cls.LATENCY_BUCKETS, bucket_counts):
+            cumulative_count += count
+            buckets[str(bound)] = cumulative_count
+        buckets['+Inf'] = cumulative_count + bucket_counts[-1]
+        return buckets
+
+    def __notify(self, method_name, *args):
+        for hook in self.__hooks:
+            try:
+                getattr(hook, method_name)(*args)
+            except Exception as error:
+                logging.warning('Metrics hook %s failed: %s', type(hook).__name__, error)
+
+    @classmethod
+    def __write_atomically(cls, file_path, content):
+        directory = os.path.dirname(os.path.abspath(file_path))
+        file_descriptor, temp_file_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'w') as temp_file:
+                temp_file.write(content)
+            # mkstemp() creates files readable by their owner only.
+            os.chmod(temp_file_path, 0o644)
+            os.replace(temp_file_path, file_path)
+        except BaseException:
+            os.remove(temp_file_path)
+            raise
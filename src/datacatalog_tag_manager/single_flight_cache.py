@@ -0,0 +1,86 @@
+import collections
+from concurrent import futures
+import threading
+from typing import Callable, Dict, Hashable
+
+
+class SingleFlightCache:
+    """
+    Thread-safe, size-bounded, least recently used in-memory cache.
+
+    Concurrent misses for the same key are deduplicated: the first caller loads the value, and
+    the others wait for its result. Failures are propagated to all of them, but not cached.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        :param max_size: The maximum number of values kept; the least recently used ones are
+            evicted beyond that. Zero disables caching, but not the deduplication.
+        """
+        if max_size < 0:
+            raise ValueError('The cache size must not be negative.')
+
+        self.__max_size = max_size
+        self.__values = collections.OrderedDict()
+        self.__loading = {}
+        self.__lock = threading.Lock()
+        self.__stats = collections.Counter(hits=0, misses=0, coalesced=0, evictions=0)
+
+    def get(self, key: Hashable, load: Callable[[Hashable], object]):
+        """
+        Get the cached value for a key, loading it if not cached.
+
+        :param key: The key.
+        :param load: Called with the key to load its value on misses.
+        :return: The value.
+        """
+        with self.__lock:
+            if key in self.__values:
+                self.__values.move_to_end(key)
+                self.__stats['hits'] += 1
+                return self.__values[key]
+
+            future = self.__loading.get(key)
+            is_loader = future is None
+            if is_loader:
+                future = futures.Future()
+                self.__loading[key] = future
+                self.__stats['misses'] += 1
+            else:
+                self.__stats['coalesced'] += 1
+
+        if not is_loader:
+            return future.result()
+
+        try:
+            value = load(key)
+        except BaseException as error:
+            with self.__lock:
+                del self.__loading[key]
+            future.set_exception(error)
+            raise
+
+        with self.__lock:
+            del self.__loading[key]
+            self.__put(key, value)
+        future.set_result(value)
+        return value
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the cache usage statistics.
+
+        :return: A dict with the number of hits, misses, misses coalesced into an in-flight
+            load, evictions, and the current size.
+        """
+        with self.__lock:
+            return dict(self.__stats, size=len(self.__values))
+
+    def __put(self, key, value):
+        if not self.__max_size:
+            return
+
+        self.__values[key] = value
+        while len(self.__values) > self.__max_size:
+            self.__values.popitem(last=False)
+            self.__stats['evictions'] += 1
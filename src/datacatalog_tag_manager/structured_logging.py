@@ -0,0 +1,185 @@
+import collections
+import contextlib
+import datetime
+import json
+import logging
+from logging import handlers
+import queue
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+from . import constant
+
+
+class EntryEvents:
+    """
+    Aggregate the events of processing each Entry, such as API calls, into a single log record
+    instead of several records per event.
+
+    Aggregation is disabled by default and, once enabled, applies to the Entries processed
+    within ``aggregate``, by the thread that entered it.
+    """
+
+    __enabled = False
+    __local = threading.local()
+
+    @classmethod
+    def enable(cls, enabled: bool = True):
+        cls.__enabled = enabled
+
+    @classmethod
+    @contextlib.contextmanager
+    def aggregate(cls, entry_name_or_resource: str, events: Dict[str, int] = None):
+        """
+        Aggregate the events recorded by the current thread, then log them, and the time taken,
+        as a single record.
+
+        :param entry_name_or_resource: The Entry name or linked resource, as in the datasource.
+        :param events: The events previously recorded for the Entry, e.g. by ``collect``.
+        """
+        if not cls.__enabled or cls.is_aggregating():
+            yield
+            return
+
+        events = cls.__local.events = collections.Counter(events)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            del cls.__local.events
+            logging.info('Entry processed: %s',
+                         entry_name_or_resource,
+                         extra={
+                             constant.LOG_RECORD_FIELDS_ATTRIBUTE: {
+                                 'entry': entry_name_or_resource,
+                                 'events': dict(events),
+                                 'seconds': round(time.perf_counter() - start, 6)
+                             }
+                         })
+
+    @classmethod
+    @contextlib.contextmanager
+    def collect(cls) -> Iterator[Optional[collections.Counter]]:
+        """
+        Collect the events recorded by the current thread without logging them, so they can be
+        added to an Entry's record later, e.g. when Entries are resolved before being processed.
+
+        :return: A context manager that yields the collected events, or None if events are not
+            being aggregated.
+        """
+        if not cls.__enabled or cls.is_aggregating():
+            yield None
+            return
+
+        events = cls.__local.events = collections.Counter()
+        try:
+            yield events
+        finally:
+            del cls.__local.events
+
+    @classmethod
+    def is_aggregating(cls) -> bool:
+        return getattr(cls.__local, 'events', None) is not None
+
+    @classmethod
+    def record(cls, event: str) -> bool:
+        """
+        Record an event in the current Entry's record.
+
+        :param event: The event name, e.g. ``create_tag``.
+        :return: False if events are not being aggregated, so the caller should log it.
+        """
+        events = getattr(cls.__local, 'events', None)
+        if events is None:
+            return False
+
+        events[event] += 1
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as JSON objects, one per line, with the UTC time, level, logger name,
+    message, and the fields passed as ``extra={constant.LOG_RECORD_FIELDS_ATTRIBUTE: {...}}``.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        created_at = datetime.datetime.fromtimestamp(record.created, tz=datetime.timezone.utc)
+        document = {
+            'time': created_at.isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            # Leading spaces only indent the text output.
+            'message': record.getMessage().strip()
+        }
+        document.update(getattr(record, constant.LOG_RECORD_FIELDS_ATTRIBUTE, None) or {})
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            document['exception'] = record.exc_text
+
+        return json.dumps(document, default=str)
+
+
+class _DecorationFilter(logging.Filter):
+    # Blank lines and separators make the text output readable, but are noise otherwise.
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.msg
+        return not isinstance(message, str) or bool(message.strip('-= '))
+
+
+class _QueueHandler(handlers.QueueHandler):
+    """
+    Unlike the standard handler, leave the message formatting to the listener thread; only
+    tracebacks are rendered before enqueuing, as they reference frames that keep changing.
+    Arguments must not be mutated after logging, which holds for the ones this package logs.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+@contextlib.contextmanager
+def logging_to_queue(level: str = constant.LOG_LEVEL_INFO,
+                     log_format: str = constant.LOG_FORMAT_TEXT):
+    """
+    Configure the root logger to hand records over to a background thread, which formats and
+    writes them to the standard error, so callers do not wait for the output. The previous
+    configuration is restored on exit, once all the records have been written.
+
+    :param level: One of ``constant.LOG_LEVELS``.
+    :param log_format: ``constant.LOG_FORMAT_TEXT``, or ``constant.LOG_FORMAT_JSON`` to write
+        JSON objects, one per line, and aggregate the events of each Entry into a single record.
+    """
+    stream_handler = logging.StreamHandler()
+    if log_format == constant.LOG_FORMAT_JSON:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+    records_queue = queue.Queue()
+    queue_handler = _QueueHandler(records_queue)
+    if log_format == constant.LOG_FORMAT_JSON:
+        queue_handler.addFilter(_DecorationFilter())
+    listener = handlers.QueueListener(records_queue, stream_handler)
+
+    root_logger = logging.getLogger()
+    previous_handlers, previous_level = root_logger.handlers[:], root_logger.level
+    root_logger.handlers = [queue_handler]
+    root_logger.setLevel(level.upper())
+    EntryEvents.enable(log_format == constant.LOG_FORMAT_JSON)
+    listener.start()
+    try:
+        yield
+    finally:
+        # Write the records still in the queue before restoring the configuration.
+        listener.stop()
+        EntryEvents.enable(False)
+        root_logger.handlers = previous_handlers
+        root_logger.setLevel(previous_level)
@@ -0,0 +1,111 @@
+import itertools
+import math
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from . import constant
+
+# Fields mapped to their values.
+FieldsDict = Dict[str, object]
+# Schema columns mapped to the fields of their Tags; None stands for the Entry itself.
+ColumnsDict = Dict[Optional[str], FieldsDict]
+# Tag Template names mapped to the columns their Tags are attached to.
+TemplatesDict = Dict[str, ColumnsDict]
+
+
+class TagDatasourcePartitioner:
+    """
+    Build the Entry -> Tag Template -> column -> fields hierarchy from Tag datasource rows in a
+    single pass.
+
+    Rows are tuples whose values follow ``constant.TAGS_DS_COLUMNS_ORDER``; missing values may be
+    either None or NaN. Missing values of the ``constant.TAGS_DS_FILLABLE_COLUMNS`` are filled by
+    propagating the last valid observation forward.
+    """
+
+    __FILLABLE_INDEXES = tuple(
+        constant.TAGS_DS_COLUMNS_ORDER.index(column)
+        for column in constant.TAGS_DS_FILLABLE_COLUMNS)
+
+    @classmethod
+    def partition(cls, rows: Iterable[tuple]) -> Dict[str, TemplatesDict]:
+        """
+        Group all the rows by Entry, regardless of their positions in the datasource.
+
+        :param rows: The datasource rows.
+        :return: A dict with Entry names or linked resources as keys, in the order they first
+            appear in the datasource.
+        """
+        entries = {}
+        for row in cls.__fill_rows(rows):
+            cls.__add_row(entries.setdefault(row[0], {}), row)
+
+        return entries
+
+    @classmethod
+    def stream_partitions(cls, rows: Iterable[tuple]) -> Iterator[Tuple[str, TemplatesDict]]:
+        """
+        Group contiguous rows by Entry, yielding each group as soon as it is complete.
+
+        :param rows: The datasource rows.
+        :return: A generator of (Entry name or linked resource, Tag Templates dict) tuples.
+        """
+        entry_name_or_resource = None
+        templates = None
+        for row in cls.__fill_rows(rows):
+            if templates is None or row[0] != entry_name_or_resource:
+                if templates is not None:
+                    yield entry_name_or_resource, templates
+                entry_name_or_resource = row[0]
+                templates = {}
+
+            cls.__add_row(templates, row)
+
+        if templates is not None:
+            yield entry_name_or_resource, templates
+
+    @classmethod
+    def stream_tags(
+        cls, tags: Iterable[Tuple[str, str, Optional[str], FieldsDict]]
+    ) -> Iterator[Tuple[str, TemplatesDict]]:
+        """
+        Group contiguous Tags by Entry, yielding each group as soon as it is complete. Unlike
+        rows, Tags are complete on their own, so nothing is filled.
+
+        :param tags: (Entry name or linked resource, Tag Template name, column, fields) tuples.
+        :return: A generator of (Entry name or linked resource, Tag Templates dict) tuples.
+        """
+        for entry_name_or_resource, entry_tags in itertools.groupby(tags, key=lambda tag: tag[0]):
+            templates = {}
+            for _, template_name, column, fields in entry_tags:
+                # Fields given more than once for the same Tag are merged, as rows are.
+                templates.setdefault(template_name, {}).setdefault(column, {}).update(
+                    (field_id, field_value) for field_id, field_value in fields.items()
+                    if not cls.__is_missing(field_value))
+            yield entry_name_or_resource, templates
+
+    @classmethod
+    def __fill_rows(cls, rows: Iterable[tuple]) -> Iterator[tuple]:
+        last_values = [None] * len(constant.TAGS_DS_COLUMNS_ORDER)
+        for row in rows:
+            row = [None if cls.__is_missing(value) else value for value in row]
+            for index in cls.__FILLABLE_INDEXES:
+                if row[index] is None:
+                    row[index] = last_values[index]
+                else:
+                    last_values[index] = row[index]
+            yield row
+
+    @classmethod
+    def __add_row(cls, templates: TemplatesDict, row: list):
+        _, template_name, column, field_id, field_value = row
+
+        # The column is registered even if the row has no field, so Tags with no fields are
+        # still made, e.g. when deleting Tags.
+        fields = templates.setdefault(template_name, {}).setdefault(column, {})
+        if field_id is not None and field_value is not None:
+            fields[field_id] = field_value
+
+    @classmethod
+    def __is_missing(cls, value) -> bool:
+        # Pandas is not aware of the field types and reads empty values as NaN.
+        return value is None or isinstance(value, float) and math.isnan(value)
@@ -1,25 +1,466 @@
+import asyncio
+import collections
+from concurrent import futures
+import itertools
 import logging
-import math
 import re
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from google.api_core import exceptions
-from google.cloud.datacatalog import Entry, Tag
-import pandas as pd
+from google.cloud.datacatalog import Entry, Tag, TagTemplate
 
-from . import constant, datacatalog_entity_factory, datacatalog_facade
+from . import checkpoint_journal, constant, datacatalog_async_facade, \
+    datacatalog_entity_factory, datacatalog_facade, persistent_cache, rate_limiting, retrying, \
+    run_metrics, structured_logging, tag_datasource_partitioner, tag_datasource_reader, \
+    tag_datasource_writer, tag_operations_plan
 
 
 class TagDatasourceProcessor:
+    __APPLY_OPERATIONS = (constant.TAG_OPERATION_CREATED, constant.TAG_OPERATION_UPDATED,
+                          constant.TAG_OPERATION_DELETED)
+    __DELETE_OPERATIONS = (constant.TAG_OPERATION_DELETED, )
+    __SYNC_OPERATIONS = (constant.TAG_OPERATION_CREATED, constant.TAG_OPERATION_UPDATED,
+                         constant.TAG_OPERATION_UNCHANGED, constant.TAG_OPERATION_DELETED)
+    __PLAN_OPERATIONS = (constant.TAG_PLAN_OPERATION_CREATE, constant.TAG_PLAN_OPERATION_UPDATE,
+                         constant.TAG_PLAN_OPERATION_DELETE)
+    __UPSERT_OPERATIONS = (constant.TAG_OPERATION_CREATED, constant.TAG_OPERATION_UPDATED,
+                           constant.TAG_OPERATION_UNCHANGED)
 
-    def __init__(self):
-        self.__datacatalog_facade = datacatalog_facade.DataCatalogFacade()
+    def __init__(self,
+                 workers: int = 1,
+                 cache_dir: str = None,
+                 cache_ttls: Dict[str, float] = None,
+                 memory_cache_sizes: Dict[str, int] = None,
+                 reads_per_minute: float = None,
+                 writes_per_minute: float = None,
+                 max_attempts: int = 5,
+                 retry_budget: int = None,
+                 metrics: run_metrics.RunMetrics = None,
+                 initial_backoff: float = 1.0):
+        """
+        :param workers: The number of Entries processed concurrently. Tags belonging to the same
+            Entry are always processed sequentially, in the datasource order.
+        :param cache_dir: If provided, keep Entries and Tag Templates in a persistent cache
+            stored in this directory, so they are not read from the API again by later runs.
+        :param cache_ttls: The persistent cache time-to-live, in seconds, by
+            ``constant.CACHE_KIND_*``; defaults to ``constant.CACHE_DEFAULT_TTLS``.
+        :param memory_cache_sizes: The maximum number of Entries and Tag Templates kept in
+            memory, by ``constant.CACHE_KIND_*``; defaults to
+            ``constant.MEMORY_CACHE_DEFAULT_SIZES``.
+        :param reads_per_minute: The maximum sustained rate of API read calls; unlimited if not
+            provided.
+        :param writes_per_minute: The maximum sustained rate of API write calls; unlimited if
+            not provided.
+        :param max_attempts: The maximum number of attempts per API call failed with transient
+            errors, such as quota errors and timeouts.
+        :param retry_budget: The maximum number of API call retries per processor; unlimited if
+            not provided.
+        :param metrics: Records the run metrics, e.g. to forward them to hooks; a new recorder
+            is created if not provided. See ``get_metrics``.
+        :param initial_backoff: The maximum wait, in seconds, before the first retry of each
+            API call; see ``retrying.RetryPolicy``.
+        """
+        if workers < 1:
+            raise ValueError('The number of workers must be greater than zero.')
+
+        self.__cache = persistent_cache.PersistentCache(cache_dir, cache_ttls) \
+            if cache_dir else None
+        self.__metrics = metrics or run_metrics.RunMetrics()
+        # The concurrency is adapted to quota errors; it is at most the number of workers.
+        rate_limiter = rate_limiting.RateLimiter(reads_per_minute,
+                                                 writes_per_minute,
+                                                 max_concurrency=workers)
+        self.__datacatalog_facade = datacatalog_facade.DataCatalogFacade(
+            cache=self.__cache,
+            memory_cache_sizes=memory_cache_sizes,
+            rate_limiter=rate_limiter,
+            retry_policy=retrying.RetryPolicy(max_attempts=max_attempts,
+                                              initial_backoff=initial_backoff,
+                                              retry_budget=retry_budget),
+            metrics=self.__metrics)
+        self.__workers = workers
+        # Tags skipped due to invalid field values by Entry name or linked resource, reported at
+        # the end of each run.
+        self.__invalid_tags = {}
+        # Entries whose Tags were not all processed, e.g. due to unavailable Entries or Tag
+        # Templates, or invalid field values, by name or linked resource; they are left pending
+        # in the checkpoint files.
+        self.__incomplete_entries = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the persistent cache, if any. The processor must not be used afterwards.
+        """
+        if self.__cache:
+            self.__cache.close()
 
-    def upsert_tags_from_csv(self, file_path: str) -> List[Tag]:
+    def get_metrics(self) -> run_metrics.RunMetrics:
+        """
+        Get the metrics of all the runs made by this processor so far: API calls by method, Tag
+        operations, rows parsed, and stage wall times, plus gauges with the current cache and
+        retry statistics.
+
+        Datasources read in chunks or JSON Lines files are read while processing them; their
+        reading time is part of the process stage, not the read one.
+        """
+        facade = self.__datacatalog_facade
+        for kind, stats in facade.get_cache_stats().items():
+            for name, value in stats.items():
+                self.__metrics.set_gauge(f'cache_{kind}_{name}', value)
+        for name, value in facade.get_retry_stats().items():
+            self.__metrics.set_gauge(f'api_call_{name}', value)
+
+        return self.__metrics
+
+    def upsert_tags_from_csv(self,
+                             file_path: str,
+                             chunk_size: int = None,
+                             csv_reader: str = None,
+                             checkpoint_file_path: str = None,
+                             managed_template_names: Iterable[str] = None,
+                             keep_results: bool = True) -> Optional[list]:
         """
         Upsert Tags by reading information from a CSV file.
 
+        :param file_path: The CSV file path, or ``constant.STDIN_FILE_PATH`` to read the
+            standard input. gzip, bzip2, and Zstandard compressed files are decompressed on the
+            fly.
+        :param chunk_size: If provided, stream the file in chunks of this many rows and process
+            each Entry as soon as all of its rows have been read, so memory usage is bounded by
+            the chunk size and the largest Entry. Rows belonging to the same Entry are expected
+            to be contiguous in this mode.
+        :param csv_reader: ``constant.CSV_READER_STDLIB`` or ``constant.CSV_READER_PANDAS``.
+            Defaults to pandas if it is installed.
+        :param checkpoint_file_path: If provided, record each Entry whose Tags were successfully
+            processed in this file, and skip the Entries already recorded by previous runs.
+        :param managed_template_names: If provided, sync the Tags of these Tag Templates: Tags
+            attached to the processed Entries whose template and column are not in the file are
+            deleted. Entries not in the file, and Tags of other templates, are left untouched.
+            When streaming, rows belonging to the same Entry must be contiguous.
+        :param keep_results: If False, release the results of each Entry once it is processed
+            instead of returning them, so memory usage does not grow with the number of Tags,
+            e.g. when streaming.
+        :return: A list with all upserted Tags, and the names of the Tags deleted when syncing;
+            None if ``keep_results`` is False.
+        """
+        return self.__upsert_tags(
+            'CSV', file_path,
+            lambda: self.__read_csv_entries_subsets(file_path, chunk_size, csv_reader),
+            checkpoint_file_path, managed_template_names, keep_results)
+
+    def delete_tags_from_csv(self,
+                             file_path: str,
+                             chunk_size: int = None,
+                             csv_reader: str = None,
+                             checkpoint_file_path: str = None,
+                             keep_results: bool = True) -> Optional[List[str]]:
+        """
+        Delete Tags by reading information from a CSV file.
+
+        :param file_path: The CSV file path, or ``constant.STDIN_FILE_PATH`` to read the
+            standard input. gzip, bzip2, and Zstandard compressed files are decompressed on the
+            fly.
+        :param chunk_size: If provided, stream the file in chunks of this many rows and process
+            each Entry as soon as all of its rows have been read, so memory usage is bounded by
+            the chunk size and the largest Entry. Rows belonging to the same Entry are expected
+            to be contiguous in this mode.
+        :param csv_reader: ``constant.CSV_READER_STDLIB`` or ``constant.CSV_READER_PANDAS``.
+            Defaults to pandas if it is installed.
+        :param checkpoint_file_path: If provided, record each Entry whose Tags were successfully
+            processed in this file, and skip the Entries already recorded by previous runs.
+        :param keep_results: See ``upsert_tags_from_csv``.
+        :return: A list with all Tags deleted; None if ``keep_results`` is False.
+        """
+        return self.__delete_tags(
+            'CSV', file_path,
+            lambda: self.__read_csv_entries_subsets(file_path, chunk_size, csv_reader),
+            checkpoint_file_path, keep_results)
+
+    def upsert_tags_from_jsonl(self,
+                               file_path: str,
+                               checkpoint_file_path: str = None,
+                               managed_template_names: Iterable[str] = None,
+                               keep_results: bool = True) -> Optional[list]:
+        """
+        Upsert Tags by reading information from a JSON Lines file, one Tag per line. See
+        ``TagDatasourceReader.read_jsonl`` for the format.
+
+        The file is streamed: each Entry is processed as soon as its lines have been read, so
+        memory usage does not depend on the file size. Lines belonging to the same Entry are
+        expected to be contiguous.
+
+        :param file_path: The JSON Lines file path, or ``constant.STDIN_FILE_PATH`` to read the
+            standard input. gzip, bzip2, and Zstandard compressed files are decompressed on the
+            fly.
+        :param checkpoint_file_path: See ``upsert_tags_from_csv``.
+        :param managed_template_names: See ``upsert_tags_from_csv``.
+        :param keep_results: See ``upsert_tags_from_csv``.
+        :return: See ``upsert_tags_from_csv``.
+        """
+        return self.__upsert_tags('JSON Lines', file_path,
+                                  lambda: self.__read_jsonl_entries_subsets(file_path),
+                                  checkpoint_file_path, managed_template_names, keep_results)
+
+    def delete_tags_from_jsonl(self,
+                               file_path: str,
+                               checkpoint_file_path: str = None,
+                               keep_results: bool = True) -> Optional[List[str]]:
+        """
+        Delete Tags by reading information from a JSON Lines file, one Tag per line. See
+        ``upsert_tags_from_jsonl``.
+
+        :param file_path: The JSON Lines file path, or ``constant.STDIN_FILE_PATH`` to read the
+            standard input. gzip, bzip2, and Zstandard compressed files are decompressed on the
+            fly.
+        :param checkpoint_file_path: See ``delete_tags_from_csv``.
+        :param keep_results: See ``upsert_tags_from_csv``.
+        :return: See ``delete_tags_from_csv``.
+        """
+        return self.__delete_tags('JSON Lines', file_path,
+                                  lambda: self.__read_jsonl_entries_subsets(file_path),
+                                  checkpoint_file_path, keep_results)
+
+    def upsert_tags_from_parquet(self,
+                                 file_path: str,
+                                 chunk_size: int = None,
+                                 checkpoint_file_path: str = None,
+                                 managed_template_names: Iterable[str] = None,
+                                 keep_results: bool = True) -> Optional[list]:
+        """
+        Upsert Tags by reading information from a Parquet file. Requires pyarrow.
+
+        Only the Tag datasource columns are read, and the file is memory-mapped and read in
+        batches. Field values keep their Parquet types, e.g. doubles, booleans, and timestamps.
+
+        :param file_path: The Parquet file path.
+        :param chunk_size: If provided, read the file in batches of this many rows and process
+            each Entry as soon as all of its rows have been read, so memory usage is bounded by
+            the chunk size and the largest Entry. Rows belonging to the same Entry are expected
+            to be contiguous in this mode.
+        :param checkpoint_file_path: See ``upsert_tags_from_csv``.
+        :param managed_template_names: See ``upsert_tags_from_csv``.
+        :param keep_results: See ``upsert_tags_from_csv``.
+        :return: See ``upsert_tags_from_csv``.
+        """
+        return self.__upsert_tags(
+            'Parquet', file_path,
+            lambda: self.__read_parquet_entries_subsets(file_path, chunk_size),
+            checkpoint_file_path, managed_template_names, keep_results)
+
+    def delete_tags_from_parquet(self,
+                                 file_path: str,
+                                 chunk_size: int = None,
+                                 checkpoint_file_path: str = None,
+                                 keep_results: bool = True) -> Optional[List[str]]:
+        """
+        Delete Tags by reading information from a Parquet file. Requires pyarrow.
+
+        :param file_path: The Parquet file path.
+        :param chunk_size: See ``upsert_tags_from_parquet``.
+        :param checkpoint_file_path: See ``delete_tags_from_csv``.
+        :param keep_results: See ``upsert_tags_from_csv``.
+        :return: See ``delete_tags_from_csv``.
+        """
+        return self.__delete_tags(
+            'Parquet', file_path,
+            lambda: self.__read_parquet_entries_subsets(file_path, chunk_size),
+            checkpoint_file_path, keep_results)
+
+    def plan_upsert_tags_from_csv(self,
+                                  file_path: str,
+                                  plan_file_path: str,
+                                  chunk_size: int = None,
+                                  csv_reader: str = None
+                                  ) -> List[tag_operations_plan.TagOperation]:
+        """
+        Plan the Tags upsert by reading information from a CSV file and the current Tags from
+        Data Catalog, then write the create and update operations to a plan file. Nothing is
+        written to Data Catalog; use ``apply_plan`` to execute the plan.
+
+        :param file_path: The CSV file path, or ``constant.STDIN_FILE_PATH`` to read the
+            standard input. gzip, bzip2, and Zstandard compressed files are decompressed on the
+            fly.
+        :param plan_file_path: The plan file path.
+        :param chunk_size: See ``upsert_tags_from_csv``.
+        :param csv_reader: See ``upsert_tags_from_csv``.
+        :return: A list with all planned operations.
+        """
+        logging.info('')
+        logging.info('===> Plan Tags upsert from CSV [STARTED]')
+
+        logging.info('')
+        logging.info('Reading CSV file: %s...', file_path)
+        with self.__metrics.time_stage(constant.METRICS_STAGE_READ):
+            entries_subsets = self.__read_csv_entries_subsets(file_path, chunk_size, csv_reader)
+
+        logging.info('')
+        logging.info('Planning the Tags upsert...')
+        with self.__metrics.time_stage(constant.METRICS_STAGE_PROCESS):
+            operations = self.__plan_entries_subsets(
+                entries_subsets,
+                planner=self.__datacatalog_facade.plan_upsert_tag,
+                plan_file_path=plan_file_path)
+
+        logging.info('')
+        logging.info('==== Plan Tags upsert from CSV [FINISHED] =======')
+
+        return operations
+
+    def plan_delete_tags_from_csv(self,
+                                  file_path: str,
+                                  plan_file_path: str,
+                                  chunk_size: int = None,
+                                  csv_reader: str = None
+                                  ) -> List[tag_operations_plan.TagOperation]:
+        """
+        Plan the Tags deletion by reading information from a CSV file and the current Tags from
+        Data Catalog, then write the delete operations to a plan file. Nothing is written to
+        Data Catalog; use ``apply_plan`` to execute the plan.
+
+        :param file_path: The CSV file path, or ``constant.STDIN_FILE_PATH`` to read the
+            standard input. gzip, bzip2, and Zstandard compressed files are decompressed on the
+            fly.
+        :param plan_file_path: The plan file path.
+        :param chunk_size: See ``delete_tags_from_csv``.
+        :param csv_reader: See ``delete_tags_from_csv``.
+        :return: A list with all planned operations.
+        """
+        logging.info('')
+        logging.info('===> Plan Tags deletion from CSV [STARTED]')
+
+        logging.info('')
+        logging.info('Reading CSV file: %s...', file_path)
+        with self.__metrics.time_stage(constant.METRICS_STAGE_READ):
+            entries_subsets = self.__read_csv_entries_subsets(file_path, chunk_size, csv_reader)
+
+        logging.info('')
+        logging.info('Planning the Tags deletion...')
+        with self.__metrics.time_stage(constant.METRICS_STAGE_PROCESS):
+            operations = self.__plan_entries_subsets(
+                entries_subsets,
+                planner=self.__datacatalog_facade.plan_delete_tag,
+                plan_file_path=plan_file_path)
+
+        logging.info('')
+        logging.info('==== Plan Tags deletion from CSV [FINISHED] =====')
+
+        return operations
+
+    def apply_plan(self, plan_file_path: str) -> list:
+        """
+        Execute the operations of a plan file, as written by ``plan_upsert_tags_from_csv`` or
+        ``plan_delete_tags_from_csv``, without reading anything else from Data Catalog.
+
+        :param plan_file_path: The plan file path.
+        :return: A list with all created and updated Tags, and deleted Tag names.
+        """
+        logging.info('')
+        logging.info('===> Apply Tags plan [STARTED]')
+
+        logging.info('')
+        logging.info('Reading plan file: %s...', plan_file_path)
+        operations = tag_operations_plan.TagOperationsPlan.read(plan_file_path)
+        # Operations are planned Entry by Entry, so the ones of the same Entry are contiguous.
+        entries_operations = (list(entry_operations) for _, entry_operations in itertools.groupby(
+            operations, key=lambda op: op.parent_entry_name))
+
+        logging.info('')
+        logging.info('Applying the operations...')
+        operation_counts = self.__datacatalog_facade.get_operation_counts()
+        with self.__metrics.time_stage(constant.METRICS_STAGE_PROCESS):
+            results = self.__map_entries(self.__apply_entry_operations, entries_operations)
+        self.__log_operations_summary(self.__APPLY_OPERATIONS, operation_counts,
+                                      self.__datacatalog_facade.get_operation_counts())
+        self.__log_invalid_tags()
+        self.__log_stats()
+
+        logging.info('')
+        logging.info('==== Apply Tags plan [FINISHED] =================')
+
+        return results
+
+    def export_tags_to_csv(self, names_or_resources: Iterable[str], file_path: str) -> int:
+        """
+        Export the Tags attached to Entries to a CSV file, in the format read by
+        ``upsert_tags_from_csv``, e.g. for backups or to compare Data Catalog states.
+
+        Entries are processed concurrently by the workers, and their rows are written as soon as
+        their Tags have been listed, in the given order, so the file is never held in memory.
+        Tags are sorted by template and column, and fields by id, so exports of the same Tags
+        are identical.
+
+        :param names_or_resources: The Entry names or linked resources; they are written as
+            given, so linked resources are looked up again when the file is upserted.
+        :param file_path: The CSV file path, or ``constant.STDOUT_FILE_PATH`` to write to the
+            standard output.
+        :return: The number of Tags exported.
+        """
+        logging.info('')
+        logging.info('===> Export Tags to CSV [STARTED]')
+
+        logging.info('')
+        logging.info('Exporting the Tags to: %s...', file_path)
+        unresolved_names_or_resources = []
+
+        def list_entry_tags(name_or_resource):
+            with structured_logging.EntryEvents.aggregate(name_or_resource):
+                catalog_entry = self.__find_entry(name_or_resource)
+                if not catalog_entry:
+                    unresolved_names_or_resources.append(name_or_resource)
+                    return name_or_resource, []
+
+                entry_tags = self.__datacatalog_facade.index_tags(catalog_entry.name)
+                return name_or_resource, [entry_tags[key] for key in sorted(entry_tags)]
+
+        distinct_names_or_resources = self.__distinct(names_or_resources)
+        if self.__workers > 1:
+            entries_tags = self.__map_concurrently(list_entry_tags, distinct_names_or_resources)
+        else:
+            entries_tags = map(list_entry_tags, distinct_names_or_resources)
+
+        exported_tags_count = 0
+
+        def make_rows():
+            nonlocal exported_tags_count
+            for name_or_resource, tags in entries_tags:
+                for tag in tags:
+                    yield from self.__make_tag_rows(name_or_resource, tag)
+                exported_tags_count += len(tags)
+
+        with self.__metrics.time_stage(constant.METRICS_STAGE_PROCESS):
+            rows_count = tag_datasource_writer.TagDatasourceWriter.write_csv(
+                file_path, make_rows())
+
+        self.__log_unresolved_entries(unresolved_names_or_resources)
+        logging.info('')
+        logging.info('Tags exported: %d, rows written: %d.', exported_tags_count, rows_count)
+        self.__log_stats()
+
+        logging.info('')
+        logging.info('==== Export Tags to CSV [FINISHED] ==============')
+
+        return exported_tags_count
+
+    async def upsert_tags_from_csv_async(self,
+                                         file_path: str,
+                                         max_concurrent_requests: int = 10,
+                                         csv_reader: str = None) -> List[Tag]:
+        """
+        Upsert Tags by reading information from a CSV file, using the asyncio API client.
+
+        Entries are processed concurrently; Tags belonging to the same Entry are processed
+        sequentially, in the datasource order.
+
         :param file_path: The CSV file path.
+        :param max_concurrent_requests: The maximum number of API requests in flight.
+        :param csv_reader: ``constant.CSV_READER_STDLIB`` or ``constant.CSV_READER_PANDAS``.
+            Defaults to pandas if it is installed.
         :return: A list with all upserted Tags.
         """
         logging.info('')
@@ -27,23 +468,36 @@ class TagDatasourceProcessor:
 
         logging.info('')
         logging.info('Reading CSV file: %s...', file_path)
-        dataframe = pd.read_csv(file_path)
+        entries_subsets = await self.__read_csv_entries_subsets_async(file_path, csv_reader)
 
         logging.info('')
         logging.info('Upserting the Tags...')
-        upserted_tags = self.__process_tags_from_dataframe(
-            dataframe, processor=self.__datacatalog_facade.upsert_tag)
+        async_facade = datacatalog_async_facade.DataCatalogAsyncFacade(max_concurrent_requests)
+        upserted_tags = await self.__process_entries_subsets_async(
+            entries_subsets, async_facade, processor=async_facade.upsert_tag)
+        self.__log_operations_summary(self.__UPSERT_OPERATIONS, {},
+                                      async_facade.get_operation_counts())
+        self.__log_invalid_tags()
 
         logging.info('')
         logging.info('==== Upsert Tags from CSV [FINISHED] =============')
 
         return upserted_tags
 
-    def delete_tags_from_csv(self, file_path: str) -> List[str]:
+    async def delete_tags_from_csv_async(self,
+                                         file_path: str,
+                                         max_concurrent_requests: int = 10,
+                                         csv_reader: str = None) -> List[str]:
         """
-        Delete Tags by reading information from a CSV file.
+        Delete Tags by reading information from a CSV file, using the asyncio API client.
+
+        Entries are processed concurrently; Tags belonging to the same Entry are processed
+        sequentially, in the datasource order.
 
         :param file_path: The CSV file path.
+        :param max_concurrent_requests: The maximum number of API requests in flight.
+        :param csv_reader: ``constant.CSV_READER_STDLIB`` or ``constant.CSV_READER_PANDAS``.
+            Defaults to pandas if it is installed.
         :return: A list with all Tags deleted.
         """
         logging.info('')
@@ -51,53 +505,433 @@ class TagDatasourceProcessor:
 
         logging.info('')
         logging.info('Reading CSV file: %s...', file_path)
-        dataframe = pd.read_csv(file_path)
+        entries_subsets = await self.__read_csv_entries_subsets_async(file_path, csv_reader)
 
         logging.info('')
         logging.info('Deleting the Tags...')
-        deleted_tag_names = self.__process_tags_from_dataframe(
-            dataframe, processor=self.__datacatalog_facade.delete_tag)
+        async_facade = datacatalog_async_facade.DataCatalogAsyncFacade(max_concurrent_requests)
+        deleted_tag_names = await self.__process_entries_subsets_async(
+            entries_subsets, async_facade, processor=async_facade.delete_tag)
+        self.__log_operations_summary(self.__DELETE_OPERATIONS, {},
+                                      async_facade.get_operation_counts())
+        self.__log_invalid_tags()
 
         logging.info('')
         logging.info('==== Delete Tags from CSV [FINISHED] =============')
 
         return deleted_tag_names
 
-    def __process_tags_from_dataframe(self, dataframe, processor):
-        normalized_df = self.__normalize_dataframe(dataframe)
-        normalized_df.set_index(constant.TAGS_DS_LINKED_RESOURCE_ENTRY_NAME_COLUMN_LABEL,
-                                inplace=True)
+    def __upsert_tags(self,
+                      source_type,
+                      file_path,
+                      read_entries_subsets,
+                      checkpoint_file_path,
+                      managed_template_names=None,
+                      keep_results=True):
+
+        logging.info('')
+        logging.info('===> Upsert Tags from %s [STARTED]', source_type)
+
+        logging.info('')
+        logging.info('Reading %s file: %s...', source_type, file_path)
+        with self.__metrics.time_stage(constant.METRICS_STAGE_READ):
+            entries_subsets = read_entries_subsets()
+
+        logging.info('')
+        if managed_template_names:
+            managed_template_names = frozenset(managed_template_names)
+            logging.info('Syncing the Tags of %d managed Tag Templates...',
+                         len(managed_template_names))
+        else:
+            logging.info('Upserting the Tags...')
+        operation_counts = self.__datacatalog_facade.get_operation_counts()
+        with self.__metrics.time_stage(constant.METRICS_STAGE_PROCESS):
+            upserted_tags = self.__process_entries_subsets(
+                entries_subsets,
+                processor=self.__datacatalog_facade.upsert_tag,
+                checkpoint_file_path=checkpoint_file_path,
+                managed_template_names=managed_template_names,
+                keep_results=keep_results)
+        self.__log_operations_summary(
+            self.__SYNC_OPERATIONS if managed_template_names else self.__UPSERT_OPERATIONS,
+            operation_counts, self.__datacatalog_facade.get_operation_counts())
+        self.__log_invalid_tags()
+        if checkpoint_file_path:
+            self.__log_incomplete_entries()
+        self.__log_stats()
+
+        logging.info('')
+        logging.info('==== Upsert Tags from %s [FINISHED] =============', source_type)
+
+        return upserted_tags
+
+    def __delete_tags(self,
+                      source_type,
+                      file_path,
+                      read_entries_subsets,
+                      checkpoint_file_path,
+                      keep_results=True):
+
+        logging.info('')
+        logging.info('===> Delete Tags from %s [STARTED]', source_type)
+
+        logging.info('')
+        logging.info('Reading %s file: %s...', source_type, file_path)
+        with self.__metrics.time_stage(constant.METRICS_STAGE_READ):
+            entries_subsets = read_entries_subsets()
+
+        logging.info('')
+        logging.info('Deleting the Tags...')
+        operation_counts = self.__datacatalog_facade.get_operation_counts()
+        with self.__metrics.time_stage(constant.METRICS_STAGE_PROCESS):
+            deleted_tag_names = self.__process_entries_subsets(
+                entries_subsets,
+                processor=self.__datacatalog_facade.delete_tag,
+                checkpoint_file_path=checkpoint_file_path,
+                keep_results=keep_results)
+        self.__log_operations_summary(self.__DELETE_OPERATIONS, operation_counts,
+                                      self.__datacatalog_facade.get_operation_counts())
+        self.__log_invalid_tags()
+        if checkpoint_file_path:
+            self.__log_incomplete_entries()
+        self.__log_stats()
+
+        logging.info('')
+        logging.info('==== Delete Tags from %s [FINISHED] =============', source_type)
+
+        return deleted_tag_names
+
+    async def __read_csv_entries_subsets_async(self, file_path: str, csv_reader: str = None):
+        # Do not block the event loop while reading the file.
+        return await asyncio.get_event_loop().run_in_executor(None,
+                                                              self.__read_csv_entries_subsets,
+                                                              file_path, None, csv_reader)
+
+    def __read_csv_entries_subsets(self,
+                                   file_path: str,
+                                   chunk_size: int = None,
+                                   csv_reader: str = None):
+
+        rows = tag_datasource_reader.TagDatasourceReader.read_csv(file_path, csv_reader,
+                                                                  chunk_size)
+        return self.__partition_rows(self.__count_rows(rows), stream=bool(chunk_size))
+
+    def __read_jsonl_entries_subsets(self, file_path: str):
+        tags = tag_datasource_reader.TagDatasourceReader.read_jsonl(file_path)
+        return tag_datasource_partitioner.TagDatasourcePartitioner.stream_tags(
+            self.__count_rows(tags))
+
+    def __read_parquet_entries_subsets(self, file_path: str, chunk_size: int = None):
+        rows = tag_datasource_reader.TagDatasourceReader.read_parquet(file_path, chunk_size)
+        return self.__partition_rows(self.__count_rows(rows), stream=bool(chunk_size))
+
+    def __count_rows(self, rows):
+        # Count locally and record the total once, so the metrics lock is not taken per row.
+        rows_count = 0
+        try:
+            for row in rows:
+                rows_count += 1
+                yield row
+        finally:
+            self.__metrics.count(constant.METRIC_ROWS_PARSED, rows_count)
+
+    @classmethod
+    def __partition_rows(cls, rows, stream: bool):
+        partitioner = tag_datasource_partitioner.TagDatasourcePartitioner
+        if not stream:
+            return list(partitioner.partition(rows).items())
+
+        # The partitioner consumes the rows of all chunks in a single pass, so the fill state and
+        # incomplete Entries are naturally carried across chunk boundaries.
+        return partitioner.stream_partitions(rows)
+
+    def __process_entries_subsets(self,
+                                  entries_subsets,
+                                  processor,
+                                  checkpoint_file_path=None,
+                                  managed_template_names=None,
+                                  keep_results=True):
+
+        self.__incomplete_entries = set()
+        if not checkpoint_file_path:
+            return self.__process_pending_entries_subsets(
+                entries_subsets,
+                processor,
+                managed_template_names=managed_template_names,
+                keep_results=keep_results)
+
+        with checkpoint_journal.CheckpointJournal(checkpoint_file_path) as journal:
+
+            def skip_completed(entries_subsets):
+                for entry_subset in entries_subsets:
+                    if journal.is_completed(entry_subset[0]):
+                        logging.debug(
+                            'Entry %s was completed by a previous run and will be skipped.',
+                            entry_subset[0])
+                        continue
+                    yield entry_subset
+
+            pending_entries_subsets = skip_completed(entries_subsets)
+            if isinstance(entries_subsets, list):
+                pending_entries_subsets = list(pending_entries_subsets)
+
+            # Entries are recorded only if processing them raised no error.
+            return self.__process_pending_entries_subsets(
+                pending_entries_subsets,
+                processor,
+                on_entry_processed=journal.record,
+                managed_template_names=managed_template_names,
+                keep_results=keep_results)
+
+    def __process_pending_entries_subsets(self,
+                                          entries_subsets,
+                                          processor,
+                                          on_entry_processed=None,
+                                          managed_template_names=None,
+                                          keep_results=True):
+
+        # Streamed Entries are not known in advance, so they are resolved one by one.
+        resolved_entries = None
+        resolution_events = {}
+        if isinstance(entries_subsets, list):
+            resolved_entries, _, resolution_events = self.__resolve_entries(
+                entry_name_or_resource for entry_name_or_resource, _ in entries_subsets)
+
+        def process_entry_subset(entry_subset):
+            # The events of resolving each Entry are part of its record, logged only once.
+            with structured_logging.EntryEvents.aggregate(
+                    entry_subset[0], resolution_events.pop(entry_subset[0], None)):
+                results = self.__process_entry_tags(*entry_subset, processor, resolved_entries,
+                                                    managed_template_names)
+            # Incomplete Entries are left pending, so they are processed again once the
+            # datasource or the permissions are fixed.
+            if on_entry_processed and entry_subset[0] not in self.__incomplete_entries:
+                on_entry_processed(entry_subset[0])
+            return results
+
+        return self.__map_entries(process_entry_subset, entries_subsets, keep_results)
+
+    def __resolve_entries(
+        self, names_or_resources: Iterable[str]
+    ) -> Tuple[Dict[str, Entry], List[str], Dict[str, Dict[str, int]]]:
+        """
+        Resolve the distinct Entry names and linked resources concurrently, before any Tag is
+        processed, so lookup latencies overlap and all missing Entries are reported up front.
+
+        :return: A tuple with a dict of the resolved Entries by name or linked resource, a list
+            with the names or linked resources that could not be resolved, and a dict with the
+            events recorded while resolving each Entry, if they are being aggregated.
+        """
+        distinct_names_or_resources = list(dict.fromkeys(names_or_resources))
+
+        logging.info('')
+        logging.info('Resolving %d Entries...', len(distinct_names_or_resources))
+        with self.__metrics.time_stage(constant.METRICS_STAGE_RESOLVE_ENTRIES):
+            if self.__workers > 1:
+                results = self.__map_concurrently(self.__resolve_entry,
+                                                  distinct_names_or_resources)
+            else:
+                results = map(self.__resolve_entry, distinct_names_or_resources)
+
+            resolved_entries = {}
+            unresolved_names_or_resources = []
+            resolution_events = {}
+            for name_or_resource, (entry, events) in zip(distinct_names_or_resources, results):
+                if entry:
+                    resolved_entries[name_or_resource] = entry
+                else:
+                    unresolved_names_or_resources.append(name_or_resource)
+                if events:
+                    resolution_events[name_or_resource] = events
+
+        self.__log_unresolved_entries(unresolved_names_or_resources)
+        return resolved_entries, unresolved_names_or_resources, resolution_events
+
+    def __resolve_entry(self, name_or_resource: str):
+        with structured_logging.EntryEvents.collect() as events:
+            return self.__find_entry(name_or_resource), events
+
+    def __plan_entries_subsets(self, entries_subsets, planner, plan_file_path):
+        operations = [
+            operation for operation in self.__process_entries_subsets(entries_subsets, planner)
+            if operation is not None
+        ]
+        tag_operations_plan.TagOperationsPlan.write(plan_file_path, operations)
+
+        logging.info('')
+        logging.info('Plan file written: %s', plan_file_path)
+        self.__log_operations_summary(self.__PLAN_OPERATIONS, {},
+                                      collections.Counter(operation.operation
+                                                          for operation in operations),
+                                      subject='Planned Tag operations')
+        self.__log_invalid_tags()
+        self.__log_stats()
+
+        return operations
+
+    def __apply_entry_operations(self, entry_operations):
+        with structured_logging.EntryEvents.aggregate(entry_operations[0].parent_entry_name):
+            return [
+                self.__datacatalog_facade.apply_tag_operation(operation)
+                for operation in entry_operations
+            ]
+
+    def __map_entries(self, function, entries_items, keep_results=True):
+        # Items of the same Entry are always processed by a single call, hence sequentially.
+        if self.__workers > 1:
+            entries_results = self.__map_concurrently(function, entries_items)
+        else:
+            entries_results = map(function, entries_items)
+
+        if not keep_results:
+            # Release each Entry's results as soon as they are produced.
+            collections.deque(entries_results, maxlen=0)
+            return None
+
+        return [result for entry_results in entries_results for result in entry_results]
+
+    def __map_concurrently(self, function, iterable):
+        # Unlike executor.map(), which submits all the items at once, keep a bounded number of
+        # items in flight so streamed datasources are not fully read ahead. Results are yielded
+        # in the datasource order.
+        max_pending = self.__workers * 2
+        with futures.ThreadPoolExecutor(max_workers=self.__workers) as executor:
+            pending = collections.deque()
+            for item in iterable:
+                pending.append(executor.submit(function, item))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+    async def __process_entries_subsets_async(self, entries_subsets, async_facade, processor):
+        resolved_entries = await self.__resolve_entries_async(
+            (entry_name_or_resource for entry_name_or_resource, _ in entries_subsets),
+            async_facade)
+
+        # asyncio.gather() keeps the results in the datasource order.
+        entries_results = await asyncio.gather(*[
+            self.__process_entry_tags_async(*entry_subset, async_facade, processor,
+                                            resolved_entries) for entry_subset in entries_subsets
+        ])
+
+        return [result for entry_results in entries_results for result in entry_results]
+
+    async def __resolve_entries_async(self, names_or_resources: Iterable[str],
+                                      async_facade) -> Dict[str, Entry]:
+
+        distinct_names_or_resources = list(dict.fromkeys(names_or_resources))
+
+        logging.info('')
+        logging.info('Resolving %d Entries...', len(distinct_names_or_resources))
+        entries = await asyncio.gather(*[
+            self.__find_entry_async(name_or_resource, async_facade)
+            for name_or_resource in distinct_names_or_resources
+        ])
+
+        self.__log_unresolved_entries([
+            name_or_resource
+            for name_or_resource, entry in zip(distinct_names_or_resources, entries) if not entry
+        ])
+        return {
+            name_or_resource: entry
+            for name_or_resource, entry in zip(distinct_names_or_resources, entries) if entry
+        }
 
-        results = []
-        for entry_name_or_resource in normalized_df.index.unique().tolist():
+    def __process_entry_tags(self,
+                             entry_name_or_resource,
+                             templates,
+                             processor,
+                             resolved_entries=None,
+                             managed_template_names=None):
+
+        if resolved_entries is None:
             catalog_entry = self.__find_entry(entry_name_or_resource)
             if not catalog_entry:
-                logging.warning(
-                    'No Entry found for name or linked resource %s.'
-                    ' The record will be skipped.', entry_name_or_resource)
-                continue
+                self.__log_entry_not_found(entry_name_or_resource)
+                self.__skip_entry_tags(entry_name_or_resource, templates)
+                return []
+        else:
+            # Entries that could not be resolved were reported up front.
+            catalog_entry = resolved_entries.get(entry_name_or_resource)
+            if not catalog_entry:
+                self.__skip_entry_tags(entry_name_or_resource, templates)
+                return []
 
-            templates_subset = \
-                normalized_df.loc[
-                    [entry_name_or_resource], constant.TAGS_DS_TEMPLATE_NAME_COLUMN_LABEL:
-                ]
+        tag_templates = {}
+        for template_name in templates:
+            try:
+                tag_templates[template_name] = \
+                    self.__datacatalog_facade.get_tag_template(template_name)
+            except exceptions.PermissionDenied:
+                self.__log_tag_template_permission_denied(template_name)
 
-            # Save memory by deleting data already copied to a subset.
-            normalized_df.drop(entry_name_or_resource, inplace=True)
+        tags = self.__make_tags(entry_name_or_resource, templates, tag_templates)
+        if not tags:
+            return []
 
-            tags = self.__make_tags_from_templates_dataframe(templates_subset)
+        # List the Entry's Tags only once and share the index with all processor calls,
+        # which keep it up to date as Tags are created, updated, or deleted.
+        entry_tags = self.__datacatalog_facade.index_tags(catalog_entry.name)
+        results = [processor(catalog_entry.name, tag, entry_tags) for tag in tags]
+        if managed_template_names:
+            results.extend(
+                self.__delete_stale_tags(catalog_entry.name, templates, tag_templates, entry_tags,
+                                         managed_template_names))
+        return results
 
-            results.extend([processor(catalog_entry.name, tag) for tag in tags])
+    def __delete_stale_tags(self, entry_name, templates, tag_templates, entry_tags,
+                            managed_template_names):
+        # Tags are described by their template and column, as they are indexed, i.e. using the
+        # template names returned by the API, which may be written differently in the
+        # datasource. Described Tags that could not be made, e.g. due to invalid field values,
+        # are kept as well.
+        described_keys = set()
+        for template_name, columns in templates.items():
+            tag_template = tag_templates.get(template_name)
+            indexed_template_name = tag_template.name if tag_template else template_name
+            described_keys.update((indexed_template_name, column or '') for column in columns)
+        stale_keys = {key
+                      for key in entry_tags if key[0] in managed_template_names} - described_keys
 
-        return results
+        # The persisted Tags are deleted using the shared index, so no further reads are needed.
+        return [
+            self.__datacatalog_facade.delete_tag(entry_name, entry_tags[key], entry_tags)
+            for key in sorted(stale_keys)
+        ]
 
-    def __find_entry(self, name_or_resource: str) -> Optional[Entry]:
-        should_use_lookup = re.match(pattern=constant.BIGQUERY_LINKED_RESOURCE_PATTERN,
-                                     string=name_or_resource)
-        should_use_lookup = should_use_lookup or re.match(
-            pattern=constant.PUBSUB_LINKED_RESOURCE_PATTERN, string=name_or_resource)
+    async def __process_entry_tags_async(self, entry_name_or_resource, templates, async_facade,
+                                         processor, resolved_entries):
+
+        # Entries that could not be resolved were reported up front.
+        catalog_entry = resolved_entries.get(entry_name_or_resource)
+        if not catalog_entry:
+            self.__skip_entry_tags(entry_name_or_resource, templates)
+            return []
+
+        async def get_tag_template(template_name):
+            try:
+                return template_name, await async_facade.get_tag_template(template_name)
+            except exceptions.PermissionDenied:
+                self.__log_tag_template_permission_denied(template_name)
+                return template_name, None
+
+        tag_templates = {
+            template_name: tag_template
+            for template_name, tag_template in await asyncio.gather(
+                *[get_tag_template(template_name) for template_name in templates]) if tag_template
+        }
+
+        tags = self.__make_tags(entry_name_or_resource, templates, tag_templates)
+        if not tags:
+            return []
 
-        if should_use_lookup:
+        entry_tags = await async_facade.index_tags(catalog_entry.name)
+        return [await processor(catalog_entry.name, tag, entry_tags) for tag in tags]
+
+    def __find_entry(self, name_or_resource: str) -> Optional[Entry]:
+        if self.__is_linked_resource(name_or_resource):
             try:
                 return self.__datacatalog_facade.lookup_entry(name_or_resource)
             except exceptions.InvalidArgument:
@@ -113,89 +947,148 @@ class TagDatasourceProcessor:
             logging.warning('Permission denied when getting Entry %s.', name_or_resource)
 
     @classmethod
-    def __normalize_dataframe(cls, dataframe):
-        # Reorder dataframe columns.
-        ordered_df = dataframe.reindex(columns=constant.TAGS_DS_COLUMNS_ORDER, copy=False)
+    async def __find_entry_async(cls, name_or_resource: str, async_facade) -> Optional[Entry]:
+        if cls.__is_linked_resource(name_or_resource):
+            try:
+                return await async_facade.lookup_entry(name_or_resource)
+            except exceptions.InvalidArgument:
+                logging.warning('Invalid argument when looking up Entry for %s.', name_or_resource)
+            except exceptions.PermissionDenied:
+                logging.warning('Permission denied when looking up Entry for %s.',
+                                name_or_resource)
+            return
+
+        try:
+            return await async_facade.get_entry(name_or_resource)
+        except exceptions.PermissionDenied:
+            logging.warning('Permission denied when getting Entry %s.', name_or_resource)
+
+    @classmethod
+    def __is_linked_resource(cls, name_or_resource: str) -> bool:
+        return bool(
+            re.match(pattern=constant.BIGQUERY_LINKED_RESOURCE_PATTERN, string=name_or_resource)
+            or re.match(pattern=constant.PUBSUB_LINKED_RESOURCE_PATTERN, string=name_or_resource))
 
-        # Fill NA/NaN values by propagating the last valid observation forward to next valid.
-        filled_subset = ordered_df[constant.TAGS_DS_FILLABLE_COLUMNS].fillna(method='pad')
+    @classmethod
+    def __log_entry_not_found(cls, name_or_resource: str):
+        logging.warning(
+            'No Entry found for name or linked resource %s.'
+            ' The record will be skipped.', name_or_resource)
 
-        # Rebuild the dataframe by concatenating the fillable and non-fillable columns.
-        rebuilt_df = pd.concat([filled_subset, ordered_df[constant.TAGS_DS_NON_FILLABLE_COLUMNS]],
-                               axis=1)
+    @classmethod
+    def __log_unresolved_entries(cls, names_or_resources: List[str]):
+        if not names_or_resources:
+            return
 
-        return rebuilt_df
+        logging.warning('%d Entries could not be resolved.', len(names_or_resources))
+        for name_or_resource in names_or_resources:
+            cls.__log_entry_not_found(name_or_resource)
 
-    def __make_tags_from_templates_dataframe(self, dataframe):
-        dataframe.set_index(constant.TAGS_DS_TEMPLATE_NAME_COLUMN_LABEL, inplace=True)
+    @classmethod
+    def __log_tag_template_permission_denied(cls, template_name: str):
+        logging.warning(
+            'Permission denied when getting Tag Template %s.'
+            ' Unable to manage Tags using it.', template_name)
 
-        tags = []
-        for template_name in dataframe.index.unique().tolist():
-            try:
-                tag_template = self.__datacatalog_facade.get_tag_template(template_name)
-            except exceptions.PermissionDenied:
-                logging.warning(
-                    'Permission denied when getting Tag Template %s.'
-                    ' Unable to manage Tags using it.', template_name)
-                continue
+    @classmethod
+    def __log_operations_summary(cls, operations, counts_before, counts_after, subject='Tags'):
+        logging.info('')
+        logging.info(
+            '%s %s.', subject, ', '.join(
+                f'{operation}: {counts_after.get(operation, 0) - counts_before.get(operation, 0)}'
+                for operation in operations))
 
-            columns_subset = \
-                dataframe.loc[[template_name], constant.TAGS_DS_SCHEMA_COLUMN_COLUMN_LABEL:]
-            dataframe.drop(template_name, inplace=True)
+    def __log_stats(self):
+        facade = self.__datacatalog_facade
+        for kind, stats in facade.get_cache_stats().items():
+            self.__log_stats_line(f'Cache {kind}', stats)
+        self.__log_stats_line('API calls', facade.get_retry_stats())
 
-            # (1) Make Tags to be attached/deleted to/from the resource
+    @classmethod
+    def __log_stats_line(cls, subject, stats):
+        if stats:
+            logging.info('%s %s.', subject,
+                         ', '.join(f'{name}: {value}' for name, value in stats.items()))
+
+    def __log_invalid_tags(self):
+        invalid_tags, self.__invalid_tags = self.__invalid_tags, {}
+        if not invalid_tags:
+            return
 
-            # Get a subset with no schema/column information
-            null_columns_index = \
-                columns_subset[constant.TAGS_DS_SCHEMA_COLUMN_COLUMN_LABEL].isnull()
-            null_columns_subset = \
-                columns_subset.loc[null_columns_index, constant.TAGS_DS_FIELD_ID_COLUMN_LABEL:]
+        logging.warning(
+            '%d Tags were skipped due to invalid field values.',
+            sum(len(entry_invalid_tags) for entry_invalid_tags in invalid_tags.values()))
+        for name_or_resource, entry_invalid_tags in invalid_tags.items():
+            for column, error in entry_invalid_tags:
+                logging.warning('%s%s: %s', name_or_resource,
+                                f' (column {column})' if column else '', error)
 
-            if not null_columns_subset.empty:
-                columns_subset.dropna(subset=[constant.TAGS_DS_SCHEMA_COLUMN_COLUMN_LABEL],
-                                      inplace=True)
-                tags.append(
-                    self.__make_tag_from_fields_dataframe(tag_template, null_columns_subset))
+    def __log_incomplete_entries(self):
+        incomplete_entries, self.__incomplete_entries = self.__incomplete_entries, set()
+        if not incomplete_entries:
+            return
 
-            # (2) Make Tags to be attached/deleted to/from the resource's columns
-            tags.extend(self.__make_tags_from_columns_dataframe(tag_template, columns_subset))
+        logging.warning(
+            '%d Entries were not completed and will be processed again when the run is resumed.',
+            len(incomplete_entries))
+        for name_or_resource in sorted(incomplete_entries):
+            logging.warning('Incomplete Entry: %s', name_or_resource)
 
-        return tags
+    @classmethod
+    def __distinct(cls, names_or_resources: Iterable[str]) -> Iterator[str]:
+        # Unlike dict.fromkeys(), keep consuming the iterable lazily.
+        seen = set()
+        for name_or_resource in names_or_resources:
+            if name_or_resource not in seen:
+                seen.add(name_or_resource)
+                yield name_or_resource
 
     @classmethod
-    def __make_tags_from_columns_dataframe(cls, tag_template, dataframe):
-        dataframe.set_index(constant.TAGS_DS_SCHEMA_COLUMN_COLUMN_LABEL, inplace=True)
+    def __make_tag_rows(cls, name_or_resource: str, tag: Tag) -> Iterator[tuple]:
+        column = tag.column or None
+        if not tag.fields:
+            # Tags with no fields are still exported, so they can be deleted using the file.
+            yield name_or_resource, tag.template, column, None, None
+            return
+
+        format_field_value = datacatalog_entity_factory.DataCatalogEntityFactory.format_field_value
+        for field_id in sorted(tag.fields):
+            yield name_or_resource, tag.template, column, field_id, \
+                format_field_value(tag.fields[field_id])
+
+    def __make_tags(self, entry_name_or_resource: str,
+                    templates: tag_datasource_partitioner.TemplatesDict,
+                    tag_templates: Dict[str, TagTemplate]) -> List[Tag]:
 
         tags = []
-        # NaN not expected among index values at this point.
-        for column_name in dataframe.index.unique().tolist():
-            column_subset = dataframe.loc[[column_name], constant.TAGS_DS_FIELD_ID_COLUMN_LABEL:]
-            dataframe.drop(column_name, inplace=True)
+        for template_name, columns in templates.items():
+            # Tag Templates the caller was unable to get are not available.
+            tag_template = tag_templates.get(template_name)
+            if not tag_template:
+                self.__skip_entry_tags(entry_name_or_resource, {template_name: columns})
+                continue
 
-            tags.append(
-                cls.__make_tag_from_fields_dataframe(tag_template, column_subset, column_name))
+            # Make the Tags to be attached/deleted to/from the resource first, then the ones to
+            # be attached/deleted to/from the resource's columns; sorted() is stable.
+            for column in sorted(columns, key=lambda column: column is not None):
+                try:
+                    tags.append(self.__make_tag(tag_template, columns[column], column))
+                except datacatalog_entity_factory.InvalidFieldValuesError as error:
+                    self.__invalid_tags.setdefault(entry_name_or_resource, []).append(
+                        (column, error))
+                    self.__incomplete_entries.add(entry_name_or_resource)
+                    self.__metrics.count(constant.METRIC_TAGS_SKIPPED)
 
         return tags
 
-    @classmethod
-    def __make_tag_from_fields_dataframe(cls, tag_template, dataframe, column=None):
-        return datacatalog_entity_factory.DataCatalogEntityFactory.make_tag(
-            tag_template, cls.__convert_fields_dataframe_to_dict(dataframe), column)
+    def __skip_entry_tags(self, entry_name_or_resource: str,
+                          templates: tag_datasource_partitioner.TemplatesDict):
 
-    @classmethod
-    def __convert_fields_dataframe_to_dict(cls, dataframe) -> Dict[str, object]:
-        # Remove the rows with no field id since they're not valid from this point
-        dataframe.dropna(subset=[constant.TAGS_DS_FIELD_ID_COLUMN_LABEL], inplace=True)
-        records = dataframe.to_dict(orient='records')
-
-        fields = {}
-        for record in records:
-            value = record[constant.TAGS_DS_FIELD_VALUE_COLUMN_LABEL]
-            # Pandas is not aware of the field types and reads empty values as NaN;
-            # hence NaN fields are skipped.
-            if isinstance(value, float) and math.isnan(value):
-                continue
+        self.__incomplete_entries.add(entry_name_or_resource)
+        self.__metrics.count(constant.METRIC_TAGS_SKIPPED,
+                             sum(len(columns) for columns in templates.values()))
 
-            fields[record[constant.TAGS_DS_FIELD_ID_COLUMN_LABEL]] = value
-
-        return fields
+    @classmethod
+    def __make_tag(cls, tag_template, fields, column=None):
+        return datacatalog_entity_factory.DataCatalogEntityFactory.make_tag(
+            tag_template, fields, column)
@@ -0,0 +1,245 @@
+import bz2
+import contextlib
+import csv
+import gzip
+from importlib import util
+import io
+import json
+import sys
+from typing import Dict, Iterator, Optional, TextIO, Tuple
+
+from . import constant
+
+
+class TagDatasourceReader:
+    """
+    Read Tag datasources as rows whose values follow ``constant.TAGS_DS_COLUMNS_ORDER``, no
+    matter how the columns are ordered in the source. Missing values are None or NaN. JSON Lines
+    datasources, which have no rows to be filled, are read as Tags instead.
+    """
+
+    __BZIP2_MAGIC_NUMBER = b'BZh'
+    __GZIP_MAGIC_NUMBER = b'\x1f\x8b'
+    __ZSTD_MAGIC_NUMBER = b'\x28\xb5\x2f\xfd'
+
+    __ENCODING = 'utf-8'
+    __PARQUET_DEFAULT_BATCH_SIZE = 65536
+
+    @classmethod
+    def get_default_csv_reader(cls) -> str:
+        # Check whether pandas is installed without importing it, which is slow.
+        return constant.CSV_READER_PANDAS if util.find_spec('pandas') \
+            else constant.CSV_READER_STDLIB
+
+    @classmethod
+    @contextlib.contextmanager
+    def open_text(cls, file_path: str, newline: str = None) -> Iterator[TextIO]:
+        """
+        Open a text datasource for reading. gzip, bzip2, and Zstandard compressed sources are
+        detected by their magic numbers and decompressed on the fly, so the decompressed content
+        is never fully stored on disk or in memory. Zstandard requires the zstandard package.
+
+        :param file_path: The file path, or ``constant.STDIN_FILE_PATH`` to read the standard
+            input, which is not closed afterwards.
+        :param newline: See ``open()``.
+        :return: A context manager that yields the text stream.
+        """
+        with contextlib.ExitStack() as stack:
+            if file_path == constant.STDIN_FILE_PATH:
+                binary_file = sys.stdin.buffer
+            else:
+                binary_file = stack.enter_context(open(file_path, 'rb'))
+
+            # Peeking does not consume the bytes, so non-seekable sources are supported.
+            if not hasattr(binary_file, 'peek'):
+                binary_file = io.BufferedReader(binary_file)
+                # Detach the wrapper on exit, so the wrapped stream is not closed with it.
+                stack.callback(binary_file.detach)
+            magic_number = binary_file.peek(len(cls.__ZSTD_MAGIC_NUMBER))
+
+            if magic_number.startswith(cls.__GZIP_MAGIC_NUMBER):
+                binary_file = gzip.GzipFile(fileobj=binary_file)
+            elif magic_number.startswith(cls.__BZIP2_MAGIC_NUMBER):
+                binary_file = bz2.BZ2File(binary_file)
+            elif magic_number.startswith(cls.__ZSTD_MAGIC_NUMBER):
+                import zstandard
+
+                binary_file = zstandard.ZstdDecompressor().stream_reader(binary_file,
+                                                                         read_across_frames=True,
+                                                                         closefd=False)
+
+            text_file = io.TextIOWrapper(binary_file, encoding=cls.__ENCODING, newline=newline)
+            try:
+                yield text_file
+            finally:
+                # Detach instead of closing, so the standard input is left open; the files opened
+                # here are closed on exit.
+                text_file.detach()
+
+    @classmethod
+    def read_csv(cls,
+                 file_path: str,
+                 reader: str = None,
+                 chunk_size: int = None) -> Iterator[tuple]:
+        """
+        Read a CSV file.
+
+        :param file_path: The CSV file path, or ``constant.STDIN_FILE_PATH``; it may be
+            compressed, see ``open_text``.
+        :param reader: ``constant.CSV_READER_STDLIB`` to read the file with the csv module, or
+            ``constant.CSV_READER_PANDAS`` to read it with pandas. Defaults to pandas if it is
+            installed.
+        :param chunk_size: The number of rows pandas reads at a time; the whole file is read at
+            once if not provided. Ignored by the csv module, which always reads row by row.
+        :return: A generator of rows.
+        """
+        reader = reader or cls.get_default_csv_reader()
+        if reader == constant.CSV_READER_STDLIB:
+            return cls.__read_csv_with_stdlib(file_path)
+        if reader == constant.CSV_READER_PANDAS:
+            return cls.__read_csv_with_pandas(file_path, chunk_size)
+
+        raise ValueError(f'Unknown CSV reader: {reader}.')
+
+    @classmethod
+    def read_jsonl(cls,
+                   file_path: str) -> Iterator[Tuple[str, str, Optional[str], Dict[str, object]]]:
+        """
+        Read a JSON Lines file, one Tag per line, e.g.:
+
+            {"linked_resource": "//bigquery...", "template_name": "projects/...",
+             "column": "id", "fields": {"string_field": "A value", "double_field": 2.5}}
+
+        ``entry_name`` may be used instead of ``linked_resource``, and ``column`` may be omitted.
+        Lines are parsed one at a time, so memory usage does not depend on the file size.
+
+        :param file_path: The JSON Lines file path, or ``constant.STDIN_FILE_PATH``; it may be
+            compressed, see ``open_text``.
+        :return: A generator of (Entry name or linked resource, Tag Template name, column,
+            fields) tuples, in the file order.
+        :raises ValueError: If a line is not a valid Tag.
+        """
+        with cls.open_text(file_path) as jsonl_file:
+            for line_number, line in enumerate(jsonl_file, start=1):
+                # Skip blank lines, as the CSV readers do.
+                if not line.strip():
+                    continue
+
+                try:
+                    yield cls.__parse_jsonl_tag(json.loads(line))
+                except (KeyError, TypeError, ValueError) as error:
+                    raise ValueError(
+                        f'Invalid Tag at line {line_number} of {file_path}: {error!r}') from error
+
+    @classmethod
+    def __parse_jsonl_tag(cls, record: dict) -> Tuple[str, str, Optional[str], Dict[str, object]]:
+        name_or_resource = record.get(constant.TAGS_JSONL_LINKED_RESOURCE_KEY) \
+            or record[constant.TAGS_JSONL_ENTRY_NAME_KEY]
+        fields = record.get(constant.TAGS_JSONL_FIELDS_KEY) or {}
+        if not isinstance(fields, dict):
+            raise TypeError(f'{constant.TAGS_JSONL_FIELDS_KEY} must be an object')
+
+        return name_or_resource, record[constant.TAGS_JSONL_TEMPLATE_NAME_KEY], \
+            record.get(constant.TAGS_JSONL_COLUMN_KEY) or None, fields
+
+    @classmethod
+    def read_names_or_resources(cls, file_path: str) -> Iterator[str]:
+        """
+        Read a text file with one Entry name or linked resource per line.
+
+        :param file_path: The file path, or ``constant.STDIN_FILE_PATH``; it may be compressed,
+            see ``open_text``.
+        :return: A generator of Entry names or linked resources; blank lines are skipped.
+        """
+        with cls.open_text(file_path) as text_file:
+            for line in text_file:
+                name_or_resource = line.strip()
+                if name_or_resource:
+                    yield name_or_resource
+
+    @classmethod
+    def read_parquet(cls, file_path: str, batch_size: int = None) -> Iterator[tuple]:
+        """
+        Read a Parquet file. Only the Tag datasource columns are read, the file is memory-mapped,
+        and rows are read in batches, so the whole file is never loaded at once. Values keep
+        their Parquet types, e.g. doubles, booleans, and timestamps.
+
+        :param file_path: The Parquet file path.
+        :param batch_size: The maximum number of rows read at a time.
+        :return: A generator of rows.
+        """
+        import pyarrow
+        from pyarrow import parquet
+
+        schema = parquet.read_schema(file_path, memory_map=True)
+        columns = [column for column in constant.TAGS_DS_COLUMNS_ORDER if column in schema.names]
+        # Names and ids repeat across rows; reading string columns as dictionaries decodes each
+        # distinct value only once.
+        dictionary_columns = [
+            column for column in columns if pyarrow.types.is_string(schema.field(column).type)
+        ]
+
+        parquet_file = parquet.ParquetFile(file_path,
+                                           memory_map=True,
+                                           read_dictionary=dictionary_columns)
+        batches = parquet_file.iter_batches(batch_size=batch_size
+                                            or cls.__PARQUET_DEFAULT_BATCH_SIZE,
+                                            columns=columns)
+        for batch in batches:
+            values = {
+                column: cls.__get_arrow_values(batch.column(index))
+                for index, column in enumerate(columns)
+            }
+            missing_values = [None] * batch.num_rows
+            yield from zip(*(values.get(column, missing_values)
+                             for column in constant.TAGS_DS_COLUMNS_ORDER))
+
+    @classmethod
+    def __get_arrow_values(cls, array) -> list:
+        import pyarrow
+
+        if not pyarrow.types.is_dictionary(array.type):
+            return array.to_pylist()
+
+        dictionary = array.dictionary.to_pylist()
+        return [
+            None if index is None else dictionary[index] for index in array.indices.to_pylist()
+        ]
+
+    @classmethod
+    def __read_csv_with_stdlib(cls, file_path: str) -> Iterator[tuple]:
+        with cls.open_text(file_path, newline='') as csv_file:
+            records = csv.reader(csv_file)
+            header = next(records, [])
+            positions = [
+                header.index(column) if column in header else None
+                for column in constant.TAGS_DS_COLUMNS_ORDER
+            ]
+
+            for record in records:
+                # Skip blank lines, as pandas does.
+                if not record:
+                    continue
+
+                # Empty values are missing, as they are for pandas.
+                yield tuple(record[position] or None
+                            if position is not None and position < len(record) else None
+                            for position in positions)
+
+    @classmethod
+    def __read_csv_with_pandas(cls, file_path: str, chunk_size: int = None) -> Iterator[tuple]:
+        import pandas as pd
+
+        with cls.open_text(file_path) as csv_file:
+            # Read values as strings, as the stdlib reader does: inferred types would depend on
+            # the other values in each chunk, e.g. 123 is an int only in all-numeric chunks.
+            # Likewise, only empty values are missing; NA, null, None, etc. are kept as strings.
+            read_csv_kwargs = {'dtype': str, 'keep_default_na': False, 'na_values': ['']}
+            if chunk_size:
+                chunks = pd.read_csv(csv_file, chunksize=chunk_size, **read_csv_kwargs)
+            else:
+                chunks = [pd.read_csv(csv_file, **read_csv_kwargs)]
+
+            for chunk in chunks:
+                yield from chunk.reindex(columns=constant.TAGS_DS_COLUMNS_ORDER).itertuples(
+                    index=False, name=None)
@@ -0,0 +1,48 @@
+import contextlib
+import csv
+import sys
+from typing import Iterable, Iterator, TextIO
+
+from . import constant
+
+
+class TagDatasourceWriter:
+    """
+    Write Tag datasources in the format read by ``TagDatasourceReader``, from rows whose values
+    follow ``constant.TAGS_DS_COLUMNS_ORDER``.
+    """
+
+    __ENCODING = 'utf-8'
+
+    @classmethod
+    def write_csv(cls, file_path: str, rows: Iterable[tuple]) -> int:
+        """
+        Write a CSV file. Rows are written as they are consumed, so they are never all held in
+        memory.
+
+        :param file_path: The CSV file path, or ``constant.STDOUT_FILE_PATH`` to write to the
+            standard output.
+        :param rows: The rows; None values are written as empty values.
+        :return: The number of rows written, not counting the header.
+        """
+        count = 0
+        with cls.__open_text(file_path) as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(constant.TAGS_DS_COLUMNS_ORDER)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+
+        return count
+
+    @classmethod
+    @contextlib.contextmanager
+    def __open_text(cls, file_path: str) -> Iterator[TextIO]:
+        if file_path == constant.STDOUT_FILE_PATH:
+            # The standard output is flushed, but not closed.
+            yield sys.stdout
+            sys.stdout.flush()
+            return
+
+        with open(file_path, 'w', newline='', encoding=cls.__ENCODING) as text_file:
+            yield text_file
@@ -1,53 +1,352 @@
 import argparse
-import logging
+import contextlib
 import sys
 
-from . import tag_datasource_processor
+from . import constant
 
 
 class TagManagerCLI:
 
     @classmethod
     def run(cls, argv):
-        cls.__setup_logging()
-
         args = cls._parse_args(argv)
-        args.func(args)
+        with cls.__setup_logging(args):
+            args.func(args)
 
     @classmethod
-    def __setup_logging(cls):
-        logging.basicConfig(level=logging.INFO)
+    def __setup_logging(cls, args):
+        from . import structured_logging
+
+        return structured_logging.logging_to_queue(args.log_level, args.log_format)
 
     @classmethod
     def _parse_args(cls, argv):
         parser = argparse.ArgumentParser(description=__doc__,
                                          formatter_class=argparse.RawDescriptionHelpFormatter)
 
+        parser.add_argument('--log-level',
+                            help=f'Minimum level of the logged messages (default:'
+                            f' {constant.LOG_LEVEL_INFO})',
+                            choices=constant.LOG_LEVELS,
+                            default=constant.LOG_LEVEL_INFO)
+        parser.add_argument('--log-format',
+                            help='Format of the logged messages; json writes one JSON object per'
+                            ' line and a single message per Entry instead of one per API call'
+                            f' (default: {constant.LOG_FORMAT_TEXT})',
+                            choices=constant.LOG_FORMATS,
+                            default=constant.LOG_FORMAT_TEXT)
+
         subparsers = parser.add_subparsers()
 
         upsert_tags_parser = subparsers.add_parser('upsert', help='Upsert Tags')
-        upsert_tags_parser.add_argument('--csv-file',
-                                        help='CSV file with Tags information',
-                                        required=True)
+        cls.__add_datasource_arguments(upsert_tags_parser)
+        cls.__add_processing_arguments(upsert_tags_parser)
+        cls.__add_checkpoint_argument(upsert_tags_parser)
         upsert_tags_parser.set_defaults(func=cls.__upsert_tags)
 
         delete_tags_parser = subparsers.add_parser('delete', help='Delete Tags')
-        delete_tags_parser.add_argument('--csv-file',
-                                        help='CSV file with Tags information',
-                                        required=True)
+        cls.__add_datasource_arguments(delete_tags_parser)
+        cls.__add_processing_arguments(delete_tags_parser)
+        cls.__add_checkpoint_argument(delete_tags_parser)
         delete_tags_parser.set_defaults(func=cls.__delete_tags)
 
+        sync_tags_parser = subparsers.add_parser(
+            'sync', help='Upsert Tags and delete the managed ones absent from the datasource')
+        cls.__add_datasource_arguments(sync_tags_parser)
+        sync_tags_parser.add_argument('--managed-template',
+                                      help='Name of a Tag Template whose Tags are synced; Tags of'
+                                      ' this template attached to the Entries in the datasource'
+                                      ' are deleted if not in the datasource. Can be repeated',
+                                      action='append',
+                                      required=True)
+        cls.__add_processing_arguments(sync_tags_parser)
+        cls.__add_checkpoint_argument(sync_tags_parser)
+        sync_tags_parser.set_defaults(func=cls.__sync_tags)
+
+        plan_tags_parser = subparsers.add_parser(
+            'plan', help='Plan Tags changes and write them to a file, without applying them')
+        plan_tags_parser.add_argument('--csv-file',
+                                      help='CSV file with Tags information; - reads the standard'
+                                      ' input',
+                                      required=True)
+        plan_tags_parser.add_argument('--plan-file',
+                                      help='File the planned operations are written to',
+                                      required=True)
+        plan_tags_parser.add_argument('--delete',
+                                      help='Plan the deletion of the Tags instead of their'
+                                      ' upsert',
+                                      action='store_true')
+        cls.__add_processing_arguments(plan_tags_parser)
+        plan_tags_parser.set_defaults(func=cls.__plan_tags)
+
+        apply_plan_parser = subparsers.add_parser('apply', help='Apply a Tags plan')
+        apply_plan_parser.add_argument('--plan-file',
+                                       help='File written by the plan command',
+                                       required=True)
+        cls.__add_workers_argument(apply_plan_parser)
+        cls.__add_rate_limit_arguments(apply_plan_parser)
+        cls.__add_retry_arguments(apply_plan_parser)
+        cls.__add_metrics_arguments(apply_plan_parser)
+        apply_plan_parser.set_defaults(func=cls.__apply_plan)
+
+        export_tags_parser = subparsers.add_parser(
+            'export', help='Export the Tags of Entries to a CSV file, in the upsert format')
+        export_tags_parser.add_argument('--entries-file',
+                                        help='File with one Entry name or linked resource per'
+                                        ' line; - reads the standard input',
+                                        required=True)
+        export_tags_parser.add_argument('--csv-file',
+                                        help='CSV file the Tags are exported to; - writes to the'
+                                        ' standard output',
+                                        required=True)
+        cls.__add_workers_argument(export_tags_parser)
+        cls.__add_rate_limit_arguments(export_tags_parser)
+        cls.__add_retry_arguments(export_tags_parser)
+        cls.__add_metrics_arguments(export_tags_parser)
+        export_tags_parser.set_defaults(func=cls.__export_tags)
+
+        clear_cache_parser = subparsers.add_parser('clear-cache',
+                                                   help='Clear the persistent cache')
+        clear_cache_parser.add_argument('--cache-dir',
+                                        help='Directory the persistent cache is stored in',
+                                        required=True)
+        clear_cache_parser.add_argument('--kind',
+                                        help='Clear only the cached values of this kind',
+                                        choices=constant.CACHE_KINDS)
+        clear_cache_parser.set_defaults(func=cls.__clear_cache)
+
         return parser.parse_args(argv)
 
     @classmethod
-    def __upsert_tags(cls, args):
-        tag_datasource_processor.TagDatasourceProcessor().upsert_tags_from_csv(
-            file_path=args.csv_file)
+    def __add_datasource_arguments(cls, parser):
+        datasource_group = parser.add_mutually_exclusive_group(required=True)
+        datasource_group.add_argument('--csv-file',
+                                      help='CSV file with Tags information; - reads the standard'
+                                      ' input, and gzip, bzip2, and Zstandard compressed files'
+                                      ' are decompressed on the fly')
+        datasource_group.add_argument('--jsonl-file',
+                                      help='JSON Lines file with one Tag per line; lines of the'
+                                      ' same Entry must be contiguous, - reads the standard'
+                                      ' input, and compressed files are supported as for CSV')
+        datasource_group.add_argument('--parquet-file',
+                                      help='Parquet file with Tags information; requires pyarrow')
+
+    @classmethod
+    def __add_metrics_arguments(cls, parser):
+        parser.add_argument('--metrics-file',
+                            help='JSON file the run metrics are written to: API calls and their'
+                            ' latencies by method, Tag operations, rows parsed, and stage times')
+        parser.add_argument('--prometheus-file',
+                            help='File the run metrics are written to in the Prometheus text'
+                            ' format, e.g. for the node exporter textfile collector')
+
+    @classmethod
+    def __add_processing_arguments(cls, parser):
+        cls.__add_workers_argument(parser)
+        cls.__add_rate_limit_arguments(parser)
+        cls.__add_retry_arguments(parser)
+        cls.__add_metrics_arguments(parser)
+        parser.add_argument('--chunk-size',
+                            help='Stream the file in chunks of this many rows instead of loading'
+                            ' it at once; rows of the same Entry must be contiguous',
+                            type=cls.__positive_int)
+        parser.add_argument('--csv-reader',
+                            help='Library used to read the CSV file (default: pandas, if'
+                            ' installed)',
+                            choices=constant.CSV_READERS)
+        parser.add_argument('--cache-dir',
+                            help='Keep Entries and Tag Templates in a persistent cache stored in'
+                            ' this directory, so later runs do not read them again')
+        parser.add_argument('--cache-entry-ttl',
+                            help='Seconds Entries are kept in the persistent cache (default:'
+                            f' {constant.CACHE_DEFAULT_TTLS[constant.CACHE_KIND_ENTRY]})',
+                            type=float)
+        parser.add_argument('--cache-tag-template-ttl',
+                            help='Seconds Tag Templates are kept in the persistent cache (default:'
+                            f' {constant.CACHE_DEFAULT_TTLS[constant.CACHE_KIND_TAG_TEMPLATE]})',
+                            type=float)
+
+    @classmethod
+    def __add_checkpoint_argument(cls, parser):
+        parser.add_argument('--checkpoint-file',
+                            help='Journal of the Entries successfully processed; Entries'
+                            ' recorded by previous runs are skipped, so interrupted runs can be'
+                            ' resumed')
+
+    @classmethod
+    def __add_rate_limit_arguments(cls, parser):
+        parser.add_argument('--max-reads-per-minute',
+                            help='Maximum sustained rate of API read calls; set it slightly'
+                            ' below the read quota (default: unlimited)',
+                            type=cls.__positive_float)
+        parser.add_argument('--max-writes-per-minute',
+                            help='Maximum sustained rate of API write calls; set it slightly'
+                            ' below the write quota (default: unlimited)',
+                            type=cls.__positive_float)
+
+    @classmethod
+    def __add_retry_arguments(cls, parser):
+        parser.add_argument('--max-attempts',
+                            help='Maximum number of attempts per API call failed with transient'
+                            ' errors, such as quota errors and timeouts (default: 5)',
+                            type=cls.__positive_int,
+                            default=5)
+        parser.add_argument('--retry-budget',
+                            help='Maximum number of API call retries per run; once reached,'
+                            ' transient errors abort the run (default: unlimited)',
+                            type=cls.__positive_int)
+
+    @classmethod
+    def __add_workers_argument(cls, parser):
+        parser.add_argument('--workers',
+                            help='Number of Entries processed concurrently (default: 1)',
+                            type=cls.__positive_int,
+                            default=1)
+
+    @classmethod
+    def __make_processor(cls, args):
+        # Heavy modules are imported only when a subcommand actually needs them.
+        from . import tag_datasource_processor
+
+        cache_ttls = {}
+        if args.cache_entry_ttl is not None:
+            cache_ttls[constant.CACHE_KIND_ENTRY] = args.cache_entry_ttl
+            cache_ttls[constant.CACHE_KIND_ENTRY_LOOKUP] = args.cache_entry_ttl
+        if args.cache_tag_template_ttl is not None:
+            cache_ttls[constant.CACHE_KIND_TAG_TEMPLATE] = args.cache_tag_template_ttl
+
+        return tag_datasource_processor.TagDatasourceProcessor(
+            workers=args.workers,
+            cache_dir=args.cache_dir,
+            cache_ttls=cache_ttls,
+            reads_per_minute=args.max_reads_per_minute,
+            writes_per_minute=args.max_writes_per_minute,
+            max_attempts=args.max_attempts,
+            retry_budget=args.retry_budget)
+
+    @classmethod
+    @contextlib.contextmanager
+    def __reporting_metrics(cls, processor, args):
+        # Metrics are written even if the run fails, as they help to find out why.
+        try:
+            yield
+        finally:
+            if args.metrics_file or args.prometheus_file:
+                metrics = processor.get_metrics()
+                if args.metrics_file:
+                    metrics.write_json(args.metrics_file)
+                if args.prometheus_file:
+                    metrics.write_prometheus(args.prometheus_file)
+
+    @classmethod
+    def __positive_float(cls, value):
+        float_value = float(value)
+        if float_value <= 0:
+            raise argparse.ArgumentTypeError(f'{value} is not a positive number')
+        return float_value
+
+    @classmethod
+    def __positive_int(cls, value):
+        int_value = int(value)
+        if int_value < 1:
+            raise argparse.ArgumentTypeError(f'{value} is not a positive integer')
+        return int_value
+
+    @classmethod
+    def __upsert_tags(cls, args, managed_template_names=None):
+        processor = cls.__make_processor(args)
+        with contextlib.closing(processor), cls.__reporting_metrics(processor, args):
+            if args.jsonl_file:
+                processor.upsert_tags_from_jsonl(file_path=args.jsonl_file,
+                                                 checkpoint_file_path=args.checkpoint_file,
+                                                 managed_template_names=managed_template_names,
+                                                 keep_results=False)
+            elif args.parquet_file:
+                processor.upsert_tags_from_parquet(file_path=args.parquet_file,
+                                                   chunk_size=args.chunk_size,
+                                                   checkpoint_file_path=args.checkpoint_file,
+                                                   managed_template_names=managed_template_names,
+                                                   keep_results=False)
+            else:
+                processor.upsert_tags_from_csv(file_path=args.csv_file,
+                                               chunk_size=args.chunk_size,
+                                               csv_reader=args.csv_reader,
+                                               checkpoint_file_path=args.checkpoint_file,
+                                               managed_template_names=managed_template_names,
+                                               keep_results=False)
+
+    @classmethod
+    def __sync_tags(cls, args):
+        cls.__upsert_tags(args, managed_template_names=args.managed_template)
 
     @classmethod
     def __delete_tags(cls, args):
-        tag_datasource_processor.TagDatasourceProcessor().delete_tags_from_csv(
-            file_path=args.csv_file)
+        processor = cls.__make_processor(args)
+        with contextlib.closing(processor), cls.__reporting_metrics(processor, args):
+            if args.jsonl_file:
+                processor.delete_tags_from_jsonl(file_path=args.jsonl_file,
+                                                 checkpoint_file_path=args.checkpoint_file,
+                                                 keep_results=False)
+            elif args.parquet_file:
+                processor.delete_tags_from_parquet(file_path=args.parquet_file,
+                                                   chunk_size=args.chunk_size,
+                                                   checkpoint_file_path=args.checkpoint_file,
+                                                   keep_results=False)
+            else:
+                processor.delete_tags_from_csv(file_path=args.csv_file,
+                                               chunk_size=args.chunk_size,
+                                               csv_reader=args.csv_reader,
+                                               checkpoint_file_path=args.checkpoint_file,
+                                               keep_results=False)
+
+    @classmethod
+    def __plan_tags(cls, args):
+        processor = cls.__make_processor(args)
+        plan_tags_from_csv = processor.plan_delete_tags_from_csv if args.delete \
+            else processor.plan_upsert_tags_from_csv
+        with contextlib.closing(processor), cls.__reporting_metrics(processor, args):
+            plan_tags_from_csv(file_path=args.csv_file,
+                               plan_file_path=args.plan_file,
+                               chunk_size=args.chunk_size,
+                               csv_reader=args.csv_reader)
+
+    @classmethod
+    def __apply_plan(cls, args):
+        # Heavy modules are imported only when a subcommand actually needs them.
+        from . import tag_datasource_processor
+
+        processor = tag_datasource_processor.TagDatasourceProcessor(
+            workers=args.workers,
+            reads_per_minute=args.max_reads_per_minute,
+            writes_per_minute=args.max_writes_per_minute,
+            max_attempts=args.max_attempts,
+            retry_budget=args.retry_budget)
+        with contextlib.closing(processor), cls.__reporting_metrics(processor, args):
+            processor.apply_plan(plan_file_path=args.plan_file)
+
+    @classmethod
+    def __export_tags(cls, args):
+        # Heavy modules are imported only when a subcommand actually needs them.
+        from . import tag_datasource_processor, tag_datasource_reader
+
+        processor = tag_datasource_processor.TagDatasourceProcessor(
+            workers=args.workers,
+            reads_per_minute=args.max_reads_per_minute,
+            writes_per_minute=args.max_writes_per_minute,
+            max_attempts=args.max_attempts,
+            retry_budget=args.retry_budget)
+        names_or_resources = tag_datasource_reader.TagDatasourceReader.read_names_or_resources(
+            args.entries_file)
+        with contextlib.closing(processor), cls.__reporting_metrics(processor, args):
+            processor.export_tags_to_csv(names_or_resources, file_path=args.csv_file)
+
+    @classmethod
+    def __clear_cache(cls, args):
+        from . import persistent_cache
+
+        cache = persistent_cache.PersistentCache(args.cache_dir)
+        cache.invalidate(kind=args.kind)
+        cache.close()
 
 
 def main():
@@ -0,0 +1,65 @@
+import json
+from typing import Iterable, Iterator, NamedTuple
+
+from google.cloud import datacatalog
+from google.cloud.datacatalog import Tag
+from google.protobuf import json_format
+
+
+class TagOperation(NamedTuple):
+    """
+    A Tag write operation: ``constant.TAG_PLAN_OPERATION_*``, the parent Entry name, and the
+    fully built Tag. Tags to be updated or deleted have their persisted names set.
+    """
+    operation: str
+    parent_entry_name: str
+    tag: Tag
+
+
+class TagOperationsPlan:
+    """
+    Read and write execution plans as JSON Lines files, one Tag operation per line, so they can
+    be reviewed and then applied without reading the datasource or the Data Catalog again.
+    """
+
+    @classmethod
+    def read(cls, file_path: str) -> Iterator[TagOperation]:
+        """
+        Read a plan file.
+
+        :param file_path: The plan file path.
+        :return: A generator of Tag operations, in the order they were planned.
+        """
+        with open(file_path) as plan_file:
+            for line in plan_file:
+                # Skip blank lines, which may be left by manual edits.
+                if not line.strip():
+                    continue
+
+                record = json.loads(line)
+                tag = datacatalog.Tag()
+                json_format.ParseDict(record['tag'], Tag.pb(tag))
+                yield TagOperation(record['operation'], record['parent'], tag)
+
+    @classmethod
+    def write(cls, file_path: str, operations: Iterable[TagOperation]) -> int:
+        """
+        Write a plan file.
+
+        :param file_path: The plan file path.
+        :param operations: The Tag operations, in the order they should be applied.
+        :return: The number of operations written.
+        """
+        count = 0
+        with open(file_path, 'w') as plan_file:
+            for operation in operations:
+                record = {
+                    'operation': operation.operation,
+                    'parent': operation.parent_entry_name,
+                    'tag': json_format.MessageToDict(Tag.pb(operation.tag))
+                }
+                plan_file.write(json.dumps(record, separators=(',', ':')))
+                plan_file.write('\n')
+                count += 1
+
+        return count
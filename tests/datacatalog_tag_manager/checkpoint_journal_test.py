@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from datacatalog_tag_manager import checkpoint_journal
+
+
+class CheckpointJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__journal_dir = tempfile.TemporaryDirectory()
+        self.__journal_file_path = os.path.join(self.__journal_dir.name, 'checkpoint.log')
+
+    def tearDown(self):
+        self.__journal_dir.cleanup()
+
+    def test_constructor_nonexistent_file_should_create_it(self):
+        with checkpoint_journal.CheckpointJournal(self.__journal_file_path) as journal:
+            self.assertFalse(journal.is_completed('entry-1'))
+
+        self.assertTrue(os.path.exists(self.__journal_file_path))
+
+    def test_record_should_append_lines(self):
+        with checkpoint_journal.CheckpointJournal(self.__journal_file_path) as journal:
+            journal.record('entry-1')
+            journal.record('//bigquery.googleapis.com/resource-name')
+
+        with checkpoint_journal.CheckpointJournal(self.__journal_file_path) as journal:
+            journal.record('entry-2')
+
+        with open(self.__journal_file_path) as journal_file:
+            self.assertEqual('entry-1\n//bigquery.googleapis.com/resource-name\nentry-2\n',
+                             journal_file.read())
+
+    def test_is_completed_should_consider_previous_runs_only(self):
+        with checkpoint_journal.CheckpointJournal(self.__journal_file_path) as journal:
+            journal.record('entry-1')
+            self.assertFalse(journal.is_completed('entry-1'))
+
+        with checkpoint_journal.CheckpointJournal(self.__journal_file_path) as journal:
+            self.assertTrue(journal.is_completed('entry-1'))
+            self.assertFalse(journal.is_completed('entry-2'))
+
+    def test_constructor_incomplete_last_line_should_discard_it(self):
+        with open(self.__journal_file_path, 'w') as journal_file:
+            journal_file.write('entry-1\nentry-')
+
+        with checkpoint_journal.CheckpointJournal(self.__journal_file_path) as journal:
+            self.assertTrue(journal.is_completed('entry-1'))
+            self.assertFalse(journal.is_completed('entry-'))
+            journal.record('entry-2')
+
+        with open(self.__journal_file_path) as journal_file:
+            self.assertEqual('entry-1\nentry-2\n', journal_file.read())
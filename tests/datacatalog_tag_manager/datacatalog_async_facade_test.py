@@ -0,0 +1,203 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+from google.cloud import datacatalog
+
+from datacatalog_tag_manager import datacatalog_async_facade
+
+
+class DataCatalogAsyncFacadeTest(unittest.TestCase):
+
+    @mock.patch(
+        'datacatalog_tag_manager.datacatalog_async_facade.datacatalog.DataCatalogAsyncClient')
+    def setUp(self, mock_datacatalog_client):
+        # asyncio.run() requires Python 3.7+; Semaphores are bound to the current loop up to 3.9.
+        self.__loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.__loop)
+
+        self.__datacatalog_facade = datacatalog_async_facade.DataCatalogAsyncFacade()
+        # Shortcut for the object assigned to self.__datacatalog_facade.__datacatalog
+        self.__datacatalog_client = mock_datacatalog_client.return_value
+        for method_name in ('create_tag', 'delete_tag', 'get_entry', 'get_tag_template',
+                            'list_tags', 'lookup_entry', 'update_tag'):
+            setattr(self.__datacatalog_client, method_name, CoroutineMock())
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.__loop.close()
+
+    def test_constructor_should_set_instance_attributes(self):
+        self.assertIsNotNone(
+            self.__datacatalog_facade.__dict__['_DataCatalogAsyncFacade__datacatalog'])
+
+    def test_delete_tag_should_call_client_library_method(self):
+        tag = make_fake_tag()
+
+        tag_name = 'my_tag_name'
+        existent_tag = make_fake_tag()
+        existent_tag.name = tag_name
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = FakeAsyncPager([existent_tag])
+
+        self.__loop.run_until_complete(self.__datacatalog_facade.delete_tag('entry_name', tag))
+
+        datacatalog_client.list_tags.assert_called_once()
+        datacatalog_client.delete_tag.assert_called_with(name=tag_name)
+        self.assertEqual({'deleted': 1}, self.__datacatalog_facade.get_operation_counts())
+
+    def test_delete_tag_nonexistent_should_not_call_delete(self):
+        tag = make_fake_tag()
+
+        datacatalog_client = self.__datacatalog_client
+
+        deleted_tag_name = self.__loop.run_until_complete(
+            self.__datacatalog_facade.delete_tag('entry_name', tag, {}))
+
+        datacatalog_client.list_tags.assert_not_called()
+        datacatalog_client.delete_tag.assert_not_called()
+        self.assertIsNone(deleted_tag_name)
+
+    def test_get_entry_should_call_client_library_method_once(self):
+
+        async def get_entry_twice():
+            return await asyncio.gather(self.__datacatalog_facade.get_entry('entry-name'),
+                                        self.__datacatalog_facade.get_entry('entry-name'))
+
+        entries = self.__loop.run_until_complete(get_entry_twice())
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.assert_called_once_with(name='entry-name')
+        self.assertIs(entries[0], entries[1])
+
+    def test_get_entry_failure_should_not_be_cached(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.side_effect = \
+            (exceptions.PermissionDenied(message=''), datacatalog.Entry())
+
+        self.assertRaises(exceptions.PermissionDenied, self.__loop.run_until_complete,
+                          self.__datacatalog_facade.get_entry('entry-name'))
+        self.__loop.run_until_complete(self.__datacatalog_facade.get_entry('entry-name'))
+
+        self.assertEqual(2, datacatalog_client.get_entry.call_count)
+
+    def test_get_tag_template_should_call_client_library_method(self):
+        self.__loop.run_until_complete(self.__datacatalog_facade.get_tag_template(''))
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_tag_template.assert_called_once()
+
+    def test_index_tags_should_index_by_template_and_column(self):
+        tag_1 = make_fake_tag()
+        tag_2 = make_fake_tag()
+        tag_2.column = 'test_column'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = FakeAsyncPager([tag_1, tag_2])
+
+        entry_tags = self.__loop.run_until_complete(
+            self.__datacatalog_facade.index_tags('entry_name'))
+
+        datacatalog_client.list_tags.assert_called_once_with(parent='entry_name')
+        self.assertEqual({
+            ('test_template', ''): tag_1,
+            ('test_template', 'test_column'): tag_2
+        }, entry_tags)
+
+    def test_lookup_entry_should_call_client_library_method(self):
+        self.__loop.run_until_complete(self.__datacatalog_facade.lookup_entry('linked-resource'))
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.lookup_entry.assert_called_once()
+
+    def test_upsert_tag_nonexistent_should_create(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = FakeAsyncPager([])
+
+        self.__loop.run_until_complete(
+            self.__datacatalog_facade.upsert_tag('entry_name', make_fake_tag()))
+
+        datacatalog_client.list_tags.assert_called_once()
+        datacatalog_client.create_tag.assert_called_once()
+
+    def test_upsert_tag_provided_index_should_update_it_in_place(self):
+        datacatalog_client = self.__datacatalog_client
+        created_tag = make_fake_tag()
+        created_tag.name = 'my_tag_name'
+        datacatalog_client.create_tag.return_value = created_tag
+
+        updated_tag = make_fake_tag()
+        updated_tag.fields['test_string_field'].string_value = '[UPDATED] Test String Value'
+        datacatalog_client.update_tag.return_value = updated_tag
+
+        entry_tags = {}
+        self.__loop.run_until_complete(
+            self.__datacatalog_facade.upsert_tag('entry_name', make_fake_tag(), entry_tags))
+        self.__loop.run_until_complete(
+            self.__datacatalog_facade.upsert_tag('entry_name', updated_tag, entry_tags))
+        self.__loop.run_until_complete(
+            self.__datacatalog_facade.upsert_tag('entry_name', updated_tag, entry_tags))
+
+        datacatalog_client.list_tags.assert_not_called()
+        datacatalog_client.create_tag.assert_called_once()
+        datacatalog_client.update_tag.assert_called_once()
+        self.assertEqual({('test_template', ''): updated_tag}, entry_tags)
+        self.assertEqual({
+            'created': 1,
+            'updated': 1,
+            'unchanged': 1
+        }, self.__datacatalog_facade.get_operation_counts())
+
+
+class CoroutineMock(mock.MagicMock):
+    """
+    Minimal replacement for ``mock.AsyncMock``, which requires Python 3.8+: calls are recorded
+    as usual and return a coroutine that returns the result or raises the side effect error.
+    """
+
+    def __call__(self, *args, **kwargs):
+        try:
+            result = super().__call__(*args, **kwargs)
+        except Exception as error:
+            return self.__raise(error)
+        return self.__return(result)
+
+    def _get_child_mock(self, **kwargs):
+        # Attributes and return values are regular, synchronous mocks.
+        return mock.MagicMock(**kwargs)
+
+    @classmethod
+    async def __raise(cls, error):
+        raise error
+
+    @classmethod
+    async def __return(cls, result):
+        return result
+
+
+class FakeAsyncPager:
+
+    def __init__(self, items):
+        self.__items = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.__items)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def make_fake_tag():
+    tag = datacatalog.Tag()
+    tag.template = 'test_template'
+
+    string_field = datacatalog.TagField()
+    string_field.string_value = 'Test String Value'
+    tag.fields['test_string_field'] = string_field
+
+    return tag
@@ -1,5 +1,6 @@
 from datetime import datetime
 import unittest
+from unittest import mock
 from typing import List
 
 from google.cloud import datacatalog
@@ -139,6 +140,155 @@ class DataCatalogEntityFactoryTest(unittest.TestCase):
         self.assertFalse('test_bool_field' in tag.fields)
         self.assertFalse('test_bool_field_invalid' in tag.fields)
 
+    def test_make_tag_invalid_values_should_raise_with_all_invalid_fields(self):
+        tag_template = datacatalog.TagTemplate()
+        tag_template.name = 'test_template'
+        tag_template.fields['test_double_field'] = \
+            make_primitive_type_template_field(self.__DOUBLE_TYPE)
+        tag_template.fields['test_string_field'] = \
+            make_primitive_type_template_field(self.__STRING_TYPE)
+        tag_template.fields['test_timestamp_field'] = \
+            make_primitive_type_template_field(self.__TIMESTAMP_TYPE)
+
+        tag_fields = {
+            'test_double_field': 'not a number',
+            'test_string_field': 'Test value',
+            'test_timestamp_field': '2019-09-06'
+        }
+
+        with self.assertRaises(
+                datacatalog_entity_factory.InvalidFieldValuesError) as context_manager:
+            datacatalog_entity_factory.DataCatalogEntityFactory.make_tag(tag_template, tag_fields)
+
+        error = context_manager.exception
+        self.assertEqual('test_template', error.template_name)
+        self.assertEqual([('test_double_field', 'not a number'),
+                          ('test_timestamp_field', '2019-09-06')], error.invalid_fields)
+        self.assertIsInstance(error, ValueError)
+
+    def test_make_tag_invalid_boolean_values_should_raise(self):
+        tag_template = datacatalog.TagTemplate()
+        tag_template.name = 'test_template'
+        for field_id in ('test_bool_field_yes', 'test_bool_field_typo', 'test_bool_field_false'):
+            tag_template.fields[field_id] = make_primitive_type_template_field(self.__BOOL_TYPE)
+
+        tag_fields = {
+            'test_bool_field_yes': 'yes',
+            'test_bool_field_typo': 'tru',
+            'test_bool_field_false': 'FALSE'
+        }
+
+        with self.assertRaises(
+                datacatalog_entity_factory.InvalidFieldValuesError) as context_manager:
+            datacatalog_entity_factory.DataCatalogEntityFactory.make_tag(tag_template, tag_fields)
+
+        self.assertEqual([('test_bool_field_yes', 'yes'), ('test_bool_field_typo', 'tru')],
+                         context_manager.exception.invalid_fields)
+
+    def test_make_tag_repeated_values_should_parse_once(self):
+        tag_template = datacatalog.TagTemplate()
+        tag_template.name = 'test_template'
+        tag_template.fields['test_double_field'] = \
+            make_primitive_type_template_field(self.__DOUBLE_TYPE)
+        tag_template.fields['test_timestamp_field'] = \
+            make_primitive_type_template_field(self.__TIMESTAMP_TYPE)
+
+        tag_fields = {
+            'test_double_field': '-273.15',
+            'test_timestamp_field': '1969-07-20T20:17:40+0000'
+        }
+
+        with mock.patch('datacatalog_tag_manager.datacatalog_entity_factory.datetime') \
+                as mock_datetime:
+            mock_datetime.strptime.side_effect = datetime.strptime
+            tags = [
+                datacatalog_entity_factory.DataCatalogEntityFactory.make_tag(
+                    tag_template, tag_fields) for _ in range(3)
+            ]
+
+        mock_datetime.strptime.assert_called_once()
+        for tag in tags:
+            self.assertEqual(-273.15, tag.fields['test_double_field'].double_value)
+            self.assertEqual(-14182940,
+                             tag.fields['test_timestamp_field'].timestamp_value.timestamp())
+
+    def test_make_tag_same_template_should_reuse_template_plan(self):
+        tag_template = datacatalog.TagTemplate()
+        tag_template.name = 'test_template'
+        tag_template.fields['test_string_field'] = \
+            make_primitive_type_template_field(self.__STRING_TYPE)
+        other_tag_template = datacatalog.TagTemplate(tag_template)
+
+        factory = datacatalog_entity_factory.DataCatalogEntityFactory
+        compile_template_plan = factory._DataCatalogEntityFactory__compile_template_plan
+        with mock.patch.object(factory,
+                               '_DataCatalogEntityFactory__compile_template_plan',
+                               wraps=compile_template_plan) as mock_compile_template_plan:
+            first_tag = factory.make_tag(tag_template, {'test_string_field': 'Test value 1'})
+            second_tag = factory.make_tag(tag_template, {'test_string_field': 'Test value 2'})
+            factory.make_tag(other_tag_template, {'test_string_field': 'Test value 3'})
+
+        self.assertEqual(2, mock_compile_template_plan.call_count)
+        self.assertEqual('Test value 1', first_tag.fields['test_string_field'].string_value)
+        self.assertEqual('Test value 2', second_tag.fields['test_string_field'].string_value)
+
+    def test_make_tag_no_fields_should_not_compile_template_plan(self):
+        tag_template = datacatalog.TagTemplate()
+        tag_template.name = 'test_template'
+
+        factory = datacatalog_entity_factory.DataCatalogEntityFactory
+        with mock.patch.object(
+                factory,
+                '_DataCatalogEntityFactory__compile_template_plan') as mock_compile_template_plan:
+            factory.make_tag(tag_template, {}, 'test_column')
+
+        mock_compile_template_plan.assert_not_called()
+
+    def test_format_field_value_should_round_trip_through_make_tag(self):
+        tag_template = datacatalog.TagTemplate()
+        tag_template.name = 'test_template'
+        tag_template.fields['test_bool_field'] = \
+            make_primitive_type_template_field(self.__BOOL_TYPE)
+        tag_template.fields['test_false_bool_field'] = \
+            make_primitive_type_template_field(self.__BOOL_TYPE)
+        tag_template.fields['test_double_field'] = \
+            make_primitive_type_template_field(self.__DOUBLE_TYPE)
+        tag_template.fields['test_enum_field'] = make_enum_type_template_field(['VALUE_1'])
+        tag_template.fields['test_richtext_field'] = \
+            make_primitive_type_template_field(self.__RICHTEXT_TYPE)
+        tag_template.fields['test_string_field'] = \
+            make_primitive_type_template_field(self.__STRING_TYPE)
+        tag_template.fields['test_timestamp_field'] = \
+            make_primitive_type_template_field(self.__TIMESTAMP_TYPE)
+
+        factory = datacatalog_entity_factory.DataCatalogEntityFactory
+        tag = factory.make_tag(
+            tag_template, {
+                'test_bool_field': True,
+                'test_false_bool_field': False,
+                'test_double_field': 0.1 + 0.2,
+                'test_enum_field': 'VALUE_1',
+                'test_richtext_field': '<b>Test value</b>',
+                'test_string_field': 'Test value',
+                'test_timestamp_field': '2019-09-06T11:00:00-03:00'
+            })
+
+        formatted_values = {
+            field_id: factory.format_field_value(field)
+            for field_id, field in tag.fields.items()
+        }
+
+        self.assertEqual('true', formatted_values['test_bool_field'])
+        self.assertEqual('false', formatted_values['test_false_bool_field'])
+        self.assertEqual('2019-09-06T14:00:00+0000', formatted_values['test_timestamp_field'])
+        self.assertEqual(tag, factory.make_tag(tag_template, formatted_values))
+
+    def test_format_field_value_no_value_should_return_empty_string(self):
+        self.assertEqual(
+            '',
+            datacatalog_entity_factory.DataCatalogEntityFactory.format_field_value(
+                datacatalog.TagField()))
+
 
 def make_primitive_type_template_field(primitive_type: FieldType.PrimitiveType):
     field = datacatalog.TagTemplateField()
@@ -1,10 +1,12 @@
 import unittest
 from unittest import mock
 
+from google.api_core import exceptions
 from google.cloud import datacatalog
 from google.protobuf import timestamp_pb2
 
-from datacatalog_tag_manager import datacatalog_facade
+from datacatalog_tag_manager import datacatalog_facade, retrying, run_metrics, \
+    structured_logging, tag_operations_plan
 
 
 class DataCatalogFacadeTest(unittest.TestCase):
@@ -18,6 +20,55 @@ class DataCatalogFacadeTest(unittest.TestCase):
     def test_constructor_should_set_instance_attributes(self):
         self.assertIsNotNone(self.__datacatalog_facade.__dict__['_DataCatalogFacade__datacatalog'])
 
+    def test_apply_tag_operation_should_call_client_library_methods(self):
+        tag = make_fake_tag()
+        tag.name = 'my_tag_name'
+
+        facade = self.__datacatalog_facade
+        facade.apply_tag_operation(tag_operations_plan.TagOperation('create', 'entry_name', tag))
+        facade.apply_tag_operation(tag_operations_plan.TagOperation('update', 'entry_name', tag))
+        deleted_tag_name = facade.apply_tag_operation(
+            tag_operations_plan.TagOperation('delete', 'entry_name', tag))
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.assert_not_called()
+        datacatalog_client.create_tag.assert_called_once_with(parent='entry_name', tag=tag)
+        datacatalog_client.update_tag.assert_called_once_with(tag=tag)
+        datacatalog_client.delete_tag.assert_called_once_with(name='my_tag_name')
+        self.assertEqual('my_tag_name', deleted_tag_name)
+
+    def test_apply_tag_operation_unknown_should_raise_value_error(self):
+        self.assertRaises(ValueError, self.__datacatalog_facade.apply_tag_operation,
+                          tag_operations_plan.TagOperation('merge', 'entry_name', make_fake_tag()))
+
+    def test_are_tag_fields_equal_should_ignore_output_only_attributes(self):
+        tag = make_fake_tag()
+
+        persisted_tag = make_fake_tag()
+        persisted_tag.name = 'my_tag_name'
+        persisted_tag.fields['test_string_field'].display_name = 'Test String Field'
+        persisted_tag.fields['test_string_field'].order = 1
+
+        self.assertTrue(
+            datacatalog_facade.DataCatalogFacade.are_tag_fields_equal(tag, persisted_tag))
+
+    def test_are_tag_fields_equal_should_compare_typed_values(self):
+        tag = make_fake_tag()
+
+        other_value_tag = make_fake_tag()
+        other_value_tag.fields['test_double_field'].double_value = 1.5
+
+        other_type_tag = make_fake_tag()
+        other_type_tag.fields['test_double_field'].string_value = '1'
+
+        missing_field_tag = make_fake_tag()
+        del missing_field_tag.fields['test_enum_field']
+
+        facade_class = datacatalog_facade.DataCatalogFacade
+        self.assertFalse(facade_class.are_tag_fields_equal(tag, other_value_tag))
+        self.assertFalse(facade_class.are_tag_fields_equal(tag, other_type_tag))
+        self.assertFalse(facade_class.are_tag_fields_equal(tag, missing_field_tag))
+
     def test_delete_tag_should_call_client_library_method(self):
         tag = make_fake_tag()
 
@@ -46,24 +97,271 @@ class DataCatalogFacadeTest(unittest.TestCase):
         datacatalog_client.list_tags.assert_called_once()
         datacatalog_client.delete_tag.assert_not_called()
 
+    def test_delete_tag_provided_index_should_not_list_tags(self):
+        tag = make_fake_tag()
+
+        existent_tag = make_fake_tag()
+        existent_tag.name = 'my_tag_name'
+        entry_tags = {(existent_tag.template, existent_tag.column): existent_tag}
+
+        self.__datacatalog_facade.delete_tag('entry_name', tag, entry_tags)
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.assert_not_called()
+        datacatalog_client.delete_tag.assert_called_with(name='my_tag_name')
+        self.assertEqual({}, entry_tags)
+
     def test_get_entry_should_call_client_library_method(self):
         self.__datacatalog_facade.get_entry('entry-name')
 
         datacatalog_client = self.__datacatalog_client
         datacatalog_client.get_entry.assert_called_once()
 
+    def test_get_entry_aggregating_should_record_event_instead_of_logging(self):
+        structured_logging.EntryEvents.enable()
+        try:
+            with self.assertLogs(level='INFO') as logs:
+                with structured_logging.EntryEvents.aggregate('entry-name'):
+                    self.__datacatalog_facade.get_entry('entry-name')
+        finally:
+            structured_logging.EntryEvents.enable(False)
+
+        self.assertEqual(['INFO:root:Entry processed: entry-name'], logs.output)
+        self.assertEqual({'get_entry': 1}, logs.records[0].fields['events'])
+
+    @mock.patch('datacatalog_tag_manager.datacatalog_facade.datacatalog.DataCatalogClient')
+    def test_get_entry_cached_should_not_call_client_library_method(self, mock_datacatalog_client):
+        cached_entry = datacatalog.Entry()
+        cached_entry.name = 'entry-name'
+        cache = mock.MagicMock()
+        cache.get.return_value = datacatalog.Entry.serialize(cached_entry)
+
+        entry = datacatalog_facade.DataCatalogFacade(cache=cache).get_entry('entry-name')
+
+        mock_datacatalog_client.return_value.get_entry.assert_not_called()
+        cache.get.assert_called_once_with('entry', 'entry-name')
+        self.assertEqual(cached_entry, entry)
+
+    @mock.patch('datacatalog_tag_manager.datacatalog_facade.datacatalog.DataCatalogClient')
+    def test_lookup_entry_not_cached_should_cache_result(self, mock_datacatalog_client):
+        entry = datacatalog.Entry()
+        entry.name = 'entry-name'
+        mock_datacatalog_client.return_value.lookup_entry.return_value = entry
+        cache = mock.MagicMock()
+        cache.get.return_value = None
+
+        datacatalog_facade.DataCatalogFacade(cache=cache).lookup_entry('linked-resource')
+
+        mock_datacatalog_client.return_value.lookup_entry.assert_called_once()
+        cache.set.assert_called_once_with('entry_lookup', 'linked-resource',
+                                          datacatalog.Entry.serialize(entry))
+
+    def test_get_entry_should_cache_entries_in_memory(self):
+        facade = self.__datacatalog_facade
+        facade.get_entry('entry-1')
+        facade.get_entry('entry-1')
+        facade.get_entry('entry-2')
+
+        entry_cache_stats = facade.get_cache_stats()['entry']
+        self.assertEqual(2, self.__datacatalog_client.get_entry.call_count)
+        self.assertEqual({
+            'hits': 1,
+            'misses': 2,
+            'coalesced': 0,
+            'evictions': 0,
+            'size': 2
+        }, entry_cache_stats)
+
+    @mock.patch('datacatalog_tag_manager.datacatalog_facade.datacatalog.DataCatalogClient')
+    def test_get_tag_template_memory_cache_size_should_bound_cache(self, mock_datacatalog_client):
+        facade = datacatalog_facade.DataCatalogFacade(memory_cache_sizes={'tag_template': 1})
+        facade.get_tag_template('template-1')
+        facade.get_tag_template('template-2')
+        facade.get_tag_template('template-1')
+
+        self.assertEqual(3, mock_datacatalog_client.return_value.get_tag_template.call_count)
+        self.assertEqual(2, facade.get_cache_stats()['tag_template']['evictions'])
+
+    @mock.patch('datacatalog_tag_manager.datacatalog_facade.datacatalog.DataCatalogClient')
+    def test_rate_limiter_should_limit_api_calls_by_kind(self, mock_datacatalog_client):
+        rate_limiter = mock.MagicMock()
+        facade = datacatalog_facade.DataCatalogFacade(rate_limiter=rate_limiter)
+
+        facade.upsert_tag('entry_name', make_fake_tag())
+
+        self.assertEqual([mock.call('read'), mock.call('write')],
+                         rate_limiter.limit.call_args_list)
+        mock_datacatalog_client.return_value.create_tag.assert_called_once()
+
+    @mock.patch('datacatalog_tag_manager.retrying.time.sleep')
+    @mock.patch('datacatalog_tag_manager.datacatalog_facade.datacatalog.DataCatalogClient')
+    def test_retry_policy_should_retry_transient_errors(self, mock_datacatalog_client, mock_sleep):
+        existent_tag = make_fake_tag()
+        existent_tag.name = 'my_tag_name'
+        changed_tag = make_fake_tag()
+        changed_tag.fields['test_string_field'].string_value = '[UPDATED] Test String Value'
+
+        # Inject failures before the successful responses.
+        datacatalog_client = mock_datacatalog_client.return_value
+        datacatalog_client.list_tags.side_effect = (exceptions.DeadlineExceeded(message=''),
+                                                    [existent_tag])
+        datacatalog_client.update_tag.side_effect = (exceptions.ServiceUnavailable(message=''),
+                                                     exceptions.ResourceExhausted(message=''),
+                                                     changed_tag)
+
+        facade = datacatalog_facade.DataCatalogFacade(retry_policy=retrying.RetryPolicy())
+        upserted_tag = facade.upsert_tag('entry_name', changed_tag)
+
+        self.assertEqual(changed_tag, upserted_tag)
+        self.assertEqual(2, datacatalog_client.list_tags.call_count)
+        self.assertEqual(3, datacatalog_client.update_tag.call_count)
+        self.assertEqual({'retries': 3, 'exhausted': 0}, facade.get_retry_stats())
+
+    @mock.patch('datacatalog_tag_manager.retrying.time.sleep')
+    @mock.patch('datacatalog_tag_manager.datacatalog_facade.datacatalog.DataCatalogClient')
+    def test_retry_policy_should_retry_create_on_quota_errors_only(self, mock_datacatalog_client,
+                                                                   mock_sleep):
+        datacatalog_client = mock_datacatalog_client.return_value
+        datacatalog_client.create_tag.side_effect = (exceptions.ResourceExhausted(message=''),
+                                                     exceptions.DeadlineExceeded(message=''))
+
+        facade = datacatalog_facade.DataCatalogFacade(retry_policy=retrying.RetryPolicy())
+
+        self.assertRaises(exceptions.DeadlineExceeded, facade.upsert_tag, 'entry_name',
+                          make_fake_tag(), {})
+        self.assertEqual(2, datacatalog_client.create_tag.call_count)
+        self.assertEqual({'retries': 1, 'exhausted': 0}, facade.get_retry_stats())
+
+    @mock.patch('datacatalog_tag_manager.retrying.time.sleep')
+    @mock.patch('datacatalog_tag_manager.datacatalog_facade.datacatalog.DataCatalogClient')
+    def test_retry_policy_retried_delete_not_found_should_succeed(self, mock_datacatalog_client,
+                                                                  mock_sleep):
+        tag = make_fake_tag()
+        tag.name = 'my_tag_name'
+
+        datacatalog_client = mock_datacatalog_client.return_value
+        # The first attempt deleted the Tag, but its deadline was exceeded.
+        datacatalog_client.delete_tag.side_effect = (exceptions.DeadlineExceeded(message=''),
+                                                     exceptions.NotFound(message=''))
+
+        facade = datacatalog_facade.DataCatalogFacade(retry_policy=retrying.RetryPolicy())
+        deleted_tag_name = facade.delete_tag('entry_name', tag, {('test_template', ''): tag})
+
+        self.assertEqual('my_tag_name', deleted_tag_name)
+        self.assertEqual(2, datacatalog_client.delete_tag.call_count)
+        self.assertEqual({'deleted': 1}, facade.get_operation_counts())
+
+    @mock.patch('datacatalog_tag_manager.datacatalog_facade.datacatalog.DataCatalogClient')
+    def test_retry_policy_delete_not_found_should_raise(self, mock_datacatalog_client):
+        tag = make_fake_tag()
+        tag.name = 'my_tag_name'
+
+        datacatalog_client = mock_datacatalog_client.return_value
+        datacatalog_client.delete_tag.side_effect = exceptions.NotFound(message='')
+
+        facade = datacatalog_facade.DataCatalogFacade(retry_policy=retrying.RetryPolicy())
+
+        self.assertRaises(exceptions.NotFound, facade.delete_tag, 'entry_name', tag,
+                          {('test_template', ''): tag})
+        self.assertEqual({}, facade.get_operation_counts())
+
+    @mock.patch('datacatalog_tag_manager.retrying.time.sleep')
+    @mock.patch('datacatalog_tag_manager.datacatalog_facade.datacatalog.DataCatalogClient')
+    def test_metrics_should_record_api_call_attempts_and_tag_operations(
+            self, mock_datacatalog_client, mock_sleep):
+
+        datacatalog_client = mock_datacatalog_client.return_value
+        datacatalog_client.list_tags.side_effect = (exceptions.DeadlineExceeded(message=''), [])
+        datacatalog_client.create_tag.return_value = make_fake_tag()
+
+        metrics = run_metrics.RunMetrics()
+        facade = datacatalog_facade.DataCatalogFacade(retry_policy=retrying.RetryPolicy(),
+                                                      metrics=metrics)
+        facade.upsert_tag('entry_name', make_fake_tag())
+
+        summary = metrics.to_dict()
+        self.assertEqual(2, summary['rpcs']['list_tags']['count'])
+        self.assertEqual(1, summary['rpcs']['list_tags']['errors'])
+        self.assertEqual(1, summary['rpcs']['create_tag']['count'])
+        self.assertEqual(0, summary['rpcs']['create_tag']['errors'])
+        self.assertEqual({'tags_created': 1}, summary['counters'])
+
+    def test_get_retry_stats_no_retry_policy_should_return_empty_dict(self):
+        self.assertEqual({}, self.__datacatalog_facade.get_retry_stats())
+
     def test_get_tag_template_should_call_client_library_method(self):
         self.__datacatalog_facade.get_tag_template('')
 
         datacatalog_client = self.__datacatalog_client
         datacatalog_client.get_tag_template.assert_called_once()
 
+    def test_index_tags_should_index_by_template_and_column(self):
+        tag_1 = make_fake_tag()
+        tag_2 = make_fake_tag()
+        tag_2.column = 'test_column'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = [tag_1, tag_2]
+
+        entry_tags = self.__datacatalog_facade.index_tags('entry_name')
+
+        datacatalog_client.list_tags.assert_called_once_with(parent='entry_name')
+        self.assertEqual({
+            ('test_template', ''): tag_1,
+            ('test_template', 'test_column'): tag_2
+        }, entry_tags)
+
     def test_lookup_entry_should_call_client_library_method(self):
         self.__datacatalog_facade.lookup_entry('linked-resource')
 
         datacatalog_client = self.__datacatalog_client
         datacatalog_client.lookup_entry.assert_called_once()
 
+    def test_plan_delete_tag_should_not_call_write_methods(self):
+        existent_tag = make_fake_tag()
+        existent_tag.name = 'my_tag_name'
+        entry_tags = {(existent_tag.template, existent_tag.column): existent_tag}
+
+        operation = self.__datacatalog_facade.plan_delete_tag('entry_name', make_fake_tag(),
+                                                              entry_tags)
+
+        self.__datacatalog_client.delete_tag.assert_not_called()
+        self.assertEqual(('delete', 'entry_name', existent_tag), operation)
+        self.assertEqual({}, entry_tags)
+
+    def test_plan_delete_tag_nonexistent_should_return_none(self):
+        self.assertIsNone(
+            self.__datacatalog_facade.plan_delete_tag('entry_name', make_fake_tag(), {}))
+
+    def test_plan_upsert_tag_should_not_call_write_methods(self):
+        existent_tag = make_fake_tag()
+        existent_tag.name = 'my_tag_name'
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = [existent_tag]
+
+        changed_tag = make_fake_tag()
+        changed_tag.fields['test_string_field'].string_value = '[UPDATED] Test String Value'
+        column_tag = make_fake_tag()
+        column_tag.column = 'test_column'
+
+        facade = self.__datacatalog_facade
+        entry_tags = facade.index_tags('entry_name')
+        unchanged_operation = facade.plan_upsert_tag('entry_name', make_fake_tag(), entry_tags)
+        update_operation = facade.plan_upsert_tag('entry_name', changed_tag, entry_tags)
+        create_operation = facade.plan_upsert_tag('entry_name', column_tag, entry_tags)
+
+        datacatalog_client.create_tag.assert_not_called()
+        datacatalog_client.update_tag.assert_not_called()
+        self.assertIsNone(unchanged_operation)
+        self.assertEqual(('update', 'entry_name', changed_tag), update_operation)
+        self.assertEqual('my_tag_name', update_operation.tag.name)
+        self.assertEqual(('create', 'entry_name', column_tag), create_operation)
+        self.assertEqual(
+            {
+                ('test_template', ''): changed_tag,
+                ('test_template', 'test_column'): column_tag
+            }, entry_tags)
+
     def test_upsert_tag_nonexistent_should_create(self):
         datacatalog_client = self.__datacatalog_client
         datacatalog_client.list_tags.return_value = []
@@ -88,6 +386,62 @@ class DataCatalogFacadeTest(unittest.TestCase):
         datacatalog_client.update_tag.assert_called_once()
         datacatalog_client.update_tag.assert_called_with(tag=tag_2)
 
+    def test_upsert_tag_unchanged_should_not_update(self):
+        persisted_tag = make_fake_tag()
+        persisted_tag.name = 'my_tag_name'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = [persisted_tag]
+
+        upserted_tag = self.__datacatalog_facade.upsert_tag('entry_name', make_fake_tag())
+
+        datacatalog_client.update_tag.assert_not_called()
+        datacatalog_client.create_tag.assert_not_called()
+        self.assertEqual(persisted_tag, upserted_tag)
+
+    def test_get_operation_counts_should_count_tag_operations(self):
+        persisted_tag = make_fake_tag()
+        persisted_tag.name = 'my_tag_name'
+        changed_tag = make_fake_tag()
+        changed_tag.fields['test_string_field'].string_value = '[UPDATED] Test String Value'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.create_tag.return_value = persisted_tag
+        datacatalog_client.update_tag.return_value = changed_tag
+
+        facade = self.__datacatalog_facade
+        entry_tags = {}
+        facade.upsert_tag('entry_name', make_fake_tag(), entry_tags)
+        facade.upsert_tag('entry_name', changed_tag, entry_tags)
+        facade.upsert_tag('entry_name', changed_tag, entry_tags)
+        facade.delete_tag('entry_name', changed_tag, entry_tags)
+
+        self.assertEqual({
+            'created': 1,
+            'updated': 1,
+            'unchanged': 1,
+            'deleted': 1
+        }, facade.get_operation_counts())
+
+    def test_upsert_tag_provided_index_should_update_it_in_place(self):
+        datacatalog_client = self.__datacatalog_client
+        created_tag = make_fake_tag()
+        created_tag.name = 'my_tag_name'
+        datacatalog_client.create_tag.return_value = created_tag
+
+        updated_tag = make_fake_tag()
+        updated_tag.fields['test_string_field'].string_value = '[UPDATED] Test String Value'
+
+        entry_tags = {}
+        self.__datacatalog_facade.upsert_tag('entry_name', make_fake_tag(), entry_tags)
+        self.__datacatalog_facade.upsert_tag('entry_name', updated_tag, entry_tags)
+
+        datacatalog_client.list_tags.assert_not_called()
+        datacatalog_client.create_tag.assert_called_once()
+        datacatalog_client.update_tag.assert_called_once()
+        self.assertEqual({('test_template', ''): datacatalog_client.update_tag.return_value},
+                         entry_tags)
+
 
 def make_fake_tag():
     tag = datacatalog.Tag()
@@ -0,0 +1,57 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from datacatalog_tag_manager import persistent_cache
+
+
+class PersistentCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.__cache_dir.cleanup()
+
+    def test_set_then_get_should_keep_values_across_instances(self):
+        cache = persistent_cache.PersistentCache(self.__cache_dir.name)
+        cache.set('entry', 'entry-name', b'entry-value')
+        cache.close()
+
+        cache = persistent_cache.PersistentCache(self.__cache_dir.name)
+        self.assertEqual(b'entry-value', cache.get('entry', 'entry-name'))
+        self.assertIsNone(cache.get('tag_template', 'entry-name'))
+        cache.close()
+
+    @mock.patch('datacatalog_tag_manager.persistent_cache.time.time')
+    def test_get_expired_value_should_return_none(self, mock_time):
+        mock_time.return_value = 1000
+        cache = persistent_cache.PersistentCache(self.__cache_dir.name, {'entry': 10})
+        cache.set('entry', 'entry-name', b'entry-value')
+
+        mock_time.return_value = 1009
+        self.assertEqual(b'entry-value', cache.get('entry', 'entry-name'))
+        mock_time.return_value = 1010
+        self.assertIsNone(cache.get('entry', 'entry-name'))
+        cache.close()
+
+    def test_set_zero_ttl_should_not_cache(self):
+        cache = persistent_cache.PersistentCache(self.__cache_dir.name, {'tag_template': 0})
+        cache.set('tag_template', 'template-name', b'template-value')
+
+        self.assertIsNone(cache.get('tag_template', 'template-name'))
+        cache.close()
+
+    def test_invalidate_should_remove_matching_values(self):
+        cache = persistent_cache.PersistentCache(self.__cache_dir.name)
+        cache.set('entry', 'name-1', b'value-1')
+        cache.set('entry', 'name-2', b'value-2')
+        cache.set('tag_template', 'name-1', b'value-3')
+        cache.set('tag_template', 'name-2', b'value-4')
+
+        self.assertEqual(1, cache.invalidate(kind='entry', key='name-1'))
+        self.assertIsNone(cache.get('entry', 'name-1'))
+        self.assertEqual(2, cache.invalidate(kind='tag_template'))
+        self.assertEqual(b'value-2', cache.get('entry', 'name-2'))
+        self.assertEqual(1, cache.invalidate())
+        cache.close()
@@ -0,0 +1,115 @@
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+
+from datacatalog_tag_manager import rate_limiting
+
+
+@mock.patch('datacatalog_tag_manager.rate_limiting.time')
+class TokenBucketTest(unittest.TestCase):
+
+    def test_constructor_invalid_rate_should_raise_value_error(self, mock_time):
+        self.assertRaises(ValueError, rate_limiting.TokenBucket, 0)
+
+    def test_acquire_within_capacity_should_not_wait(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        bucket = rate_limiting.TokenBucket(2)
+
+        bucket.acquire()
+        bucket.acquire()
+
+        mock_time.sleep.assert_not_called()
+
+    def test_acquire_empty_bucket_should_wait_for_tokens(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        bucket = rate_limiting.TokenBucket(2)
+
+        bucket.acquire()
+        bucket.acquire()
+        bucket.acquire()
+        bucket.acquire()
+
+        self.assertEqual([mock.call(0.5), mock.call(1.0)], mock_time.sleep.call_args_list)
+
+    def test_acquire_should_refill_tokens_over_time(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        bucket = rate_limiting.TokenBucket(2)
+        bucket.acquire()
+        bucket.acquire()
+
+        mock_time.monotonic.return_value = 101
+        bucket.acquire()
+        bucket.acquire()
+
+        mock_time.sleep.assert_not_called()
+
+
+class AdaptiveConcurrencyLimiterTest(unittest.TestCase):
+
+    def test_constructor_invalid_limits_should_raise_value_error(self):
+        self.assertRaises(ValueError, rate_limiting.AdaptiveConcurrencyLimiter, 2, 3)
+
+    def test_release_throttled_should_decrease_limit_once_per_epoch(self):
+        limiter = rate_limiting.AdaptiveConcurrencyLimiter(8)
+        tickets = [limiter.acquire() for _ in range(4)]
+
+        for ticket in tickets:
+            limiter.release(ticket, throttled=True)
+        self.assertEqual(4, limiter.limit)
+
+        limiter.release(limiter.acquire(), throttled=True)
+        self.assertEqual(2, limiter.limit)
+
+    def test_release_throttled_should_not_go_below_minimum(self):
+        limiter = rate_limiting.AdaptiveConcurrencyLimiter(2, min_concurrency=2)
+        limiter.release(limiter.acquire(), throttled=True)
+        self.assertEqual(2, limiter.limit)
+
+    def test_release_successful_should_increase_limit_up_to_maximum(self):
+        limiter = rate_limiting.AdaptiveConcurrencyLimiter(4)
+        limiter.release(limiter.acquire(), throttled=True)
+        limiter.release(limiter.acquire(), throttled=True)
+        self.assertEqual(1, limiter.limit)
+
+        for _ in range(3):
+            limiter.release(limiter.acquire())
+        self.assertEqual(2, limiter.limit)
+
+        for _ in range(20):
+            limiter.release(limiter.acquire())
+        self.assertEqual(4, limiter.limit)
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    @mock.patch('datacatalog_tag_manager.rate_limiting.TokenBucket')
+    def test_limit_should_use_call_kind_bucket(self, mock_token_bucket):
+        read_bucket = mock.MagicMock()
+        write_bucket = mock.MagicMock()
+        mock_token_bucket.side_effect = (read_bucket, write_bucket)
+
+        limiter = rate_limiting.RateLimiter(reads_per_minute=600, writes_per_minute=60)
+        with limiter.limit('write'):
+            pass
+
+        self.assertEqual([mock.call(10), mock.call(1)], mock_token_bucket.call_args_list)
+        read_bucket.acquire.assert_not_called()
+        write_bucket.acquire.assert_called_once()
+
+    @mock.patch('datacatalog_tag_manager.rate_limiting.AdaptiveConcurrencyLimiter')
+    def test_limit_quota_error_should_release_throttled(self, mock_concurrency_limiter):
+        concurrency_limiter = mock_concurrency_limiter.return_value
+        concurrency_limiter.acquire.return_value = 7
+
+        limiter = rate_limiting.RateLimiter(max_concurrency=4)
+        with self.assertRaises(exceptions.ResourceExhausted):
+            with limiter.limit('read'):
+                raise exceptions.ResourceExhausted(message='')
+        with self.assertRaises(ValueError):
+            with limiter.limit('read'):
+                raise ValueError
+
+        mock_concurrency_limiter.assert_called_once_with(4)
+        self.assertEqual([mock.call(7, True), mock.call(7, False)],
+                         concurrency_limiter.release.call_args_list)
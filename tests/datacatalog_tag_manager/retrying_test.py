@@ -0,0 +1,59 @@
+import unittest
+from unittest import mock
+
+from datacatalog_tag_manager import retrying
+
+
+@mock.patch('datacatalog_tag_manager.retrying.time.sleep')
+@mock.patch('datacatalog_tag_manager.retrying.random.uniform', side_effect=lambda a, b: b)
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_constructor_invalid_max_attempts_should_raise_value_error(
+            self, mock_uniform, mock_sleep):
+        self.assertRaises(ValueError, retrying.RetryPolicy, max_attempts=0)
+
+    def test_call_success_should_not_retry(self, mock_uniform, mock_sleep):
+        function = mock.MagicMock(return_value='result')
+
+        result = retrying.RetryPolicy().call(function, (ValueError, ), 'arg', kwarg='kwarg')
+
+        self.assertEqual('result', result)
+        function.assert_called_once_with('arg', kwarg='kwarg')
+        mock_sleep.assert_not_called()
+
+    def test_call_retryable_errors_should_retry_with_exponential_backoff(
+            self, mock_uniform, mock_sleep):
+
+        function = mock.MagicMock(side_effect=(ValueError, ValueError, ValueError, 'result'))
+        policy = retrying.RetryPolicy(initial_backoff=1, max_backoff=3, multiplier=2)
+
+        self.assertEqual('result', policy.call(function, (ValueError, )))
+        self.assertEqual([mock.call(1), mock.call(2), mock.call(3)], mock_sleep.call_args_list)
+        self.assertEqual(
+            [mock.call(0, 1), mock.call(0, 2), mock.call(0, 3)], mock_uniform.call_args_list)
+        self.assertEqual({'retries': 3, 'exhausted': 0}, policy.get_stats())
+
+    def test_call_other_errors_should_not_retry(self, mock_uniform, mock_sleep):
+        function = mock.MagicMock(side_effect=KeyError)
+        policy = retrying.RetryPolicy()
+
+        self.assertRaises(KeyError, policy.call, function, (ValueError, ))
+        function.assert_called_once()
+        self.assertEqual({'retries': 0, 'exhausted': 0}, policy.get_stats())
+
+    def test_call_max_attempts_should_raise_last_error(self, mock_uniform, mock_sleep):
+        function = mock.MagicMock(side_effect=ValueError)
+        policy = retrying.RetryPolicy(max_attempts=3)
+
+        self.assertRaises(ValueError, policy.call, function, (ValueError, ))
+        self.assertEqual(3, function.call_count)
+        self.assertEqual({'retries': 2, 'exhausted': 1}, policy.get_stats())
+
+    def test_call_retry_budget_should_be_shared_by_calls(self, mock_uniform, mock_sleep):
+        function = mock.MagicMock(side_effect=(ValueError, 'result', ValueError, ValueError))
+        policy = retrying.RetryPolicy(retry_budget=2)
+
+        self.assertEqual('result', policy.call(function, (ValueError, )))
+        self.assertRaises(ValueError, policy.call, function, (ValueError, ))
+        self.assertEqual(4, function.call_count)
+        self.assertEqual({'retries': 2, 'exhausted': 1}, policy.get_stats())
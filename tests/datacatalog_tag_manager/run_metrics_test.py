@@ -0,0 +1,136 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from datacatalog_tag_manager import run_metrics
+
+
+class RunMetricsTest(unittest.TestCase):
+
+    def test_count_should_add_up_increments(self):
+        metrics = run_metrics.RunMetrics()
+        metrics.count('rows_parsed', 10)
+        metrics.count('rows_parsed', 5)
+        metrics.count('tags_created')
+
+        self.assertEqual({'rows_parsed': 15, 'tags_created': 1}, metrics.to_dict()['counters'])
+
+    def test_set_gauge_should_replace_value(self):
+        metrics = run_metrics.RunMetrics()
+        metrics.set_gauge('cache_entry_hits', 1)
+        metrics.set_gauge('cache_entry_hits', 3)
+
+        self.assertEqual({'cache_entry_hits': 3}, metrics.to_dict()['gauges'])
+
+    def test_observe_rpc_should_keep_cumulative_latency_buckets(self):
+        metrics = run_metrics.RunMetrics()
+        metrics.observe_rpc('get_entry', 0.003)
+        metrics.observe_rpc('get_entry', 0.02)
+        metrics.observe_rpc('get_entry', 30, error='DeadlineExceeded')
+
+        rpc = metrics.to_dict()['rpcs']['get_entry']
+        self.assertEqual(3, rpc['count'])
+        self.assertEqual(1, rpc['errors'])
+        self.assertAlmostEqual(30.023, rpc['seconds'])
+        self.assertEqual(1, rpc['buckets']['0.005'])
+        self.assertEqual(1, rpc['buckets']['0.01'])
+        self.assertEqual(2, rpc['buckets']['0.025'])
+        self.assertEqual(2, rpc['buckets']['10.0'])
+        self.assertEqual(3, rpc['buckets']['+Inf'])
+
+    @mock.patch('datacatalog_tag_manager.run_metrics.time.perf_counter',
+                side_effect=(1.0, 3.5, 4.0, 4.5))
+    def test_time_stage_should_add_up_stage_times(self, mock_perf_counter):
+        metrics = run_metrics.RunMetrics()
+        with metrics.time_stage('process'):
+            pass
+        with self.assertRaises(ValueError):
+            with metrics.time_stage('process'):
+                raise ValueError()
+
+        self.assertEqual({'process': {'count': 2, 'seconds': 3.0}}, metrics.to_dict()['stages'])
+
+    def test_hooks_should_receive_metrics(self):
+        hook = mock.MagicMock(spec=run_metrics.MetricsHook)
+        metrics = run_metrics.RunMetrics(hooks=[hook])
+        metrics.count('rows_parsed', 2)
+        metrics.set_gauge('cache_entry_hits', 1)
+        metrics.observe_rpc('get_entry', 0.1)
+        with metrics.time_stage('read'):
+            pass
+
+        hook.on_count.assert_called_once_with('rows_parsed', 2)
+        hook.on_gauge.assert_called_once_with('cache_entry_hits', 1)
+        hook.on_rpc.assert_called_once_with('get_entry', 0.1, None)
+        hook.on_stage.assert_called_once_with('read', mock.ANY)
+
+    def test_hook_errors_should_be_logged(self):
+        hook = mock.MagicMock(spec=run_metrics.MetricsHook)
+        hook.on_count.side_effect = RuntimeError('unavailable')
+        other_hook = mock.MagicMock(spec=run_metrics.MetricsHook)
+        metrics = run_metrics.RunMetrics()
+        metrics.add_hook(hook)
+        metrics.add_hook(other_hook)
+
+        with self.assertLogs(level='WARNING'):
+            metrics.count('rows_parsed')
+
+        other_hook.on_count.assert_called_once_with('rows_parsed', 1)
+        self.assertEqual({'rows_parsed': 1}, metrics.to_dict()['counters'])
+
+    def test_write_json_should_write_summary(self):
+        metrics = run_metrics.RunMetrics()
+        metrics.count('tags_created', 2)
+        metrics.observe_rpc('create_tag', 0.1)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'metrics.json')
+            metrics.write_json(file_path)
+            with open(file_path) as metrics_file:
+                summary = json.load(metrics_file)
+
+            self.assertEqual(['metrics.json'], os.listdir(temp_dir))
+
+        self.assertEqual(metrics.to_dict(), summary)
+
+    def test_write_prometheus_should_write_text_format(self):
+        metrics = run_metrics.RunMetrics()
+        metrics.count('tags_created', 2)
+        metrics.set_gauge('cache_entry_hits', 4)
+        metrics.observe_rpc('create_tag', 0.2)
+        with metrics.time_stage('process'):
+            pass
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'metrics.prom')
+            metrics.write_prometheus(file_path)
+            with open(file_path) as metrics_file:
+                lines = metrics_file.read().splitlines()
+
+        self.assertIn('# TYPE datacatalog_tag_manager_tags_created_total counter', lines)
+        self.assertIn('datacatalog_tag_manager_tags_created_total 2', lines)
+        self.assertIn('datacatalog_tag_manager_cache_entry_hits 4', lines)
+        self.assertIn('datacatalog_tag_manager_rpc_errors_total{method="create_tag"} 0', lines)
+        self.assertIn('# TYPE datacatalog_tag_manager_rpc_latency_seconds histogram', lines)
+        self.assertIn(
+            'datacatalog_tag_manager_rpc_latency_seconds_bucket{method="create_tag",le="0.1"} 0',
+            lines)
+        self.assertIn(
+            'datacatalog_tag_manager_rpc_latency_seconds_bucket{method="create_tag",le="0.25"} 1',
+            lines)
+        self.assertIn('datacatalog_tag_manager_rpc_latency_seconds_count{method="create_tag"} 1',
+                      lines)
+        self.assertTrue(
+            any(
+                line.startswith('datacatalog_tag_manager_stage_seconds{stage="process"} ')
+                for line in lines))
+
+    @mock.patch('datacatalog_tag_manager.run_metrics.os.replace', side_effect=OSError)
+    def test_write_json_failure_should_remove_temporary_file(self, mock_replace):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertRaises(OSError,
+                              run_metrics.RunMetrics().write_json,
+                              os.path.join(temp_dir, 'metrics.json'))
+            self.assertEqual([], os.listdir(temp_dir))
@@ -0,0 +1,110 @@
+from concurrent import futures
+import threading
+import unittest
+from unittest import mock
+
+from datacatalog_tag_manager import single_flight_cache
+
+
+class SingleFlightCacheTest(unittest.TestCase):
+
+    def test_constructor_negative_size_should_raise_value_error(self):
+        self.assertRaises(ValueError, single_flight_cache.SingleFlightCache, -1)
+
+    def test_get_should_load_missing_values_once(self):
+        cache = single_flight_cache.SingleFlightCache(2)
+        load = mock.MagicMock(side_effect=lambda key: f'value-{key}')
+
+        self.assertEqual('value-1', cache.get(1, load))
+        self.assertEqual('value-1', cache.get(1, load))
+
+        load.assert_called_once_with(1)
+        self.assertEqual({
+            'hits': 1,
+            'misses': 1,
+            'coalesced': 0,
+            'evictions': 0,
+            'size': 1
+        }, cache.get_stats())
+
+    def test_get_should_evict_least_recently_used_values(self):
+        cache = single_flight_cache.SingleFlightCache(2)
+        load = mock.MagicMock(side_effect=lambda key: f'value-{key}')
+
+        cache.get(1, load)
+        cache.get(2, load)
+        cache.get(1, load)
+        cache.get(3, load)
+        cache.get(1, load)
+        cache.get(2, load)
+
+        self.assertEqual([mock.call(1), mock.call(2),
+                          mock.call(3), mock.call(2)], load.call_args_list)
+        self.assertEqual(2, cache.get_stats()['evictions'])
+        self.assertEqual(2, cache.get_stats()['size'])
+
+    def test_get_zero_size_should_not_keep_values(self):
+        cache = single_flight_cache.SingleFlightCache(0)
+        load = mock.MagicMock()
+
+        cache.get(1, load)
+        cache.get(1, load)
+
+        self.assertEqual(2, load.call_count)
+        self.assertEqual(0, cache.get_stats()['size'])
+
+    def test_get_failure_should_not_be_cached(self):
+        cache = single_flight_cache.SingleFlightCache(2)
+        load = mock.MagicMock(side_effect=(ValueError, 'value-1'))
+
+        self.assertRaises(ValueError, cache.get, 1, load)
+        self.assertEqual('value-1', cache.get(1, load))
+        self.assertEqual(2, load.call_count)
+
+    def test_get_concurrent_misses_should_share_a_single_load(self):
+        cache = single_flight_cache.SingleFlightCache(2)
+        loading = threading.Event()
+        release = threading.Event()
+        load_count = 0
+
+        def load(key):
+            nonlocal load_count
+            load_count += 1
+            loading.set()
+            release.wait()
+            return f'value-{key}'
+
+        with futures.ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(cache.get, 1, load)
+            loading.wait()
+            others = [executor.submit(cache.get, 1, load) for _ in range(3)]
+            # Wait until all the other callers are blocked on the in-flight load.
+            while cache.get_stats()['coalesced'] < 3:
+                threading.Event().wait(0.001)
+            release.set()
+
+            results = [first.result()] + [other.result() for other in others]
+
+        self.assertEqual(1, load_count)
+        self.assertEqual(['value-1'] * 4, results)
+
+    def test_get_concurrent_misses_failure_should_propagate_to_all_callers(self):
+        cache = single_flight_cache.SingleFlightCache(2)
+        loading = threading.Event()
+        release = threading.Event()
+
+        def load(key):
+            loading.set()
+            release.wait()
+            raise ValueError
+
+        with futures.ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(cache.get, 1, load)
+            loading.wait()
+            other = executor.submit(cache.get, 1, load)
+            while cache.get_stats()['coalesced'] < 1:
+                threading.Event().wait(0.001)
+            release.set()
+
+            self.assertRaises(ValueError, first.result)
+            self.assertRaises(ValueError, other.result)
@@ -0,0 +1,146 @@
+import io
+import json
+import logging
+import sys
+import unittest
+from unittest import mock
+
+from datacatalog_tag_manager import structured_logging
+
+
+class EntryEventsTest(unittest.TestCase):
+
+    def tearDown(self):
+        structured_logging.EntryEvents.enable(False)
+
+    def test_record_not_aggregating_should_return_false(self):
+        self.assertFalse(structured_logging.EntryEvents.record('create_tag'))
+
+    def test_aggregate_disabled_should_not_aggregate(self):
+        with structured_logging.EntryEvents.aggregate('entry'):
+            self.assertFalse(structured_logging.EntryEvents.is_aggregating())
+            self.assertFalse(structured_logging.EntryEvents.record('create_tag'))
+
+    def test_aggregate_enabled_should_log_single_record(self):
+        structured_logging.EntryEvents.enable()
+
+        with self.assertLogs(level='INFO') as logs:
+            with structured_logging.EntryEvents.aggregate('entry'):
+                # Nested Entries are aggregated into the outer one.
+                with structured_logging.EntryEvents.aggregate('other-entry'):
+                    self.assertTrue(structured_logging.EntryEvents.record('create_tag'))
+                self.assertTrue(structured_logging.EntryEvents.record('create_tag'))
+                self.assertTrue(structured_logging.EntryEvents.record('list_tags'))
+
+            self.assertFalse(structured_logging.EntryEvents.is_aggregating())
+
+        self.assertEqual(['INFO:root:Entry processed: entry'], logs.output)
+        fields = logs.records[0].fields
+        self.assertEqual('entry', fields['entry'])
+        self.assertEqual({'create_tag': 2, 'list_tags': 1}, fields['events'])
+        self.assertGreaterEqual(fields['seconds'], 0)
+
+    def test_collect_should_add_events_to_entry_record(self):
+        structured_logging.EntryEvents.enable()
+
+        with self.assertLogs(level='INFO') as logs:
+            with structured_logging.EntryEvents.collect() as events:
+                self.assertTrue(structured_logging.EntryEvents.record('lookup_entry'))
+            with structured_logging.EntryEvents.aggregate('entry', events):
+                structured_logging.EntryEvents.record('create_tag')
+
+        self.assertEqual(['INFO:root:Entry processed: entry'], logs.output)
+        self.assertEqual({'lookup_entry': 1, 'create_tag': 1}, logs.records[0].fields['events'])
+
+    def test_collect_disabled_should_yield_none(self):
+        with structured_logging.EntryEvents.collect() as events:
+            self.assertFalse(structured_logging.EntryEvents.record('lookup_entry'))
+
+        self.assertIsNone(events)
+
+
+class JsonFormatterTest(unittest.TestCase):
+
+    def test_format_should_include_message_and_fields(self):
+        record = logging.LogRecord('root', logging.INFO, __file__, 1, 'Entry processed: %s',
+                                   ('entry', ), None)
+        record.created = 0
+        record.fields = {'entry': 'entry', 'events': {'create_tag': 1}}
+
+        document = json.loads(structured_logging.JsonFormatter().format(record))
+
+        self.assertEqual(
+            {
+                'time': '1970-01-01T00:00:00.000+00:00',
+                'level': 'INFO',
+                'logger': 'root',
+                'message': 'Entry processed: entry',
+                'entry': 'entry',
+                'events': {
+                    'create_tag': 1
+                }
+            }, document)
+
+    def test_format_should_include_exception(self):
+        try:
+            raise ValueError('invalid')
+        except ValueError:
+            record = logging.LogRecord('root', logging.ERROR, __file__, 1, 'Failed', None,
+                                       sys.exc_info())
+
+        document = json.loads(structured_logging.JsonFormatter().format(record))
+
+        self.assertIn('ValueError: invalid', document['exception'])
+
+    def test_format_should_strip_message_indentation(self):
+        record = logging.LogRecord('root', logging.INFO, __file__, 1, '%sFound!', ('     ', ),
+                                   None)
+
+        document = json.loads(structured_logging.JsonFormatter().format(record))
+
+        self.assertEqual('Found!', document['message'])
+
+
+class LoggingToQueueTest(unittest.TestCase):
+
+    @mock.patch('sys.stderr', new_callable=io.StringIO)
+    def test_text_format_should_write_basic_format(self, mock_stderr):
+        with structured_logging.logging_to_queue('info', 'text'):
+            logging.info('')
+            logging.info('Message: %s', 'value')
+            logging.debug('Debug message')
+
+        self.assertEqual('INFO:root:\nINFO:root:Message: value\n', mock_stderr.getvalue())
+
+    @mock.patch('sys.stderr', new_callable=io.StringIO)
+    def test_json_format_should_skip_decoration_and_aggregate_entries(self, mock_stderr):
+        with structured_logging.logging_to_queue('info', 'json'):
+            logging.info('')
+            logging.info('--------------------------------------------------')
+            with structured_logging.EntryEvents.aggregate('entry'):
+                structured_logging.EntryEvents.record('create_tag')
+            try:
+                raise ValueError('invalid')
+            except ValueError:
+                logging.exception('Failed')
+
+        self.assertFalse(structured_logging.EntryEvents.is_aggregating())
+        documents = [json.loads(line) for line in mock_stderr.getvalue().splitlines()]
+        self.assertEqual(2, len(documents))
+        self.assertEqual({'create_tag': 1}, documents[0]['events'])
+        self.assertEqual('Failed', documents[1]['message'])
+        self.assertIn('ValueError: invalid', documents[1]['exception'])
+
+    @mock.patch('sys.stderr', new_callable=io.StringIO)
+    def test_exit_should_restore_previous_configuration(self, mock_stderr):
+        root_logger = logging.getLogger()
+        previous_handlers, previous_level = root_logger.handlers[:], root_logger.level
+
+        with structured_logging.logging_to_queue('warning', 'json'):
+            self.assertEqual(logging.WARNING, root_logger.level)
+
+        self.assertEqual(previous_handlers, root_logger.handlers)
+        self.assertEqual(previous_level, root_logger.level)
+        # Entry events are aggregated only while logging in the JSON format.
+        with structured_logging.EntryEvents.aggregate('entry'):
+            self.assertFalse(structured_logging.EntryEvents.is_aggregating())
@@ -0,0 +1,143 @@
+import math
+import unittest
+
+from datacatalog_tag_manager import tag_datasource_partitioner
+
+
+class TagDatasourcePartitionerTest(unittest.TestCase):
+    __PARTITIONER = tag_datasource_partitioner.TagDatasourcePartitioner
+
+    def test_partition_should_build_hierarchy(self):
+        rows = [
+            ('entry-1', 'template-1', None, 'field-1', 'value-1'),
+            (None, None, None, 'field-2', 'value-2'),
+            (None, None, 'column-1', 'field-1', 'value-3'),
+            (None, 'template-2', math.nan, 'field-1', 'value-4'),
+        ]
+
+        entries = self.__PARTITIONER.partition(rows)
+
+        self.assertEqual(
+            {
+                'entry-1': {
+                    'template-1': {
+                        None: {
+                            'field-1': 'value-1',
+                            'field-2': 'value-2'
+                        },
+                        'column-1': {
+                            'field-1': 'value-3'
+                        }
+                    },
+                    'template-2': {
+                        None: {
+                            'field-1': 'value-4'
+                        }
+                    }
+                }
+            }, entries)
+
+    def test_partition_should_group_non_contiguous_entries(self):
+        rows = [
+            ('entry-1', 'template-1', None, 'field-1', 'value-1'),
+            ('entry-2', 'template-1', None, 'field-1', 'value-2'),
+            ('entry-1', 'template-1', None, 'field-2', 'value-3'),
+        ]
+
+        entries = self.__PARTITIONER.partition(rows)
+
+        self.assertEqual(['entry-1', 'entry-2'], list(entries))
+        self.assertEqual({
+            'field-1': 'value-1',
+            'field-2': 'value-3'
+        }, entries['entry-1']['template-1'][None])
+
+    def test_partition_should_skip_missing_fields(self):
+        rows = [
+            ('entry-1', 'template-1', 'column-1', math.nan, math.nan),
+            ('entry-1', 'template-1', None, 'field-1', math.nan),
+        ]
+
+        entries = self.__PARTITIONER.partition(rows)
+
+        self.assertEqual({'template-1': {'column-1': {}, None: {}}}, entries['entry-1'])
+
+    def test_partition_no_rows_should_return_empty_dict(self):
+        self.assertEqual({}, self.__PARTITIONER.partition([]))
+
+    def test_stream_partitions_should_yield_contiguous_groups(self):
+        rows = iter([
+            ('entry-1', 'template-1', None, 'field-1', 'value-1'),
+            (math.nan, math.nan, 'column-1', 'field-1', 'value-2'),
+            ('entry-2', 'template-1', None, 'field-1', 'value-3'),
+            ('entry-1', 'template-2', None, 'field-1', 'value-4'),
+        ])
+
+        partitions = list(self.__PARTITIONER.stream_partitions(rows))
+
+        self.assertEqual([
+            ('entry-1', {
+                'template-1': {
+                    None: {
+                        'field-1': 'value-1'
+                    },
+                    'column-1': {
+                        'field-1': 'value-2'
+                    }
+                }
+            }),
+            ('entry-2', {
+                'template-1': {
+                    None: {
+                        'field-1': 'value-3'
+                    }
+                }
+            }),
+            ('entry-1', {
+                'template-2': {
+                    None: {
+                        'field-1': 'value-4'
+                    }
+                }
+            }),
+        ], partitions)
+
+    def test_stream_partitions_no_rows_should_yield_nothing(self):
+        self.assertEqual([], list(self.__PARTITIONER.stream_partitions([])))
+
+    def test_stream_tags_should_group_contiguous_tags_and_merge_fields(self):
+        tags = [
+            ('entry-1', 'template-1', None, {
+                'field-1': 'value-1',
+                'field-2': math.nan
+            }),
+            ('entry-1', 'template-1', 'column-1', {
+                'field-1': 'value-2'
+            }),
+            ('entry-1', 'template-1', None, {
+                'field-3': 3.5,
+                'field-4': None
+            }),
+            ('entry-2', 'template-1', None, {}),
+        ]
+
+        partitions = list(self.__PARTITIONER.stream_tags(tags))
+
+        self.assertEqual([
+            ('entry-1', {
+                'template-1': {
+                    None: {
+                        'field-1': 'value-1',
+                        'field-3': 3.5
+                    },
+                    'column-1': {
+                        'field-1': 'value-2'
+                    }
+                }
+            }),
+            ('entry-2', {
+                'template-1': {
+                    None: {}
+                }
+            }),
+        ], partitions)
@@ -1,16 +1,23 @@
+import asyncio
 import math
+import os
+import tempfile
 import unittest
+import weakref
 from unittest import mock
 
 from google.api_core import exceptions
 from google.cloud import datacatalog
 from google.cloud.datacatalog import FieldType
 import pandas as pd
+import pyarrow
+from pyarrow import parquet
 
 import datacatalog_tag_manager
+from datacatalog_tag_manager import structured_logging, tag_operations_plan
 
 
-@mock.patch('datacatalog_tag_manager.tag_datasource_processor.pd.read_csv')
+@mock.patch('pandas.read_csv')
 class TagDatasourceProcessorTest(unittest.TestCase):
     # Pandas is not aware of the field types and reads empty values as NaN;
     # thus, math.nan is used in the mocked dataframes to set up more realistic testing scenarios.
@@ -21,11 +28,95 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         self.__tag_datasource_processor = datacatalog_tag_manager.TagDatasourceProcessor()
         # Shortcut for the object assigned to self.__tag_datasource_processor.__datacatalog_facade
         self.__datacatalog_facade = mock_datacatalog_facade.return_value
+        self.__datacatalog_facade.get_operation_counts.return_value = {}
+        # The CSV file is opened before being handed to the mocked pandas.read_csv().
+        csv_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
+        csv_file.close()
+        self.__csv_file_path = csv_file.name
+
+    def tearDown(self):
+        os.remove(self.__csv_file_path)
 
     def test_constructor_should_set_instance_attributes(self, mock_read_csv):
         self.assertIsNotNone(self.__tag_datasource_processor.
                              __dict__['_TagDatasourceProcessor__datacatalog_facade'])
 
+    @mock.patch(
+        'datacatalog_tag_manager.tag_datasource_processor.datacatalog_facade.DataCatalogFacade')
+    def test_constructor_cache_dir_should_set_facade_cache(self, mock_datacatalog_facade,
+                                                           mock_read_csv):
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with datacatalog_tag_manager.TagDatasourceProcessor(cache_dir=cache_dir):
+                pass
+
+        self.assertIsNotNone(mock_datacatalog_facade.call_args[1]['cache'])
+
+    @mock.patch(
+        'datacatalog_tag_manager.tag_datasource_processor.persistent_cache.PersistentCache')
+    @mock.patch(
+        'datacatalog_tag_manager.tag_datasource_processor.datacatalog_facade.DataCatalogFacade')
+    def test_exit_should_close_cache(self, mock_datacatalog_facade, mock_persistent_cache,
+                                     mock_read_csv):
+
+        with datacatalog_tag_manager.TagDatasourceProcessor(cache_dir='cache') as processor:
+            self.assertIsInstance(processor, datacatalog_tag_manager.TagDatasourceProcessor)
+            mock_persistent_cache.return_value.close.assert_not_called()
+
+        mock_persistent_cache.return_value.close.assert_called_once_with()
+
+    def test_close_no_cache_should_do_nothing(self, mock_read_csv):
+        self.__tag_datasource_processor.close()
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.retrying.RetryPolicy')
+    @mock.patch(
+        'datacatalog_tag_manager.tag_datasource_processor.datacatalog_facade.DataCatalogFacade')
+    def test_constructor_should_set_facade_retry_policy(self, mock_datacatalog_facade,
+                                                        mock_retry_policy, mock_read_csv):
+
+        datacatalog_tag_manager.TagDatasourceProcessor(max_attempts=3,
+                                                       retry_budget=10,
+                                                       initial_backoff=0.001)
+
+        mock_retry_policy.assert_called_once_with(max_attempts=3,
+                                                  initial_backoff=0.001,
+                                                  retry_budget=10)
+        self.assertEqual(mock_retry_policy.return_value,
+                         mock_datacatalog_facade.call_args[1]['retry_policy'])
+
+    def test_constructor_invalid_workers_should_raise_value_error(self, mock_read_csv):
+        self.assertRaises(ValueError, datacatalog_tag_manager.TagDatasourceProcessor, workers=0)
+
+    @mock.patch(
+        'datacatalog_tag_manager.tag_datasource_processor.datacatalog_facade.DataCatalogFacade')
+    def test_upsert_tags_from_csv_multiple_workers_should_keep_datasource_order(
+            self, mock_datacatalog_facade, mock_read_csv):
+
+        entries_count = 20
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name':
+                [f'entry-name-{index}' for index in range(entries_count)],
+                'template_name': ['test_template'] * entries_count,
+                'field_id': ['string_field'] * entries_count,
+                'field_value': [f'Test value {index}' for index in range(entries_count)]
+            })
+
+        datacatalog_facade = mock_datacatalog_facade.return_value
+        datacatalog_facade.get_operation_counts.return_value = {}
+        datacatalog_facade.get_entry.side_effect = lambda name: make_fake_entry(name)
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        upserted_tags = datacatalog_tag_manager.TagDatasourceProcessor(
+            workers=4).upsert_tags_from_csv(self.__csv_file_path)
+
+        self.assertEqual(entries_count, len(upserted_tags))
+        self.assertEqual(entries_count, datacatalog_facade.index_tags.call_count)
+        for index, upserted_tag in enumerate(upserted_tags):
+            self.assertEqual(f'Test value {index}',
+                             upserted_tag.fields['string_field'].string_value)
+
     def test_upsert_tags_from_csv_should_succeed(self, mock_read_csv):
         mock_read_csv.return_value = pd.DataFrame(
             data={
@@ -40,9 +131,10 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
         datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
 
-        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv('file-path')
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
 
         datacatalog_facade.delete_tag.assert_not_called()
+        datacatalog_facade.index_tags.assert_called_once()
         datacatalog_facade.upsert_tag.assert_called_once()
 
         self.assertEqual(1, len(upserted_tags))
@@ -51,6 +143,32 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         self.assertEqual('test_template', upserted_tag.template)
         self.assertEqual('Test value', upserted_tag.fields['string_field'].string_value)
 
+    def test_upsert_tags_from_csv_should_log_operations_summary(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['//bigquery.googleapis.com/resource-name'],
+                'template_name': ['test_template'],
+                'field_id': ['string_field'],
+                'field_value': ['Test value']
+            })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.lookup_entry.return_value = make_fake_entry()
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.get_operation_counts.side_effect = ({
+            'created': 1
+        }, {
+            'created': 2,
+            'unchanged': 3
+        })
+        datacatalog_facade.get_retry_stats.return_value = {'retries': 2, 'exhausted': 0}
+
+        with self.assertLogs(level='INFO') as logs:
+            self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
+
+        self.assertIn('INFO:root:Tags created: 1, updated: 0, unchanged: 3.', logs.output)
+        self.assertIn('INFO:root:API calls retries: 2, exhausted: 0.', logs.output)
+
     def test_upsert_tags_from_csv_missing_auto_fill_values_should_succeed(self, mock_read_csv):
         mock_read_csv.return_value = pd.DataFrame(
             data={
@@ -68,7 +186,7 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
         datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
 
-        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv('file-path')
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
         self.assertEqual(2, len(upserted_tags))
 
         upserted_tag_1 = upserted_tags[0]
@@ -95,7 +213,7 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
         datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
 
-        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv('file-path')
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
         self.assertEqual(1, len(upserted_tags))
 
         upserted_tag = upserted_tags[0]
@@ -120,7 +238,7 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
         datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
 
-        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv('file-path')
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
         self.assertEqual(2, len(upserted_tags))
 
         upserted_tag_1 = upserted_tags[0]  # Tags with no column information are created first.
@@ -133,6 +251,591 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         self.assertTrue(upserted_tag_2.fields['bool_field'].bool_value)
         self.assertFalse('string_field' in upserted_tag_2.fields)
 
+    def test_upsert_tags_from_csv_should_list_entry_tags_once(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name':
+                ['//bigquery.googleapis.com/resource-name', math.nan, math.nan],
+                'template_name': ['test_template', math.nan, math.nan],
+                'column': [math.nan, 'test_column_1', 'test_column_2'],
+                'field_id': ['string_field', 'string_field', 'string_field'],
+                'field_value': ['Test value', 'Test value 1', 'Test value 2']
+            })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.lookup_entry.return_value = make_fake_entry()
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
+        self.assertEqual(3, len(upserted_tags))
+
+        datacatalog_facade.index_tags.assert_called_once_with('test_entry')
+        entry_tags = datacatalog_facade.index_tags.return_value
+        for call_args in datacatalog_facade.upsert_tag.call_args_list:
+            self.assertIs(entry_tags, call_args[0][2])
+
+    def test_upsert_tags_from_csv_managed_templates_should_delete_stale_tags(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name':
+                ['//bigquery.googleapis.com/resource-name', math.nan],
+                'template_name': ['test_template', math.nan],
+                'column': [math.nan, 'test_column_1'],
+                'field_id': ['string_field', 'string_field'],
+                'field_value': ['Test value', 'Test value 1']
+            })
+
+        entry_tags = {
+            ('test_template', ''): make_fake_tag('test_template'),
+            ('test_template', 'test_column_1'): make_fake_tag('test_template', 'test_column_1'),
+            ('test_template', 'test_column_2'): make_fake_tag('test_template', 'test_column_2'),
+            ('unmanaged_template', ''): make_fake_tag('unmanaged_template'),
+        }
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_operation_counts.side_effect = ({}, {'created': 2, 'deleted': 1})
+        datacatalog_facade.lookup_entry.return_value = make_fake_entry()
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.index_tags.return_value = entry_tags
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+        datacatalog_facade.delete_tag.side_effect = lambda *args: args[1].column
+
+        with self.assertLogs(level='INFO') as logs:
+            results = self.__tag_datasource_processor.upsert_tags_from_csv(
+                self.__csv_file_path, managed_template_names=['test_template'])
+
+        self.assertEqual(3, len(results))
+        self.assertEqual('test_column_2', results[2])
+        datacatalog_facade.index_tags.assert_called_once_with('test_entry')
+        datacatalog_facade.delete_tag.assert_called_once_with(
+            'test_entry', entry_tags[('test_template', 'test_column_2')], entry_tags)
+        self.assertIn('INFO:root:Tags created: 2, updated: 0, unchanged: 0, deleted: 1.',
+                      logs.output)
+
+    def test_upsert_tags_from_csv_managed_templates_should_match_resolved_template_names(
+            self, mock_read_csv):
+
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['//bigquery.googleapis.com/resource-name'],
+                'template_name': ['test_template'],
+                'column': [math.nan],
+                'field_id': ['string_field'],
+                'field_value': ['Test value']
+            })
+
+        # Tags are indexed by the template names returned by the API.
+        template_name = 'projects/test-project/locations/us/tagTemplates/test_template'
+        tag_template = make_fake_tag_template()
+        tag_template.name = template_name
+        entry_tags = {
+            (template_name, ''): make_fake_tag(template_name),
+            (template_name, 'test_column'): make_fake_tag(template_name, 'test_column'),
+        }
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.lookup_entry.return_value = make_fake_entry()
+        datacatalog_facade.get_tag_template.return_value = tag_template
+        datacatalog_facade.index_tags.return_value = entry_tags
+
+        self.__tag_datasource_processor.upsert_tags_from_csv(
+            self.__csv_file_path, managed_template_names=[template_name])
+
+        datacatalog_facade.delete_tag.assert_called_once_with(
+            'test_entry', entry_tags[(template_name, 'test_column')], entry_tags)
+
+    def test_upsert_tags_from_csv_managed_templates_should_keep_invalid_tags(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['//bigquery.googleapis.com/resource-name'],
+                'template_name': ['test_template'],
+                'column': [math.nan],
+                'field_id': ['double_field'],
+                'field_value': ['not a number']
+            })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.lookup_entry.return_value = make_fake_entry()
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.index_tags.return_value = {
+            ('test_template', ''): make_fake_tag('test_template')
+        }
+
+        results = self.__tag_datasource_processor.upsert_tags_from_csv(
+            self.__csv_file_path, managed_template_names=['test_template'])
+
+        self.assertEqual([], results)
+        datacatalog_facade.delete_tag.assert_not_called()
+
+    def test_upsert_tags_from_csv_chunked_should_carry_state_across_chunks(self, mock_read_csv):
+        mock_read_csv.return_value = iter([
+            pd.DataFrame(
+                data={
+                    'linked_resource OR entry_name': ['entry-name-1', math.nan],
+                    'template_name': ['test_template', math.nan],
+                    'field_id': ['bool_field', 'string_field'],
+                    'field_value': ['true', 'Test value 1']
+                }),
+            pd.DataFrame(
+                data={
+                    'template_name': [math.nan, 'test_template'],
+                    'linked_resource OR entry_name': [math.nan, 'entry-name-2'],
+                    'column': ['test_column', math.nan],
+                    'field_id': ['string_field', 'string_field'],
+                    'field_value': ['Test value 2', 'Test value 3']
+                }),
+            pd.DataFrame(
+                data={
+                    'linked_resource OR entry_name': ['entry-name-3'],
+                    'template_name': ['test_template'],
+                    'field_id': ['string_field'],
+                    'field_value': ['Test value 4']
+                })
+        ])
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.side_effect = lambda name: make_fake_entry(name)
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path,
+                                                                             chunk_size=2)
+
+        mock_read_csv.assert_called_once_with(mock.ANY,
+                                              chunksize=2,
+                                              dtype=str,
+                                              keep_default_na=False,
+                                              na_values=[''])
+        self.assertEqual(3, datacatalog_facade.get_entry.call_count)
+        self.assertEqual(3, datacatalog_facade.index_tags.call_count)
+
+        self.assertEqual(4, len(upserted_tags))
+
+        entry_1_tag = upserted_tags[0]
+        self.assertEqual('test_template', entry_1_tag.template)
+        self.assertEqual('', entry_1_tag.column)
+        self.assertTrue(entry_1_tag.fields['bool_field'].bool_value)
+        self.assertEqual('Test value 1', entry_1_tag.fields['string_field'].string_value)
+
+        entry_1_column_tag = upserted_tags[1]
+        self.assertEqual('test_template', entry_1_column_tag.template)
+        self.assertEqual('test_column', entry_1_column_tag.column)
+        self.assertEqual('Test value 2', entry_1_column_tag.fields['string_field'].string_value)
+
+        self.assertEqual('Test value 3', upserted_tags[2].fields['string_field'].string_value)
+        self.assertEqual('Test value 4', upserted_tags[3].fields['string_field'].string_value)
+
+    @mock.patch(
+        'datacatalog_tag_manager.tag_datasource_processor.datacatalog_facade.DataCatalogFacade')
+    def test_delete_tags_from_csv_chunked_multiple_workers_should_succeed(
+            self, mock_datacatalog_facade, mock_read_csv):
+
+        mock_read_csv.return_value = (pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': [f'entry-name-{index}'],
+                'template_name': ['test_template']
+            }) for index in range(10))
+
+        datacatalog_facade = mock_datacatalog_facade.return_value
+        datacatalog_facade.get_operation_counts.return_value = {}
+        datacatalog_facade.get_entry.side_effect = lambda name: make_fake_entry(name)
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.delete_tag.side_effect = lambda *args: args[0]
+
+        deleted_tag_names = datacatalog_tag_manager.TagDatasourceProcessor(
+            workers=3).delete_tags_from_csv(self.__csv_file_path, chunk_size=1)
+
+        self.assertEqual([f'entry-name-{index}' for index in range(10)], deleted_tag_names)
+
+    def test_upsert_tags_from_csv_streaming_without_results_should_release_them(
+            self, mock_read_csv):
+
+        mock_read_csv.return_value = iter([
+            pd.DataFrame(
+                data={
+                    'linked_resource OR entry_name': [f'entry-name-{index}'],
+                    'template_name': ['test_template'],
+                    'field_id': ['string_field'],
+                    'field_value': ['Test value']
+                }) for index in range(3)
+        ])
+
+        live_results_counts = []
+        results_refs = []
+
+        def upsert_tag(*args):
+            # The results of the previously processed Entries should have been released.
+            live_results_counts.append(sum(1 for ref in results_refs if ref() is not None))
+            result = FakeResult()
+            results_refs.append(weakref.ref(result))
+            return result
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.side_effect = lambda name: make_fake_entry(name)
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = upsert_tag
+
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path,
+                                                                             chunk_size=1,
+                                                                             keep_results=False)
+
+        self.assertIsNone(upserted_tags)
+        self.assertEqual([0, 0, 0], live_results_counts)
+
+    def test_upsert_tags_from_csv_checkpoint_should_skip_completed_entries(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['entry-1', 'entry-2', 'entry-3'],
+                'template_name': ['test_template'] * 3,
+                'field_id': ['string_field'] * 3,
+                'field_value': ['Test value'] * 3
+            })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.side_effect = lambda name: make_fake_entry(name)
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        # Fail on the second Entry, as an interrupted run would.
+        datacatalog_facade.upsert_tag.side_effect = \
+            (lambda *args: args[1], exceptions.ResourceExhausted(message=''),
+             lambda *args: args[1])
+
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            checkpoint_file_path = os.path.join(checkpoint_dir, 'checkpoint.log')
+            self.assertRaises(exceptions.ResourceExhausted,
+                              self.__tag_datasource_processor.upsert_tags_from_csv,
+                              self.__csv_file_path,
+                              checkpoint_file_path=checkpoint_file_path)
+
+            datacatalog_facade.get_entry.reset_mock()
+            datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+            upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(
+                self.__csv_file_path, checkpoint_file_path=checkpoint_file_path)
+
+            with open(checkpoint_file_path) as checkpoint_file:
+                recorded_entries = checkpoint_file.read().splitlines()
+
+        self.assertEqual([mock.call('entry-2'), mock.call('entry-3')],
+                         datacatalog_facade.get_entry.call_args_list)
+        self.assertEqual(2, len(upserted_tags))
+        self.assertEqual(['entry-1', 'entry-2', 'entry-3'], recorded_entries)
+
+    def test_upsert_tags_from_csv_invalid_field_values_should_skip_and_report_tags(
+            self, mock_read_csv):
+
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['entry-1', 'entry-2', math.nan, 'entry-3'],
+                'template_name': ['test_template'] * 4,
+                'column': [math.nan, math.nan, 'test_column', math.nan],
+                'field_id': ['double_field'] * 4,
+                'field_value': ['2.5', 'invalid', '3.5', 'invalid']
+            })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.side_effect = lambda name: make_fake_entry(name)
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            checkpoint_file_path = os.path.join(checkpoint_dir, 'checkpoint.log')
+            with self.assertLogs(level='WARNING') as logs:
+                upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(
+                    self.__csv_file_path, checkpoint_file_path=checkpoint_file_path)
+
+            with open(checkpoint_file_path) as checkpoint_file:
+                recorded_entries = checkpoint_file.read().splitlines()
+
+        self.assertEqual(2, len(upserted_tags))
+        self.assertEqual(2.5, upserted_tags[0].fields['double_field'].double_value)
+        self.assertEqual('test_column', upserted_tags[1].column)
+        # Entries with invalid field values are processed again by the next run.
+        self.assertEqual(['entry-1'], recorded_entries)
+        self.assertEqual([
+            'WARNING:root:2 Tags were skipped due to invalid field values.',
+            'WARNING:root:entry-2: Invalid values for fields of the Tag Template test_template:'
+            ' double_field (invalid)',
+            'WARNING:root:entry-3: Invalid values for fields of the Tag Template test_template:'
+            ' double_field (invalid)',
+            'WARNING:root:2 Entries were not completed and will be processed again when the run'
+            ' is resumed.', 'WARNING:root:Incomplete Entry: entry-2',
+            'WARNING:root:Incomplete Entry: entry-3'
+        ], logs.output)
+
+    def test_upsert_tags_from_csv_checkpoint_should_not_record_unavailable_entries(
+            self, mock_read_csv):
+
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name':
+                ['entry-1', '//bigquery.googleapis.com/t2', 'entry-3', math.nan],
+                'template_name':
+                ['test_template', 'test_template', 'test_template', 'unreachable_template'],
+                'field_id': ['string_field'] * 4,
+                'field_value': ['Test value'] * 4
+            })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.side_effect = lambda name: make_fake_entry(name)
+        datacatalog_facade.lookup_entry.side_effect = exceptions.PermissionDenied(message='')
+
+        def get_tag_template(name):
+            if name != 'test_template':
+                raise exceptions.PermissionDenied(message='')
+            return make_fake_tag_template()
+
+        datacatalog_facade.get_tag_template.side_effect = get_tag_template
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            checkpoint_file_path = os.path.join(checkpoint_dir, 'checkpoint.log')
+            with self.assertLogs(level='WARNING') as logs:
+                upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(
+                    self.__csv_file_path, checkpoint_file_path=checkpoint_file_path)
+
+            with open(checkpoint_file_path) as checkpoint_file:
+                recorded_entries = checkpoint_file.read().splitlines()
+
+        self.assertEqual(2, len(upserted_tags))
+        # The Entry that was not found, and the one whose Tag Template was unavailable, are
+        # processed again by the next run.
+        self.assertEqual(['entry-1'], recorded_entries)
+        self.assertIn(
+            'WARNING:root:2 Entries were not completed and will be processed again when the run'
+            ' is resumed.', logs.output)
+        self.assertIn('WARNING:root:Incomplete Entry: //bigquery.googleapis.com/t2', logs.output)
+        self.assertIn('WARNING:root:Incomplete Entry: entry-3', logs.output)
+
+    @mock.patch('datacatalog_tag_manager.datacatalog_facade.datacatalog.DataCatalogClient')
+    def test_upsert_tags_from_csv_aggregating_events_should_log_single_record_per_entry(
+            self, mock_datacatalog_client, mock_read_csv):
+
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['//bigquery.googleapis.com/resource-name'],
+                'template_name': ['test_template'],
+                'field_id': ['string_field'],
+                'field_value': ['Test value']
+            })
+
+        datacatalog_client = mock_datacatalog_client.return_value
+        datacatalog_client.lookup_entry.return_value = make_fake_entry()
+        datacatalog_client.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_client.list_tags.return_value = []
+        datacatalog_client.create_tag.return_value = make_fake_tag('test_template')
+
+        structured_logging.EntryEvents.enable()
+        try:
+            with self.assertLogs(level='INFO') as logs:
+                datacatalog_tag_manager.TagDatasourceProcessor().upsert_tags_from_csv(
+                    self.__csv_file_path)
+        finally:
+            structured_logging.EntryEvents.enable(False)
+
+        messages = [record.getMessage() for record in logs.records]
+        self.assertIn('Resolving 1 Entries...', messages)
+        self.assertFalse(
+            [message for message in messages if 'LOOKUP' in message or 'Found' in message])
+
+        entry_records = [
+            record for record in logs.records if record.getMessage().startswith('Entry processed')
+        ]
+        self.assertEqual(1, len(entry_records))
+        self.assertEqual(
+            {
+                'lookup_entry': 1,
+                'get_tag_template': 1,
+                'list_tags': 1,
+                'create_tag': 1
+            }, entry_records[0].fields['events'])
+
+    def test_get_metrics_should_report_rows_skipped_tags_and_stages(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['entry-1', 'entry-2', 'entry-3', math.nan],
+                'template_name': ['test_template'] * 4,
+                'column': [math.nan, math.nan, math.nan, 'test_column'],
+                'field_id': ['double_field'] * 4,
+                'field_value': ['2.5', 'invalid', '3.5', '4.5']
+            })
+
+        def get_entry(name):
+            if name == 'entry-3':
+                raise exceptions.PermissionDenied(message='')
+            return make_fake_entry(name)
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.side_effect = get_entry
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+        datacatalog_facade.get_cache_stats.return_value = {'entry': {'hits': 2, 'misses': 3}}
+        datacatalog_facade.get_retry_stats.return_value = {'retries': 1}
+
+        with self.assertLogs(level='WARNING'):
+            self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
+
+        summary = self.__tag_datasource_processor.get_metrics().to_dict()
+        self.assertEqual({'rows_parsed': 4, 'tags_skipped': 3}, summary['counters'])
+        self.assertEqual({
+            'api_call_retries': 1,
+            'cache_entry_hits': 2,
+            'cache_entry_misses': 3
+        }, summary['gauges'])
+        self.assertEqual(['process', 'read', 'resolve_entries'], list(summary['stages']))
+
+    def test_upsert_tags_from_csv_should_resolve_entries_before_writing(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['entry-1', 'entry-2', 'entry-3', 'entry-1'],
+                'template_name': ['test_template'] * 4,
+                'field_id': ['string_field'] * 4,
+                'field_value': ['Test value'] * 4
+            })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.side_effect = \
+            lambda name: None if name == 'entry-2' else make_fake_entry(name)
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        with self.assertLogs(level='WARNING') as logs:
+            upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(
+                self.__csv_file_path)
+
+        called_methods = [
+            name for name, _, _ in datacatalog_facade.mock_calls
+            if name in ('get_entry', 'upsert_tag')
+        ]
+        self.assertEqual(['get_entry'] * 3 + ['upsert_tag'] * 2, called_methods)
+        self.assertEqual(2, len(upserted_tags))
+        self.assertEqual('WARNING:root:1 Entries could not be resolved.', logs.output[0])
+
+    def test_upsert_tags_from_csv_stdlib_reader_should_succeed(self, mock_read_csv):
+        csv_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
+        with csv_file:
+            csv_file.write('linked_resource OR entry_name,template_name,column,field_id,'
+                           'field_value\n'
+                           '//bigquery.googleapis.com/resource-name,test_template,,bool_field,'
+                           'true\n'
+                           ',,,string_field,\n'
+                           ',,test_column,string_field,Test value\n')
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.lookup_entry.return_value = make_fake_entry()
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        try:
+            upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(csv_file.name,
+                                                                                 csv_reader='csv')
+        finally:
+            os.remove(csv_file.name)
+
+        mock_read_csv.assert_not_called()
+        self.assertEqual(2, len(upserted_tags))
+
+        upserted_tag_1 = upserted_tags[0]
+        self.assertEqual('', upserted_tag_1.column)
+        self.assertTrue(upserted_tag_1.fields['bool_field'].bool_value)
+        self.assertFalse('string_field' in upserted_tag_1.fields)
+
+        upserted_tag_2 = upserted_tags[1]
+        self.assertEqual('test_column', upserted_tag_2.column)
+        self.assertEqual('Test value', upserted_tag_2.fields['string_field'].string_value)
+
+    def test_upsert_tags_from_jsonl_should_stream_entries(self, mock_read_csv):
+        jsonl_file = tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False)
+        with jsonl_file:
+            jsonl_file.write(
+                '{"entry_name": "entry-1", "template_name": "test_template",'
+                ' "fields": {"double_field": 2.5, "bool_field": true}}\n'
+                '{"entry_name": "entry-1", "template_name": "test_template",'
+                ' "column": "test_column", "fields": {"string_field": "Test value"}}\n'
+                '{"entry_name": "entry-2", "template_name": "test_template",'
+                ' "fields": {"string_field": "Test value"}}\n')
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.side_effect = lambda name: make_fake_entry(name)
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        try:
+            upserted_tags = self.__tag_datasource_processor.upsert_tags_from_jsonl(jsonl_file.name)
+        finally:
+            os.remove(jsonl_file.name)
+
+        mock_read_csv.assert_not_called()
+        self.assertEqual(3, len(upserted_tags))
+        self.assertEqual(2.5, upserted_tags[0].fields['double_field'].double_value)
+        self.assertTrue(upserted_tags[0].fields['bool_field'].bool_value)
+        self.assertEqual('test_column', upserted_tags[1].column)
+        # Tags of the same Entry share a single index.
+        self.assertEqual(2, datacatalog_facade.index_tags.call_count)
+
+    def test_delete_tags_from_jsonl_should_succeed(self, mock_read_csv):
+        jsonl_file = tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False)
+        with jsonl_file:
+            jsonl_file.write('{"linked_resource": "//bigquery.googleapis.com/resource-name",'
+                             ' "template_name": "test_template"}\n')
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.lookup_entry.return_value = make_fake_entry()
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.delete_tag.side_effect = lambda *args: args[0]
+
+        try:
+            deleted_tag_names = self.__tag_datasource_processor.delete_tags_from_jsonl(
+                jsonl_file.name)
+        finally:
+            os.remove(jsonl_file.name)
+
+        self.assertEqual(['test_entry'], deleted_tag_names)
+
+    def test_upsert_tags_from_parquet_should_keep_value_types(self, mock_read_csv):
+        table = pyarrow.table({
+            'linked_resource OR entry_name': ['entry-name', None],
+            'template_name': ['test_template', None],
+            'field_id': ['double_field', 'bool_field'],
+            'field_value': [2.5, None]
+        })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.return_value = make_fake_entry()
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        with tempfile.TemporaryDirectory() as parquet_dir:
+            parquet_file_path = os.path.join(parquet_dir, 'tags.parquet')
+            parquet.write_table(table, parquet_file_path)
+
+            upserted_tags = self.__tag_datasource_processor.upsert_tags_from_parquet(
+                parquet_file_path)
+
+        mock_read_csv.assert_not_called()
+        self.assertEqual(1, len(upserted_tags))
+        self.assertEqual(2.5, upserted_tags[0].fields['double_field'].double_value)
+        self.assertFalse('bool_field' in upserted_tags[0].fields)
+
+    def test_delete_tags_from_parquet_chunked_should_succeed(self, mock_read_csv):
+        table = pyarrow.table({
+            'linked_resource OR entry_name': ['entry-1', 'entry-2', 'entry-3'],
+            'template_name': ['test_template'] * 3
+        })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.side_effect = lambda name: make_fake_entry(name)
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.delete_tag.side_effect = lambda *args: args[0]
+
+        with tempfile.TemporaryDirectory() as parquet_dir:
+            parquet_file_path = os.path.join(parquet_dir, 'tags.parquet')
+            parquet.write_table(table, parquet_file_path)
+
+            deleted_tag_names = self.__tag_datasource_processor.delete_tags_from_parquet(
+                parquet_file_path, chunk_size=2)
+
+        self.assertEqual(['entry-1', 'entry-2', 'entry-3'], deleted_tag_names)
+
     def test_upsert_tags_from_csv_should_skip_nan_field_values(self, mock_read_csv):
         mock_read_csv.return_value = pd.DataFrame(
             data={
@@ -148,7 +851,7 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
         datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
 
-        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv('file-path')
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
         self.assertEqual(1, len(upserted_tags))
 
         upserted_tag = upserted_tags[0]
@@ -175,7 +878,7 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
         datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
 
-        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv('file-path')
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
         self.assertEqual(1, len(upserted_tags))
 
         upserted_tag = upserted_tags[0]
@@ -202,7 +905,7 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
         datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
 
-        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv('file-path')
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
         self.assertEqual(1, len(upserted_tags))
 
         upserted_tag = upserted_tags[0]
@@ -224,7 +927,7 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
         datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
 
-        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv('file-path')
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
         self.assertEqual(1, len(upserted_tags))
 
         upserted_tag = upserted_tags[0]
@@ -251,7 +954,7 @@ class TagDatasourceProcessorTest(unittest.TestCase):
             (exceptions.PermissionDenied(message=''), make_fake_tag_template())
         datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
 
-        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv('file-path')
+        upserted_tags = self.__tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path)
         self.assertEqual(1, len(upserted_tags))
 
         upserted_tag = upserted_tags[0]
@@ -271,7 +974,8 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
         datacatalog_facade.delete_tag.return_value = tag_name
 
-        deleted_tag_names = self.__tag_datasource_processor.delete_tags_from_csv('file-path')
+        deleted_tag_names = self.__tag_datasource_processor.delete_tags_from_csv(
+            self.__csv_file_path)
 
         datacatalog_facade.delete_tag.assert_called_once()
         datacatalog_facade.upsert_tag.assert_not_called()
@@ -281,10 +985,276 @@ class TagDatasourceProcessorTest(unittest.TestCase):
         deleted_tag_name = deleted_tag_names[0]
         self.assertEqual(tag_name, deleted_tag_name)
 
+    def test_plan_upsert_tags_from_csv_should_write_plan_file(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['//bigquery.googleapis.com/resource-name'],
+                'template_name': ['test_template'],
+                'column': ['test_column'],
+                'field_id': ['string_field'],
+                'field_value': ['Test value']
+            })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.lookup_entry.return_value = make_fake_entry()
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.plan_upsert_tag.side_effect = \
+            lambda *args: tag_operations_plan.TagOperation('create', *args[:2])
+
+        with tempfile.TemporaryDirectory() as plan_dir:
+            plan_file_path = os.path.join(plan_dir, 'plan.jsonl')
+            operations = self.__tag_datasource_processor.plan_upsert_tags_from_csv(
+                self.__csv_file_path, plan_file_path)
+            planned_operations = list(tag_operations_plan.TagOperationsPlan.read(plan_file_path))
+
+        datacatalog_facade.upsert_tag.assert_not_called()
+        datacatalog_facade.apply_tag_operation.assert_not_called()
+        self.assertEqual(operations, planned_operations)
+        self.assertEqual(1, len(planned_operations))
+        self.assertEqual('test_column', planned_operations[0].tag.column)
+
+    def test_plan_delete_tags_from_csv_should_skip_nonexistent_tags(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['//bigquery.googleapis.com/resource-name'],
+                'template_name': ['test_template']
+            })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.lookup_entry.return_value = make_fake_entry()
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.plan_delete_tag.return_value = None
+
+        with tempfile.TemporaryDirectory() as plan_dir:
+            plan_file_path = os.path.join(plan_dir, 'plan.jsonl')
+            operations = self.__tag_datasource_processor.plan_delete_tags_from_csv(
+                self.__csv_file_path, plan_file_path)
+            planned_operations = list(tag_operations_plan.TagOperationsPlan.read(plan_file_path))
+
+        datacatalog_facade.plan_delete_tag.assert_called_once()
+        datacatalog_facade.delete_tag.assert_not_called()
+        self.assertEqual([], operations)
+        self.assertEqual([], planned_operations)
+
+    @mock.patch(
+        'datacatalog_tag_manager.tag_datasource_processor.datacatalog_facade.DataCatalogFacade')
+    def test_apply_plan_should_apply_operations_without_reading(self, mock_datacatalog_facade,
+                                                                mock_read_csv):
+
+        operations = [
+            tag_operations_plan.TagOperation('create', f'entry-{index // 2}', datacatalog.Tag())
+            for index in range(6)
+        ]
+
+        datacatalog_facade = mock_datacatalog_facade.return_value
+        datacatalog_facade.get_operation_counts.return_value = {}
+        datacatalog_facade.apply_tag_operation.side_effect = \
+            lambda operation: operation.parent_entry_name
+
+        with tempfile.TemporaryDirectory() as plan_dir:
+            plan_file_path = os.path.join(plan_dir, 'plan.jsonl')
+            tag_operations_plan.TagOperationsPlan.write(plan_file_path, operations)
+            results = datacatalog_tag_manager.TagDatasourceProcessor(
+                workers=2).apply_plan(plan_file_path)
+
+        mock_read_csv.assert_not_called()
+        datacatalog_facade.get_entry.assert_not_called()
+        datacatalog_facade.get_tag_template.assert_not_called()
+        datacatalog_facade.index_tags.assert_not_called()
+        self.assertEqual([operation.parent_entry_name for operation in operations], results)
+
+    @mock.patch(
+        'datacatalog_tag_manager.tag_datasource_processor.datacatalog_facade.DataCatalogFacade')
+    def test_export_tags_to_csv_should_write_rows_that_upsert_same_tags(
+            self, mock_datacatalog_facade, mock_read_csv):
+
+        column_tag = datacatalog.Tag()
+        column_tag.template = 'test_template'
+        column_tag.column = 'test_column'
+        column_tag.fields['string_field'] = datacatalog.TagField(string_value='Test value')
+        column_tag.fields['bool_field'] = datacatalog.TagField(bool_value=True)
+        entry_tag = datacatalog.Tag()
+        entry_tag.template = 'test_template'
+        entry_tag.fields['double_field'] = datacatalog.TagField(double_value=2.5)
+
+        datacatalog_facade = mock_datacatalog_facade.return_value
+        datacatalog_facade.get_operation_counts.return_value = {}
+        datacatalog_facade.get_entry.side_effect = \
+            lambda name: None if name == 'entry-2' else make_fake_entry(name)
+        datacatalog_facade.index_tags.return_value = {
+            ('test_template', 'test_column'): column_tag,
+            ('test_template', ''): entry_tag
+        }
+        datacatalog_facade.get_tag_template.return_value = make_fake_tag_template()
+        datacatalog_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        tag_datasource_processor = datacatalog_tag_manager.TagDatasourceProcessor(workers=2)
+        with self.assertLogs(level='WARNING') as logs:
+            exported_tags_count = tag_datasource_processor.export_tags_to_csv(
+                ['entry-1', 'entry-2', 'entry-1'], self.__csv_file_path)
+
+        with open(self.__csv_file_path) as csv_file:
+            exported_rows = csv_file.read().splitlines()
+        upserted_tags = tag_datasource_processor.upsert_tags_from_csv(self.__csv_file_path,
+                                                                      csv_reader='csv')
+
+        self.assertEqual(2, exported_tags_count)
+        self.assertEqual([
+            'linked_resource OR entry_name,template_name,column,field_id,field_value',
+            'entry-1,test_template,,double_field,2.5',
+            'entry-1,test_template,test_column,bool_field,true',
+            'entry-1,test_template,test_column,string_field,Test value',
+        ], exported_rows)
+        self.assertEqual('WARNING:root:1 Entries could not be resolved.', logs.output[0])
+        self.assertEqual([entry_tag, column_tag], upserted_tags)
+
+    def test_export_tags_to_csv_tag_without_fields_should_write_single_row(self, mock_read_csv):
+        tag = datacatalog.Tag()
+        tag.template = 'test_template'
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.get_entry.return_value = make_fake_entry()
+        datacatalog_facade.index_tags.return_value = {('test_template', ''): tag}
+
+        self.__tag_datasource_processor.export_tags_to_csv(['test_entry'], self.__csv_file_path)
+
+        with open(self.__csv_file_path) as csv_file:
+            exported_rows = csv_file.read().splitlines()
+
+        self.assertEqual('test_entry,test_template,,,', exported_rows[1])
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.datacatalog_async_facade.'
+                'DataCatalogAsyncFacade')
+    def test_upsert_tags_from_csv_async_should_succeed(self, mock_async_facade, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name':
+                ['//bigquery.googleapis.com/resource-name-1', math.nan, 'entry-name-2', math.nan],
+                'template_name': ['test_template', math.nan, 'test_template', math.nan],
+                'column': [math.nan, 'test_column', math.nan, math.nan],
+                'field_id': ['bool_field', 'string_field', 'bool_field', 'string_field'],
+                'field_value': ['true', 'Test value 1', 'false', 'Test value 2']
+            })
+
+        async_facade = make_fake_async_facade(mock_async_facade)
+        async_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        upserted_tags = run_until_complete(
+            self.__tag_datasource_processor.upsert_tags_from_csv_async(self.__csv_file_path, 5))
+
+        mock_async_facade.assert_called_once_with(5)
+        async_facade.lookup_entry.assert_called_once()
+        async_facade.get_entry.assert_called_once()
+        self.assertEqual(2, async_facade.index_tags.call_count)
+        async_facade.delete_tag.assert_not_called()
+
+        self.assertEqual(3, len(upserted_tags))
+        self.assertTrue(upserted_tags[0].fields['bool_field'].bool_value)
+        self.assertEqual('test_column', upserted_tags[1].column)
+        self.assertFalse(upserted_tags[2].fields['bool_field'].bool_value)
+        self.assertEqual('Test value 2', upserted_tags[2].fields['string_field'].string_value)
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.datacatalog_async_facade.'
+                'DataCatalogAsyncFacade')
+    def test_upsert_tags_from_csv_async_permission_denied_should_skip_tag(
+            self, mock_async_facade, mock_read_csv):
+
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': [
+                    '//bigquery.googleapis.com/invalid-resource-name',
+                    '//bigquery.googleapis.com/unreachable-resource-name',
+                    'unreachable-entry-name', '//bigquery.googleapis.com/resource-name', math.nan
+                ],
+                'template_name':
+                [math.nan, math.nan, math.nan, 'unreachable_test_template', 'test_template'],
+                'field_id': [math.nan, math.nan, math.nan, math.nan, 'string_field'],
+                'field_value': [math.nan, math.nan, math.nan, math.nan, 'Test value']
+            })
+
+        async_facade = make_fake_async_facade(mock_async_facade)
+        async_facade.lookup_entry.side_effect = \
+            (exceptions.InvalidArgument(message=''), exceptions.PermissionDenied(message=''),
+             make_fake_entry())
+        async_facade.get_entry.side_effect = exceptions.PermissionDenied(message='')
+        async_facade.get_tag_template.side_effect = \
+            (exceptions.PermissionDenied(message=''), make_fake_tag_template())
+        async_facade.upsert_tag.side_effect = lambda *args: args[1]
+
+        upserted_tags = run_until_complete(
+            self.__tag_datasource_processor.upsert_tags_from_csv_async(self.__csv_file_path))
+
+        self.assertEqual(1, len(upserted_tags))
+
+        upserted_tag = upserted_tags[0]
+        self.assertEqual('test_template', upserted_tag.template)
+        self.assertEqual('Test value', upserted_tag.fields['string_field'].string_value)
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.datacatalog_async_facade.'
+                'DataCatalogAsyncFacade')
+    def test_delete_tags_from_csv_async_should_succeed(self, mock_async_facade, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'linked_resource OR entry_name': ['//bigquery.googleapis.com/resource-name'],
+                'template_name': ['unreachable_test_template']
+            })
 
-def make_fake_entry():
+        async_facade = make_fake_async_facade(mock_async_facade)
+        async_facade.get_tag_template.side_effect = exceptions.PermissionDenied(message='')
+
+        deleted_tag_names = run_until_complete(
+            self.__tag_datasource_processor.delete_tags_from_csv_async(self.__csv_file_path))
+
+        async_facade.index_tags.assert_not_called()
+        async_facade.delete_tag.assert_not_called()
+        self.assertEqual([], deleted_tag_names)
+
+
+class FakeResult:
+    # Unlike Tags, instances can be weakly referenced.
+    pass
+
+
+class CoroutineMock(mock.MagicMock):
+    """
+    Minimal replacement for ``mock.AsyncMock``, which requires Python 3.8+: calls are recorded
+    as usual and return a coroutine that returns the result or raises the side effect error.
+    """
+
+    def __call__(self, *args, **kwargs):
+        try:
+            result = super().__call__(*args, **kwargs)
+        except Exception as error:
+            return self.__raise(error)
+        return self.__return(result)
+
+    def _get_child_mock(self, **kwargs):
+        # Attributes and return values are regular, synchronous mocks.
+        return mock.MagicMock(**kwargs)
+
+    @classmethod
+    async def __raise(cls, error):
+        raise error
+
+    @classmethod
+    async def __return(cls, result):
+        return result
+
+
+def run_until_complete(coroutine):
+    # Same as asyncio.run(), which requires Python 3.7+.
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def make_fake_entry(name='test_entry'):
     entry = datacatalog.Entry()
-    entry.name = 'test_entry'
+    entry.name = name
 
     return entry
 
@@ -294,14 +1264,40 @@ def make_fake_tag_template():
     tag_template.name = 'test_template'
     tag_template.fields['bool_field'] = \
         make_primitive_type_template_field(datacatalog.FieldType.PrimitiveType.BOOL)
+    tag_template.fields['double_field'] = \
+        make_primitive_type_template_field(datacatalog.FieldType.PrimitiveType.DOUBLE)
     tag_template.fields['string_field'] = \
         make_primitive_type_template_field(datacatalog.FieldType.PrimitiveType.STRING)
 
     return tag_template
 
 
+def make_fake_tag(template_name, column=None):
+    tag = datacatalog.Tag()
+    tag.template = template_name
+    if column:
+        tag.column = column
+
+    return tag
+
+
 def make_primitive_type_template_field(primitive_type: FieldType.PrimitiveType):
     field = datacatalog.TagTemplateField()
     field.type_.primitive_type = primitive_type
 
     return field
+
+
+def make_fake_async_facade(mock_async_facade):
+    async_facade = mock_async_facade.return_value
+    for method_name in ('delete_tag', 'get_entry', 'get_tag_template', 'index_tags',
+                        'lookup_entry', 'upsert_tag'):
+        setattr(async_facade, method_name, CoroutineMock())
+
+    async_facade.get_entry.return_value = make_fake_entry()
+    async_facade.get_tag_template.return_value = make_fake_tag_template()
+    async_facade.index_tags.return_value = {}
+    async_facade.lookup_entry.return_value = make_fake_entry()
+    async_facade.get_operation_counts.return_value = {}
+
+    return async_facade
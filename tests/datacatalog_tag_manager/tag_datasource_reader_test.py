@@ -0,0 +1,211 @@
+import bz2
+import gzip
+import io
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pyarrow
+from pyarrow import parquet
+import zstandard
+
+from datacatalog_tag_manager import tag_datasource_reader
+
+
+class TagDatasourceReaderTest(unittest.TestCase):
+    __READER = tag_datasource_reader.TagDatasourceReader
+
+    def setUp(self):
+        csv_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
+        with csv_file:
+            csv_file.write('field_id,template_name,field_value,linked_resource OR entry_name\n'
+                           'string_field,test_template,Test value,entry-name\n'
+                           '\n'
+                           'bool_field,,,\n')
+        self.__csv_file_path = csv_file.name
+
+    def tearDown(self):
+        os.remove(self.__csv_file_path)
+
+    def test_get_default_csv_reader_should_prefer_pandas(self):
+        self.assertEqual('pandas', self.__READER.get_default_csv_reader())
+
+    def test_read_csv_stdlib_should_reorder_columns(self):
+        rows = list(self.__READER.read_csv(self.__csv_file_path, 'csv'))
+
+        self.assertEqual([
+            ('entry-name', 'test_template', None, 'string_field', 'Test value'),
+            (None, None, None, 'bool_field', None),
+        ], rows)
+
+    def test_read_csv_pandas_should_reorder_columns(self):
+        rows = list(self.__READER.read_csv(self.__csv_file_path, 'pandas'))
+
+        self.assertEqual(2, len(rows))
+        self.assertEqual(('entry-name', 'test_template'), rows[0][:2])
+        self.assertTrue(math.isnan(rows[0][2]))
+        self.assertEqual(('string_field', 'Test value'), rows[0][3:])
+        self.assertEqual('bool_field', rows[1][3])
+
+    def test_read_csv_pandas_chunked_should_read_all_rows(self):
+        rows = list(self.__READER.read_csv(self.__csv_file_path, 'pandas', chunk_size=1))
+        self.assertEqual(2, len(rows))
+
+    def test_read_csv_pandas_chunked_should_read_same_values_as_whole(self):
+        with open(self.__csv_file_path, 'w') as csv_file:
+            csv_file.write('linked_resource OR entry_name,field_id,field_value\n'
+                           'entry-name,string_field,123\n'
+                           ',double_field,2.5\n'
+                           ',string_field,Test value\n'
+                           ',bool_field,true\n')
+
+        rows = list(self.__READER.read_csv(self.__csv_file_path, 'pandas'))
+        chunked_rows = list(self.__READER.read_csv(self.__csv_file_path, 'pandas', chunk_size=2))
+
+        # The first chunk has numeric values only.
+        self.assertEqual(['123', '2.5', 'Test value', 'true'], [row[4] for row in chunked_rows])
+        self.assertEqual([row[4] for row in rows], [row[4] for row in chunked_rows])
+
+    def test_read_csv_pandas_should_read_na_like_values_as_stdlib(self):
+        with open(self.__csv_file_path, 'w') as csv_file:
+            csv_file.write('linked_resource OR entry_name,field_id,field_value\n'
+                           'entry-name,string_field,NA\n'
+                           ',string_field,null\n'
+                           ',string_field,N/A\n'
+                           ',string_field,nan\n'
+                           ',string_field,None\n')
+
+        rows = list(self.__READER.read_csv(self.__csv_file_path, 'csv'))
+        pandas_rows = list(self.__READER.read_csv(self.__csv_file_path, 'pandas'))
+        chunked_rows = list(self.__READER.read_csv(self.__csv_file_path, 'pandas', chunk_size=2))
+
+        self.assertEqual(['NA', 'null', 'N/A', 'nan', 'None'], [row[4] for row in rows])
+        # Empty values are None for the stdlib reader and NaN for pandas.
+        for other_rows in (pandas_rows, chunked_rows):
+            self.assertEqual([[value for value in row if isinstance(value, str)] for row in rows],
+                             [[value for value in row if isinstance(value, str)]
+                              for row in other_rows])
+
+    def test_read_csv_empty_file_should_yield_nothing(self):
+        with open(self.__csv_file_path, 'w'):
+            pass
+
+        self.assertEqual([], list(self.__READER.read_csv(self.__csv_file_path, 'csv')))
+
+    def test_read_csv_unknown_reader_should_raise_value_error(self):
+        self.assertRaises(ValueError, self.__READER.read_csv, self.__csv_file_path, 'unknown')
+
+    def test_read_csv_compressed_should_decompress_on_the_fly(self):
+        with open(self.__csv_file_path, 'rb') as csv_file:
+            content = csv_file.read()
+
+        compressors = (gzip.compress, bz2.compress, zstandard.ZstdCompressor().compress)
+        for compress in compressors:
+            with open(self.__csv_file_path, 'wb') as csv_file:
+                csv_file.write(compress(content))
+
+            for reader in ('csv', 'pandas'):
+                rows = list(self.__READER.read_csv(self.__csv_file_path, reader))
+                self.assertEqual(2, len(rows))
+                self.assertEqual('Test value', rows[0][4])
+
+    def test_read_csv_stdin_should_read_standard_input_and_leave_it_open(self):
+        with open(self.__csv_file_path, 'rb') as csv_file:
+            stdin_buffer = io.BytesIO(gzip.compress(csv_file.read()))
+
+        with mock.patch('sys.stdin') as mock_stdin:
+            mock_stdin.buffer = stdin_buffer
+            rows = list(self.__READER.read_csv('-', 'csv'))
+
+        self.assertEqual(2, len(rows))
+        self.assertFalse(stdin_buffer.closed)
+
+    def test_read_jsonl_should_yield_tags(self):
+        with open(self.__csv_file_path, 'w') as jsonl_file:
+            jsonl_file.write(
+                '{"linked_resource": "//resource-link", "template_name": "test_template",'
+                ' "fields": {"double_field": 2.5, "bool_field": true}}\n'
+                '\n'
+                '{"entry_name": "entry-name", "template_name": "test_template",'
+                ' "column": "test_column"}\n')
+
+        tags = list(self.__READER.read_jsonl(self.__csv_file_path))
+
+        self.assertEqual([
+            ('//resource-link', 'test_template', None, {
+                'double_field': 2.5,
+                'bool_field': True
+            }),
+            ('entry-name', 'test_template', 'test_column', {}),
+        ], tags)
+
+    def test_read_jsonl_invalid_tag_should_raise_value_error_with_line_number(self):
+        with open(self.__csv_file_path, 'w') as jsonl_file:
+            jsonl_file.write('{"entry_name": "entry-name", "template_name": "test_template"}\n'
+                             '{"entry_name": "entry-name"}\n')
+
+        tags = self.__READER.read_jsonl(self.__csv_file_path)
+
+        self.assertEqual('entry-name', next(tags)[0])
+        with self.assertRaisesRegex(ValueError, 'line 2'):
+            next(tags)
+
+    def test_read_jsonl_invalid_fields_should_raise_value_error(self):
+        with open(self.__csv_file_path, 'w') as jsonl_file:
+            jsonl_file.write('{"entry_name": "entry-name", "template_name": "test_template",'
+                             ' "fields": ["field"]}\n')
+
+        self.assertRaises(ValueError, list, self.__READER.read_jsonl(self.__csv_file_path))
+
+    def test_read_names_or_resources_should_skip_blank_lines(self):
+        with open(self.__csv_file_path, 'w') as names_file:
+            names_file.write('entry-name\n\n  //resource-link  \n')
+
+        self.assertEqual(['entry-name', '//resource-link'],
+                         list(self.__READER.read_names_or_resources(self.__csv_file_path)))
+
+    def test_read_parquet_should_project_and_reorder_columns(self):
+        table = pyarrow.table({
+            'field_id': ['string_field', 'double_field', 'bool_field'],
+            'ignored_column': [1, 2, 3],
+            'template_name': ['test_template', None, None],
+            'field_value': ['Test value', None, None],
+            'linked_resource OR entry_name': ['entry-name', None, None]
+        })
+
+        with tempfile.TemporaryDirectory() as parquet_dir:
+            parquet_file_path = os.path.join(parquet_dir, 'tags.parquet')
+            parquet.write_table(table, parquet_file_path)
+
+            rows = list(self.__READER.read_parquet(parquet_file_path))
+
+        self.assertEqual([
+            ('entry-name', 'test_template', None, 'string_field', 'Test value'),
+            (None, None, None, 'double_field', None),
+            (None, None, None, 'bool_field', None),
+        ], rows)
+
+    def test_read_parquet_batched_should_keep_value_types(self):
+        table = pyarrow.table({
+            'linked_resource OR entry_name': ['entry-name'] * 3,
+            'template_name': ['test_template'] * 3,
+            'column': [None, 'test_column', 'test_column'],
+            'field_id': ['double_field'] * 3,
+            'field_value': [2.5, None, 3.5]
+        })
+
+        with tempfile.TemporaryDirectory() as parquet_dir:
+            parquet_file_path = os.path.join(parquet_dir, 'tags.parquet')
+            parquet.write_table(table, parquet_file_path, row_group_size=2)
+
+            rows = list(self.__READER.read_parquet(parquet_file_path, batch_size=2))
+
+        self.assertEqual([
+            ('entry-name', 'test_template', None, 'double_field', 2.5),
+            ('entry-name', 'test_template', 'test_column', 'double_field', None),
+            ('entry-name', 'test_template', 'test_column', 'double_field', 3.5),
+        ], rows)
+        # Dictionary-encoded strings are decoded only once per distinct value and batch.
+        self.assertIs(rows[0][0], rows[1][0])
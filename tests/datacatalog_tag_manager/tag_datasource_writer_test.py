@@ -0,0 +1,37 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from datacatalog_tag_manager import tag_datasource_reader, tag_datasource_writer
+
+
+class TagDatasourceWriterTest(unittest.TestCase):
+    __WRITER = tag_datasource_writer.TagDatasourceWriter
+
+    def test_write_csv_should_write_rows_readable_by_reader(self):
+        rows = [
+            ('entry-name', 'test_template', None, 'string_field', 'Test value, with comma'),
+            ('entry-name', 'test_template', 'test_column', None, None),
+        ]
+
+        with tempfile.TemporaryDirectory() as csv_dir:
+            csv_file_path = os.path.join(csv_dir, 'tags.csv')
+            rows_count = self.__WRITER.write_csv(csv_file_path, iter(rows))
+            read_rows = list(
+                tag_datasource_reader.TagDatasourceReader.read_csv(csv_file_path, 'csv'))
+
+        self.assertEqual(2, rows_count)
+        self.assertEqual(rows, read_rows)
+
+    def test_write_csv_stdout_should_write_to_standard_output(self):
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            rows_count = self.__WRITER.write_csv(
+                '-', [('entry-name', 'test_template', None, 'string_field', 'Test value')])
+
+        self.assertEqual(1, rows_count)
+        self.assertEqual(
+            'linked_resource OR entry_name,template_name,column,field_id,field_value\r\n'
+            'entry-name,test_template,,string_field,Test value\r\n', mock_stdout.getvalue())
+        self.assertFalse(mock_stdout.closed)
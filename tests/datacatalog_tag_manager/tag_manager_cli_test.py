@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 import unittest
 from unittest import mock
 
@@ -11,6 +14,7 @@ class TagManagerCLITest(unittest.TestCase):
 
     @mock.patch(f'{__CLI_CLASS}._parse_args')
     def test_run_should_parse_args(self, mock_parse_args):
+        set_up_logging_args(mock_parse_args.return_value)
         tag_manager_cli.TagManagerCLI.run([])
         mock_parse_args.assert_called_once()
 
@@ -18,6 +22,7 @@ class TagManagerCLITest(unittest.TestCase):
     @mock.patch(f'{__CLI_CLASS}._parse_args')
     def test_run_upsert_should_call_upsert_tags(self, mock_parse_args, mock_upsert_tags):
         mock_parse_args.return_value.func = mock_upsert_tags
+        set_up_logging_args(mock_parse_args.return_value)
         tag_manager_cli.TagManagerCLI.run([])
         mock_upsert_tags.assert_called_once_with(mock_parse_args.return_value)
 
@@ -25,6 +30,7 @@ class TagManagerCLITest(unittest.TestCase):
     @mock.patch(f'{__CLI_CLASS}._parse_args')
     def test_run_delete_should_call_delete_tags(self, mock_parse_args, mock_delete_tags):
         mock_parse_args.return_value.func = mock_delete_tags
+        set_up_logging_args(mock_parse_args.return_value)
         tag_manager_cli.TagManagerCLI.run([])
         mock_delete_tags.assert_called_once_with(mock_parse_args.return_value)
 
@@ -41,6 +47,40 @@ class TagManagerCLITest(unittest.TestCase):
     def test_parse_args_upsert_should_parse_mandatory_args(self):
         args = tag_manager_cli.TagManagerCLI._parse_args(['upsert', '--csv-file', 'test.csv'])
         self.assertEqual('test.csv', args.csv_file)
+        self.assertEqual(1, args.workers)
+        self.assertIsNone(args.chunk_size)
+        self.assertIsNone(args.csv_reader)
+
+    def test_parse_args_upsert_should_parse_optional_args(self):
+        args = tag_manager_cli.TagManagerCLI._parse_args([
+            'upsert', '--csv-file', 'test.csv', '--workers', '8', '--chunk-size', '1000',
+            '--csv-reader', 'csv'
+        ])
+        self.assertEqual(8, args.workers)
+        self.assertEqual(1000, args.chunk_size)
+        self.assertEqual('csv', args.csv_reader)
+
+    def test_parse_args_should_parse_logging_args(self):
+        args = tag_manager_cli.TagManagerCLI._parse_args(['upsert', '--csv-file', 'test.csv'])
+        self.assertEqual('info', args.log_level)
+        self.assertEqual('text', args.log_format)
+
+        args = tag_manager_cli.TagManagerCLI._parse_args(
+            ['--log-level', 'debug', '--log-format', 'json', 'upsert', '--csv-file', 'test.csv'])
+        self.assertEqual('debug', args.log_level)
+        self.assertEqual('json', args.log_format)
+
+    def test_parse_args_invalid_log_format_should_raise_system_exit(self):
+        self.assertRaises(SystemExit, tag_manager_cli.TagManagerCLI._parse_args,
+                          ['--log-format', 'xml', 'upsert', '--csv-file', 'test.csv'])
+
+    def test_parse_args_upsert_invalid_rate_should_raise_system_exit(self):
+        self.assertRaises(SystemExit, tag_manager_cli.TagManagerCLI._parse_args,
+                          ['upsert', '--csv-file', 'test.csv', '--max-reads-per-minute', '0'])
+
+    def test_parse_args_upsert_invalid_workers_should_raise_system_exit(self):
+        self.assertRaises(SystemExit, tag_manager_cli.TagManagerCLI._parse_args,
+                          ['upsert', '--csv-file', 'test.csv', '--workers', '0'])
 
     @mock.patch(f'{__CLI_CLASS}._TagManagerCLI__upsert_tags')
     def test_parse_args_upsert_should_set_default_function(self, mock_upsert_tags):
@@ -53,27 +93,275 @@ class TagManagerCLITest(unittest.TestCase):
     def test_parse_args_delete_should_parse_mandatory_args(self):
         args = tag_manager_cli.TagManagerCLI._parse_args(['delete', '--csv-file', 'test.csv'])
         self.assertEqual('test.csv', args.csv_file)
+        self.assertEqual(1, args.workers)
+        self.assertIsNone(args.chunk_size)
+        self.assertIsNone(args.csv_reader)
+
+    def test_parse_args_delete_should_parse_optional_args(self):
+        args = tag_manager_cli.TagManagerCLI._parse_args([
+            'delete', '--csv-file', 'test.csv', '--workers', '8', '--chunk-size', '1000',
+            '--csv-reader', 'csv'
+        ])
+        self.assertEqual(8, args.workers)
+        self.assertEqual(1000, args.chunk_size)
+        self.assertEqual('csv', args.csv_reader)
 
     @mock.patch(f'{__CLI_CLASS}._TagManagerCLI__delete_tags')
     def test_parse_args_delete_should_set_default_function(self, mock_delete_tags):
         args = tag_manager_cli.TagManagerCLI._parse_args(['delete', '--csv-file', 'test.csv'])
         self.assertEqual(mock_delete_tags, args.func)
 
-    @mock.patch(f'{__CLI_MODULE}.tag_datasource_processor.TagDatasourceProcessor')
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
     def test_upsert_tags_should_upsert_tags_from_csv(self, mock_tag_datasource_processor):
         tag_manager_cli.TagManagerCLI.run(['upsert', '--csv-file', 'test.csv'])
-        mock_tag_datasource_processor.assert_called_with()
+        mock_tag_datasource_processor.assert_called_with(workers=1,
+                                                         cache_dir=None,
+                                                         cache_ttls={},
+                                                         reads_per_minute=None,
+                                                         writes_per_minute=None,
+                                                         max_attempts=5,
+                                                         retry_budget=None)
         mock_tag_datasource_processor.return_value.upsert_tags_from_csv.assert_called_with(
-            file_path='test.csv')
+            file_path='test.csv',
+            chunk_size=None,
+            csv_reader=None,
+            checkpoint_file_path=None,
+            managed_template_names=None,
+            keep_results=False)
 
-    @mock.patch(f'{__CLI_MODULE}.tag_datasource_processor.TagDatasourceProcessor')
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
     def test_delete_tags_should_delete_tags_from_csv(self, mock_tag_datasource_processor):
         tag_manager_cli.TagManagerCLI.run(['delete', '--csv-file', 'test.csv'])
-        mock_tag_datasource_processor.assert_called_with()
+        mock_tag_datasource_processor.assert_called_with(workers=1,
+                                                         cache_dir=None,
+                                                         cache_ttls={},
+                                                         reads_per_minute=None,
+                                                         writes_per_minute=None,
+                                                         max_attempts=5,
+                                                         retry_budget=None)
         mock_tag_datasource_processor.return_value.delete_tags_from_csv.assert_called_with(
-            file_path='test.csv')
+            file_path='test.csv',
+            chunk_size=None,
+            csv_reader=None,
+            checkpoint_file_path=None,
+            keep_results=False)
+
+    def test_parse_args_upsert_csv_and_parquet_files_should_raise_system_exit(self):
+        self.assertRaises(SystemExit, tag_manager_cli.TagManagerCLI._parse_args,
+                          ['upsert', '--csv-file', 'test.csv', '--parquet-file', 'test.parquet'])
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_upsert_tags_should_upsert_tags_from_jsonl(self, mock_tag_datasource_processor):
+        tag_manager_cli.TagManagerCLI.run(
+            ['upsert', '--jsonl-file', 'test.jsonl', '--checkpoint-file', 'checkpoint.log'])
+        processor = mock_tag_datasource_processor.return_value
+        processor.upsert_tags_from_jsonl.assert_called_with(file_path='test.jsonl',
+                                                            checkpoint_file_path='checkpoint.log',
+                                                            managed_template_names=None,
+                                                            keep_results=False)
+        processor.upsert_tags_from_csv.assert_not_called()
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_delete_tags_should_delete_tags_from_jsonl(self, mock_tag_datasource_processor):
+        tag_manager_cli.TagManagerCLI.run(['delete', '--jsonl-file', 'test.jsonl'])
+        processor = mock_tag_datasource_processor.return_value
+        processor.delete_tags_from_jsonl.assert_called_with(file_path='test.jsonl',
+                                                            checkpoint_file_path=None,
+                                                            keep_results=False)
+        processor.delete_tags_from_csv.assert_not_called()
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_upsert_tags_should_upsert_tags_from_parquet(self, mock_tag_datasource_processor):
+        tag_manager_cli.TagManagerCLI.run(
+            ['upsert', '--parquet-file', 'test.parquet', '--chunk-size', '1000'])
+        processor = mock_tag_datasource_processor.return_value
+        processor.upsert_tags_from_parquet.assert_called_with(file_path='test.parquet',
+                                                              chunk_size=1000,
+                                                              checkpoint_file_path=None,
+                                                              managed_template_names=None,
+                                                              keep_results=False)
+        processor.upsert_tags_from_csv.assert_not_called()
+
+    def test_parse_args_sync_missing_managed_template_should_raise_system_exit(self):
+        self.assertRaises(SystemExit, tag_manager_cli.TagManagerCLI._parse_args,
+                          ['sync', '--csv-file', 'test.csv'])
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_sync_tags_should_upsert_tags_with_managed_templates(self,
+                                                                 mock_tag_datasource_processor):
+        tag_manager_cli.TagManagerCLI.run([
+            'sync', '--jsonl-file', 'test.jsonl', '--managed-template', 'template-1',
+            '--managed-template', 'template-2'
+        ])
+        processor = mock_tag_datasource_processor.return_value
+        processor.upsert_tags_from_jsonl.assert_called_with(
+            file_path='test.jsonl',
+            checkpoint_file_path=None,
+            managed_template_names=['template-1', 'template-2'],
+            keep_results=False)
+        processor.delete_tags_from_jsonl.assert_not_called()
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_delete_tags_should_delete_tags_from_parquet(self, mock_tag_datasource_processor):
+        tag_manager_cli.TagManagerCLI.run(['delete', '--parquet-file', 'test.parquet'])
+        processor = mock_tag_datasource_processor.return_value
+        processor.delete_tags_from_parquet.assert_called_with(file_path='test.parquet',
+                                                              chunk_size=None,
+                                                              checkpoint_file_path=None,
+                                                              keep_results=False)
+        processor.delete_tags_from_csv.assert_not_called()
+
+    def test_parse_args_upsert_should_parse_checkpoint_file(self):
+        args = tag_manager_cli.TagManagerCLI._parse_args(
+            ['upsert', '--csv-file', 'test.csv', '--checkpoint-file', 'checkpoint.log'])
+        self.assertEqual('checkpoint.log', args.checkpoint_file)
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_upsert_tags_cache_args_should_set_processor_cache(self,
+                                                               mock_tag_datasource_processor):
+        tag_manager_cli.TagManagerCLI.run([
+            'upsert', '--csv-file', 'test.csv', '--cache-dir', 'cache', '--cache-entry-ttl', '60',
+            '--cache-tag-template-ttl', '0'
+        ])
+        mock_tag_datasource_processor.assert_called_with(workers=1,
+                                                         cache_dir='cache',
+                                                         cache_ttls={
+                                                             'entry': 60,
+                                                             'entry_lookup': 60,
+                                                             'tag_template': 0
+                                                         },
+                                                         reads_per_minute=None,
+                                                         writes_per_minute=None,
+                                                         max_attempts=5,
+                                                         retry_budget=None)
+
+    @mock.patch('datacatalog_tag_manager.persistent_cache.PersistentCache')
+    def test_clear_cache_should_invalidate_cache(self, mock_persistent_cache):
+        tag_manager_cli.TagManagerCLI.run(
+            ['clear-cache', '--cache-dir', 'cache', '--kind', 'entry'])
+        mock_persistent_cache.assert_called_once_with('cache')
+        mock_persistent_cache.return_value.invalidate.assert_called_once_with(kind='entry')
+
+    def test_parse_args_plan_should_parse_args(self):
+        args = tag_manager_cli.TagManagerCLI._parse_args(
+            ['plan', '--csv-file', 'test.csv', '--plan-file', 'plan.jsonl', '--workers', '2'])
+        self.assertEqual('test.csv', args.csv_file)
+        self.assertEqual('plan.jsonl', args.plan_file)
+        self.assertFalse(args.delete)
+        self.assertEqual(2, args.workers)
+
+    def test_parse_args_plan_missing_plan_file_should_raise_system_exit(self):
+        self.assertRaises(SystemExit, tag_manager_cli.TagManagerCLI._parse_args,
+                          ['plan', '--csv-file', 'test.csv'])
+
+    def test_parse_args_apply_should_parse_args(self):
+        args = tag_manager_cli.TagManagerCLI._parse_args(['apply', '--plan-file', 'plan.jsonl'])
+        self.assertEqual('plan.jsonl', args.plan_file)
+        self.assertEqual(1, args.workers)
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_plan_tags_should_plan_upsert_tags_from_csv(self, mock_tag_datasource_processor):
+        tag_manager_cli.TagManagerCLI.run(
+            ['plan', '--csv-file', 'test.csv', '--plan-file', 'plan.jsonl'])
+        mock_tag_datasource_processor.return_value.plan_upsert_tags_from_csv.assert_called_with(
+            file_path='test.csv', plan_file_path='plan.jsonl', chunk_size=None, csv_reader=None)
+        mock_tag_datasource_processor.return_value.close.assert_called_once_with()
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_plan_tags_delete_should_plan_delete_tags_from_csv(self,
+                                                               mock_tag_datasource_processor):
+        tag_manager_cli.TagManagerCLI.run(
+            ['plan', '--csv-file', 'test.csv', '--plan-file', 'plan.jsonl', '--delete'])
+        mock_tag_datasource_processor.return_value.plan_delete_tags_from_csv.assert_called_with(
+            file_path='test.csv', plan_file_path='plan.jsonl', chunk_size=None, csv_reader=None)
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_upsert_tags_metrics_args_should_write_metrics_files(self,
+                                                                 mock_tag_datasource_processor):
+        processor = mock_tag_datasource_processor.return_value
+        processor.upsert_tags_from_csv.side_effect = RuntimeError
+
+        # Metrics are written even if the run fails.
+        self.assertRaises(RuntimeError, tag_manager_cli.TagManagerCLI.run, [
+            'upsert', '--csv-file', 'test.csv', '--metrics-file', 'metrics.json',
+            '--prometheus-file', 'metrics.prom'
+        ])
+        metrics = processor.get_metrics.return_value
+        metrics.write_json.assert_called_once_with('metrics.json')
+        metrics.write_prometheus.assert_called_once_with('metrics.prom')
+        # The processor is closed even if the run fails.
+        processor.close.assert_called_once_with()
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_delete_tags_no_metrics_args_should_not_write_metrics(self,
+                                                                  mock_tag_datasource_processor):
+        tag_manager_cli.TagManagerCLI.run(['delete', '--csv-file', 'test.csv'])
+        mock_tag_datasource_processor.return_value.get_metrics.assert_not_called()
+        mock_tag_datasource_processor.return_value.close.assert_called_once_with()
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_apply_plan_should_apply_plan(self, mock_tag_datasource_processor):
+        tag_manager_cli.TagManagerCLI.run([
+            'apply', '--plan-file', 'plan.jsonl', '--workers', '4', '--max-writes-per-minute',
+            '540', '--max-attempts', '3', '--retry-budget', '100'
+        ])
+        mock_tag_datasource_processor.assert_called_with(workers=4,
+                                                         reads_per_minute=None,
+                                                         writes_per_minute=540,
+                                                         max_attempts=3,
+                                                         retry_budget=100)
+        mock_tag_datasource_processor.return_value.apply_plan.assert_called_with(
+            plan_file_path='plan.jsonl')
+        mock_tag_datasource_processor.return_value.close.assert_called_once_with()
+
+    @mock.patch('datacatalog_tag_manager.tag_datasource_reader.TagDatasourceReader')
+    @mock.patch('datacatalog_tag_manager.tag_datasource_processor.TagDatasourceProcessor')
+    def test_export_tags_should_export_tags_to_csv(self, mock_tag_datasource_processor,
+                                                   mock_tag_datasource_reader):
+        tag_manager_cli.TagManagerCLI.run([
+            'export', '--entries-file', 'entries.txt', '--csv-file', 'tags.csv', '--workers', '8',
+            '--max-reads-per-minute', '5400'
+        ])
+        mock_tag_datasource_processor.assert_called_with(workers=8,
+                                                         reads_per_minute=5400,
+                                                         writes_per_minute=None,
+                                                         max_attempts=5,
+                                                         retry_budget=None)
+        read_names_or_resources = mock_tag_datasource_reader.read_names_or_resources
+        read_names_or_resources.assert_called_once_with('entries.txt')
+        mock_tag_datasource_processor.return_value.export_tags_to_csv.assert_called_with(
+            read_names_or_resources.return_value, file_path='tags.csv')
+        mock_tag_datasource_processor.return_value.close.assert_called_once_with()
+
+    def test_parse_args_export_missing_mandatory_args_should_raise_system_exit(self):
+        self.assertRaises(SystemExit, tag_manager_cli.TagManagerCLI._parse_args,
+                          ['export', '--entries-file', 'entries.txt'])
+
+    def test_help_should_not_import_heavy_modules(self):
+        # Run in a separate interpreter, since modules imported by other tests are cached.
+        code = ('import sys\n'
+                'import datacatalog_tag_manager\n'
+                'sys.argv = ["datacatalog-tags", "upsert", "--help"]\n'
+                'try:\n'
+                '    datacatalog_tag_manager.main()\n'
+                'except SystemExit:\n'
+                '    pass\n'
+                'heavy_modules = ("google.api_core", "google.cloud.datacatalog", "pandas")\n'
+                'print([name for name in heavy_modules if name in sys.modules])\n')
+
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         env=dict(os.environ,
+                                                  PYTHONPATH=os.pathsep.join(sys.path)),
+                                         universal_newlines=True)
+
+        self.assertEqual('[]', output.splitlines()[-1])
 
     @mock.patch(f'{__CLI_CLASS}.run')
     def test_main_should_call_cli_run(self, mock_run):
         datacatalog_tag_manager.main()
         mock_run.assert_called_once()
+
+
+def set_up_logging_args(args):
+    args.log_level = 'info'
+    args.log_format = 'text'
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from google.cloud import datacatalog
+from google.protobuf import timestamp_pb2
+
+from datacatalog_tag_manager import tag_operations_plan
+
+
+class TagOperationsPlanTest(unittest.TestCase):
+    __PLAN = tag_operations_plan.TagOperationsPlan
+
+    def setUp(self):
+        plan_file = tempfile.NamedTemporaryFile(suffix='.jsonl', delete=False)
+        plan_file.close()
+        self.__plan_file_path = plan_file.name
+
+    def tearDown(self):
+        os.remove(self.__plan_file_path)
+
+    def test_write_then_read_should_round_trip_operations(self):
+        updated_tag = make_fake_tag()
+        updated_tag.name = 'my_tag_name'
+        updated_tag.column = 'test_column'
+        operations = [
+            tag_operations_plan.TagOperation('create', 'entry-1', make_fake_tag()),
+            tag_operations_plan.TagOperation('update', 'entry-2', updated_tag),
+        ]
+
+        count = self.__PLAN.write(self.__plan_file_path, operations)
+
+        self.assertEqual(2, count)
+        self.assertEqual(operations, list(self.__PLAN.read(self.__plan_file_path)))
+
+    def test_write_should_write_one_operation_per_line(self):
+        self.__PLAN.write(self.__plan_file_path, [
+            tag_operations_plan.TagOperation('delete', 'entry-1', make_fake_tag()),
+        ] * 3)
+
+        with open(self.__plan_file_path) as plan_file:
+            self.assertEqual(3, len(plan_file.readlines()))
+
+    def test_read_should_skip_blank_lines(self):
+        self.__PLAN.write(self.__plan_file_path, [
+            tag_operations_plan.TagOperation('delete', 'entry-1', make_fake_tag()),
+        ])
+        with open(self.__plan_file_path, 'a') as plan_file:
+            plan_file.write('\n')
+
+        self.assertEqual(1, len(list(self.__PLAN.read(self.__plan_file_path))))
+
+
+def make_fake_tag():
+    tag = datacatalog.Tag()
+    tag.template = 'test_template'
+
+    string_field = datacatalog.TagField()
+    string_field.string_value = 'Test String Value'
+    tag.fields['test_string_field'] = string_field
+
+    timestamp = timestamp_pb2.Timestamp()
+    timestamp.FromJsonString('2019-10-15T01:00:00-03:00')
+    timestamp_field = datacatalog.TagField()
+    timestamp_field.timestamp_value = timestamp
+    tag.fields['test_timestamp_field'] = timestamp_field
+
+    enum_field = datacatalog.TagField()
+    enum_field.enum_value.display_name = 'Test ENUM Value'
+    tag.fields['test_enum_field'] = enum_field
+
+    return tag